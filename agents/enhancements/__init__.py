@@ -21,7 +21,7 @@ from agents.enhancements.react_parser import (
     format_discussion_with_traces,
     analyze_discussion_quality,
 )
-from agents.enhancements.memory_system import AgentMemory, create_memory_for_all_domains
+from agents.enhancements.memory_system import AgentMemory, create_memory_for_all_domains, recall_for_agents
 from agents.enhancements.memory_config import (
     MemoryConfig,
     DEFAULT_MEMORY_CONFIG,
@@ -43,7 +43,7 @@ from agents.enhancements.plan_templates import (
 )
 from agents.enhancements.tool_manager import ToolManager
 from agents.enhancements.rag_validator import RAGValidator, ResponseClassifier
-from agents.enhancements.unified_agent import UnifiedAgent
+from agents.enhancements.unified_agent import UnifiedAgent, prepare_agents_for_round
 
 __all__ = [
     # ReAct (Phase 1)
@@ -56,6 +56,7 @@ __all__ = [
     # Memory (Phase 2)
     "AgentMemory",
     "create_memory_for_all_domains",
+    "recall_for_agents",
     "MemoryConfig",
     "DEFAULT_MEMORY_CONFIG",
     "COST_OPTIMIZED_CONFIG",
@@ -76,6 +77,7 @@ __all__ = [
     "ResponseClassifier",
     # Unified Agent (All Phases)
     "UnifiedAgent",
+    "prepare_agents_for_round",
 ]
 
 __version__ = "0.4.0"  # Phase 4 complete - UnifiedAgent ready
@@ -0,0 +1,272 @@
+"""
+Memory Compaction
+
+Every round each agent stores 3-5 new insights, so across symposia the
+long-term collections fill up with paraphrases of the same finding. This job
+runs offline between symposia on each domain's long-term memories:
+
+1. Near-duplicate clustering: memories whose embeddings have cosine similarity
+   >= compaction_similarity_threshold are grouped greedily, highest retention
+   score first (blockwise NumPy matmul over the exported embeddings).
+2. Roll-up: each cluster collapses into its highest-scoring memory, whose
+   importance becomes the combined importance 1 - prod(1 - importance_i) and
+   whose merged_count records how many memories it stands for.
+3. Eviction: if more than max_memories_per_domain remain, the lowest
+   retention scores are deleted. Retention is importance x
+   importance_decay_rate ** (symposia since last recalled or stored), i.e.
+   LRU weighted by importance.
+
+Working and short-term memories are never touched.
+
+Usage:
+    python -m agents.enhancements.memory_compaction --dry-run
+    python -m agents.enhancements.memory_compaction --domain biology --threshold 0.9 --max-memories 2000
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+from agents.enhancements.memory_config import (
+    MemoryConfig,
+    DEFAULT_MEMORY_CONFIG,
+    MemoryType,
+    MEMORY_COLLECTION_NAMES,
+)
+from agents.enhancements.memory_stats import get_memory_statistics
+from agents.enhancements.memory_system import age_decay
+from knowledge_base.chroma_clients import get_chroma_client, get_shared_collection, max_batch_size
+
+
+# Configuration
+SIMILARITY_BLOCK_SIZE = 1024  # Rows per similarity block (bounds memory at block x n floats)
+
+
+def export_memories(
+    collection,
+    batch_size: int,
+    where: Optional[Dict[str, Any]] = None
+) -> Tuple[List[str], np.ndarray, List[str], List[Dict[str, Any]]]:
+    """
+    Export memories of a collection page by page.
+
+    Args:
+        collection: Memory collection
+        batch_size: Rows per get() call
+        where: ChromaDB filter (None = every memory)
+
+    Returns:
+        Tuple of (ids, float32 embedding matrix, documents, metadatas)
+    """
+    ids: List[str] = []
+    blocks: List[np.ndarray] = []
+    documents: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+
+    offset = 0
+    while True:
+        batch = collection.get(
+            where=where,
+            include=["embeddings", "documents", "metadatas"],
+            limit=batch_size,
+            offset=offset,
+        )
+        if not batch['ids']:
+            break
+        ids.extend(batch['ids'])
+        blocks.append(np.asarray(batch['embeddings'], dtype=np.float32))
+        documents.extend(batch['documents'])
+        metadatas.extend(batch['metadatas'])
+        if len(batch['ids']) < batch_size:
+            break
+        offset += batch_size
+
+    if not blocks:
+        return [], np.zeros((0, 0), dtype=np.float32), [], []
+
+    return ids, np.vstack(blocks), documents, metadatas
+
+
+def retention_scores(metadatas: List[Dict[str, Any]], config: MemoryConfig) -> np.ndarray:
+    """Importance x decay since last use (last recall, else storage) for each memory."""
+    importance = np.array([m.get("importance", 0.5) for m in metadatas], dtype=np.float64)
+    last_used = [m.get("last_recalled") or m.get("timestamp") for m in metadatas]
+    return importance * age_decay(last_used, config)
+
+
+def cluster_near_duplicates(
+    embeddings: np.ndarray,
+    priority: np.ndarray,
+    threshold: float
+) -> List[np.ndarray]:
+    """
+    Greedy threshold clustering by cosine similarity.
+
+    Memories are visited in priority order; each unassigned memory claims all
+    unassigned neighbours at or above the threshold.
+
+    Args:
+        embeddings: (n, d) embeddings
+        priority: (n,) scores; the highest-priority member leads its cluster
+        threshold: Minimum cosine similarity to the cluster leader
+
+    Returns:
+        Clusters as index arrays into embeddings, leader first
+    """
+    n = len(embeddings)
+    if n == 0:
+        return []
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    vectors = np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+
+    # Work in priority rank space so a leader always precedes its members
+    order = np.argsort(-priority, kind="stable")
+    vectors = vectors[order]
+
+    neighbours = []
+    for start in range(0, n, SIMILARITY_BLOCK_SIZE):
+        similarities = vectors[start:start + SIMILARITY_BLOCK_SIZE] @ vectors.T
+        neighbours.extend(np.flatnonzero(row >= threshold) for row in similarities)
+
+    assigned = np.zeros(n, dtype=bool)
+    clusters = []
+    for rank in range(n):
+        if assigned[rank]:
+            continue
+        members = neighbours[rank][~assigned[neighbours[rank]]]
+        members = np.concatenate(([rank], members[members != rank]))
+        assigned[members] = True
+        clusters.append(order[members])
+
+    return clusters
+
+
+def merge_metadata(metadatas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Roll a cluster's metadata into its leader's (first entry).
+
+    Returns:
+        Leader metadata with combined importance, merged_count and the most
+        recent last_recalled
+    """
+    merged = dict(metadatas[0])
+    importance = np.array([m.get("importance", 0.5) for m in metadatas], dtype=np.float64)
+    merged["importance"] = float(1.0 - np.prod(1.0 - np.clip(importance, 0.0, 1.0)))
+    merged["merged_count"] = int(sum(m.get("merged_count", 1) for m in metadatas))
+
+    recalled = [m["last_recalled"] for m in metadatas if m.get("last_recalled")]
+    if recalled:
+        merged["last_recalled"] = max(recalled)
+    merged["compacted_at"] = datetime.now().isoformat()
+    return merged
+
+
+def compact_domain(
+    domain: str,
+    config: Optional[MemoryConfig] = None,
+    threshold: Optional[float] = None,
+    max_memories: Optional[int] = None,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Merge near-duplicate long-term memories of a domain and evict down to the cap.
+
+    Args:
+        domain: Domain whose memory collection to compact
+        config: Memory configuration (default: DEFAULT_MEMORY_CONFIG)
+        threshold: Similarity threshold (None = config.compaction_similarity_threshold)
+        max_memories: Long-term memories to keep (None = config.max_memories_per_domain)
+        dry_run: Report without changing the collection
+
+    Returns:
+        Report with memories, clusters_merged, merged, evicted and kept counts
+    """
+    config = config or DEFAULT_MEMORY_CONFIG
+    threshold = config.compaction_similarity_threshold if threshold is None else threshold
+    max_memories = config.max_memories_per_domain if max_memories is None else max_memories
+
+    collection_name = MEMORY_COLLECTION_NAMES[domain]
+    client = get_chroma_client(config.memory_db_path)
+    collection = get_shared_collection(config.memory_db_path, collection_name)
+    batch_size = max_batch_size(client)
+
+    ids, embeddings, _, metadatas = export_memories(
+        collection, batch_size, where={"memory_type": {"$eq": MemoryType.LONG_TERM}}
+    )
+    report = {"domain": domain, "memories": len(ids), "clusters_merged": 0, "merged": 0, "evicted": 0, "kept": len(ids)}
+    if not ids:
+        return report
+
+    # Roll up near-duplicates into their leaders
+    clusters = cluster_near_duplicates(embeddings, retention_scores(metadatas, config), threshold)
+    leaders = [int(cluster[0]) for cluster in clusters]
+    leader_metadatas = {}
+    removed = []
+    for cluster in clusters:
+        if len(cluster) == 1:
+            continue
+        leader_metadatas[int(cluster[0])] = merge_metadata([metadatas[i] for i in cluster])
+        removed.extend(int(i) for i in cluster[1:])
+
+    report["clusters_merged"] = len(leader_metadatas)
+    report["merged"] = len(removed)
+
+    # Evict by LRU x importance down to the cap
+    if len(leaders) > max_memories:
+        survivors = [leader_metadatas.get(i, metadatas[i]) for i in leaders]
+        keep = np.argsort(-retention_scores(survivors, config), kind="stable")[:max_memories]
+        kept = {leaders[i] for i in keep}
+        evicted = [i for i in leaders if i not in kept]
+        removed.extend(evicted)
+        report["evicted"] = len(evicted)
+        leader_metadatas = {i: m for i, m in leader_metadatas.items() if i in kept}
+
+    report["kept"] = len(ids) - len(removed)
+    if dry_run:
+        return report
+
+    stats = get_memory_statistics(config.memory_db_path)
+
+    updated = list(leader_metadatas)
+    for start in range(0, len(updated), batch_size):
+        chunk = updated[start:start + batch_size]
+        collection.update(ids=[ids[i] for i in chunk], metadatas=[leader_metadatas[i] for i in chunk])
+    stats.record_updated(collection_name, [metadatas[i] for i in updated], [leader_metadatas[i] for i in updated])
+
+    for start in range(0, len(removed), batch_size):
+        collection.delete(ids=[ids[i] for i in removed[start:start + batch_size]])
+    stats.record_removed(collection_name, [metadatas[i] for i in removed])
+
+    return report
+
+
+def main():
+    """CLI entry point for offline memory compaction."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compact long-term agent memory")
+    parser.add_argument("--domain", action="append", choices=list(MEMORY_COLLECTION_NAMES),
+                        help="Domain to compact (repeatable; default: all)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_MEMORY_CONFIG.compaction_similarity_threshold,
+                        help="Cosine similarity at which memories are merged")
+    parser.add_argument("--max-memories", type=int, default=DEFAULT_MEMORY_CONFIG.max_memories_per_domain,
+                        help="Long-term memories kept per domain")
+    parser.add_argument("--dry-run", action="store_true", help="Report without changing anything")
+    args = parser.parse_args()
+
+    for domain in args.domain or list(MEMORY_COLLECTION_NAMES):
+        try:
+            report = compact_domain(domain, threshold=args.threshold, max_memories=args.max_memories, dry_run=args.dry_run)
+        except Exception as e:
+            print(f"⚠ {domain}: {e}")
+            continue
+        prefix = "ℹ️ (dry run)" if args.dry_run else "✓"
+        print(
+            f"{prefix} {domain}: {report['memories']} long-term memories → {report['kept']} "
+            f"({report['merged']} merged into {report['clusters_merged']}, {report['evicted']} evicted)"
+        )
+
+
+if __name__ == "__main__":
+    main()
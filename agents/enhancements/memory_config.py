@@ -7,6 +7,8 @@ memory types, storage parameters, and retrieval settings.
 Author: Ion Transport Virtual Lab
 """
 
+import hashlib
+import re
 from dataclasses import dataclass
 from typing import Optional
 from pathlib import Path
@@ -28,6 +30,7 @@ class MemoryConfig:
     # Retrieval settings
     max_memories_per_recall: int = 3  # Top-K memories to retrieve
     relevance_threshold: float = 0.6  # Minimum similarity score (0-1)
+    recall_candidates_per_memory: int = 4  # Nearest neighbours re-scored per returned memory
 
     # Consolidation settings
     consolidate_after_round: bool = True  # Extract insights after each round
@@ -36,10 +39,21 @@ class MemoryConfig:
     # Memory importance scoring
     use_importance_scoring: bool = True
     importance_decay_rate: float = 0.95  # Decay per symposium (0-1)
+    symposium_interval_days: float = 7.0  # Memory age counted as one symposium for decay
+
+    # Compaction (python -m agents.enhancements.memory_compaction)
+    compaction_similarity_threshold: float = 0.92  # Cosine similarity merged as near-duplicates
+    max_memories_per_domain: int = 5000  # Long-term memories kept per domain after compaction
+
+    # Retention of per-symposium working collections (python -m agents.enhancements.memory_retention)
+    working_retention_days: float = 30.0  # Drop symposium collections older than this
+    max_symposium_collections: int = 10  # Symposium collections kept per domain (newest first)
+    archive_expired: bool = True  # Archive dropped collections to <memory_db>/archive
 
     # Performance settings
     batch_size: int = 10  # Batch embeddings for efficiency
     cache_embeddings: bool = True  # Cache to avoid recomputation
+    write_behind: bool = False  # Consolidate rounds in the background (reads wait for pending writes)
 
     def __post_init__(self):
         """Set default memory DB path if not provided."""
@@ -104,6 +118,29 @@ def get_memory_collection_name(domain: str) -> str:
     return MEMORY_COLLECTION_NAMES[domain]
 
 
+# Per-symposium working collections: {domain}_agent_memory__{symposium_id}
+SYMPOSIUM_COLLECTION_SEPARATOR = "__"
+MAX_COLLECTION_NAME_LENGTH = 63  # ChromaDB's limit in older releases
+
+
+def get_symposium_collection_name(domain: str, symposium_id: str) -> str:
+    """
+    Get the working memory collection name for a domain and symposium.
+
+    Args:
+        domain: Domain name
+        symposium_id: Symposium ID (characters ChromaDB rejects become '_')
+
+    Returns:
+        Collection name string (symposium part hashed if the name would be too long)
+    """
+    base = get_memory_collection_name(domain) + SYMPOSIUM_COLLECTION_SEPARATOR
+    suffix = re.sub(r"[^A-Za-z0-9_-]", "_", symposium_id).strip("_-") or "symposium"
+    if len(base) + len(suffix) > MAX_COLLECTION_NAME_LENGTH:
+        suffix = hashlib.md5(symposium_id.encode()).hexdigest()[:16]
+    return base + suffix
+
+
 # Memory importance categories
 class MemoryImportance:
     """Constants for memory importance levels."""
@@ -0,0 +1,243 @@
+"""
+Memory Retention
+
+Working memories live in one collection per symposium
+({domain}_agent_memory__<symposium_id>) and are moved to the long-term
+collection when the symposium ends. This maintenance command enforces the
+retention policy on the symposium collections left behind (finished runs
+whose leftovers were never promoted, crashed runs):
+
+- max age: collections created more than working_retention_days ago expire
+- max count: only the newest max_symposium_collections per domain are kept
+- archive: expired collections are written to
+  <memory_db>/archive/<collection>.npz before they are dropped
+
+Optionally the remaining working memories of an expired collection are
+promoted into the long-term collection instead of being discarded, and the
+long-term collections are compacted afterwards (see memory_compaction).
+
+Usage:
+    python -m agents.enhancements.memory_retention --dry-run
+    python -m agents.enhancements.memory_retention --max-age-days 14 --max-collections 5 --compact
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+from agents.enhancements.memory_config import (
+    MemoryConfig,
+    DEFAULT_MEMORY_CONFIG,
+    MemoryType,
+    MEMORY_COLLECTION_NAMES,
+    SYMPOSIUM_COLLECTION_SEPARATOR,
+)
+from agents.enhancements.memory_stats import get_memory_statistics
+from agents.enhancements.memory_compaction import export_memories, compact_domain
+from knowledge_base.chroma_clients import get_chroma_client, get_shared_collection, evict_collection, max_batch_size
+from knowledge_base.collection_aliases import list_collection_names
+
+
+# Configuration
+ARCHIVE_SUBDIR = "archive"
+
+
+def list_symposium_collections(client, domain: str) -> List[str]:
+    """Names of a domain's per-symposium working collections."""
+    prefix = MEMORY_COLLECTION_NAMES[domain] + SYMPOSIUM_COLLECTION_SEPARATOR
+    return sorted(name for name in list_collection_names(client) if name.startswith(prefix))
+
+
+def _created_at(collection) -> datetime:
+    """Creation time recorded in the collection metadata (epoch if missing)."""
+    created_at = (collection.metadata or {}).get("created_at")
+    return datetime.fromisoformat(created_at) if created_at else datetime.min
+
+
+def archive_collection(collection, archive_dir: Path, batch_size: int) -> Path:
+    """
+    Write every memory of a collection to <archive_dir>/<collection>.npz.
+
+    Args:
+        collection: Collection to archive
+        archive_dir: Archive directory
+        batch_size: Rows per get() call
+
+    Returns:
+        Path of the archive file
+    """
+    ids, embeddings, documents, metadatas = export_memories(collection, batch_size)
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{collection.name}.npz"
+    tmp_path = path.with_suffix(".tmp.npz")
+    np.savez_compressed(
+        tmp_path,
+        ids=np.asarray(ids, dtype=str),
+        embeddings=embeddings,
+        documents=np.asarray(documents, dtype=str),
+        metadatas=np.asarray([json.dumps(m) for m in metadatas], dtype=str),
+        collection_metadata=np.asarray(json.dumps(collection.metadata or {})),
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def promote_collection(
+    collection,
+    long_term,
+    batch_size: int
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Copy a symposium collection's memories into the long-term collection.
+
+    Memories already in long-term (left behind by an interrupted promotion)
+    are replaced rather than duplicated.
+
+    Returns:
+        Tuple of (metadata of new long-term memories, previous and new
+        metadata of replaced ones)
+    """
+    ids, embeddings, documents, metadatas = export_memories(collection, batch_size)
+    promoted_at = datetime.now().isoformat()
+    metadatas = [{**m, "memory_type": MemoryType.LONG_TERM, "promoted_at": promoted_at} for m in metadatas]
+
+    added, replaced_before, replaced_after = [], [], []
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        existing = long_term.get(ids=chunk, include=["metadatas"])
+        previous = dict(zip(existing['ids'], existing['metadatas']))
+
+        long_term.upsert(
+            ids=chunk,
+            embeddings=embeddings[start:start + batch_size].tolist(),
+            documents=documents[start:start + batch_size],
+            metadatas=metadatas[start:start + batch_size],
+        )
+        for memory_id, metadata in zip(chunk, metadatas[start:start + batch_size]):
+            if memory_id in previous:
+                replaced_before.append(previous[memory_id])
+                replaced_after.append(metadata)
+            else:
+                added.append(metadata)
+
+    return added, replaced_before, replaced_after
+
+
+def enforce_retention(
+    domain: str,
+    config: Optional[MemoryConfig] = None,
+    max_age_days: Optional[float] = None,
+    max_collections: Optional[int] = None,
+    archive: Optional[bool] = None,
+    promote: bool = False,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Archive and drop a domain's expired symposium collections.
+
+    Args:
+        domain: Domain to maintain
+        config: Memory configuration (default: DEFAULT_MEMORY_CONFIG)
+        max_age_days: Maximum collection age (None = config.working_retention_days)
+        max_collections: Collections kept, newest first (None = config.max_symposium_collections)
+        archive: Archive before dropping (None = config.archive_expired)
+        promote: Move remaining working memories to long-term before dropping
+        dry_run: Report without changing anything
+
+    Returns:
+        Report with kept and expired collection names, archives and promoted count
+    """
+    config = config or DEFAULT_MEMORY_CONFIG
+    max_age_days = config.working_retention_days if max_age_days is None else max_age_days
+    max_collections = config.max_symposium_collections if max_collections is None else max_collections
+    archive = config.archive_expired if archive is None else archive
+
+    client = get_chroma_client(config.memory_db_path)
+    batch_size = max_batch_size(client)
+    stats = get_memory_statistics(config.memory_db_path)
+
+    collections = [get_shared_collection(config.memory_db_path, name) for name in list_symposium_collections(client, domain)]
+    collections.sort(key=_created_at, reverse=True)
+
+    cutoff = datetime.now() - timedelta(days=max_age_days)
+    kept = [c for c in collections[:max_collections] if _created_at(c) >= cutoff]
+    kept_names = {c.name for c in kept}
+    expired = [c for c in collections if c.name not in kept_names]
+
+    report = {
+        "domain": domain,
+        "kept": [c.name for c in kept],
+        "expired": [c.name for c in expired],
+        "archives": [],
+        "promoted": 0,
+    }
+    if dry_run:
+        return report
+
+    long_term_name = MEMORY_COLLECTION_NAMES[domain]
+    long_term = get_shared_collection(
+        config.memory_db_path, long_term_name, metadata={"domain": domain, "type": "agent_memory"}
+    )
+    archive_dir = Path(config.memory_db_path) / ARCHIVE_SUBDIR
+
+    for collection in expired:
+        if archive:
+            report["archives"].append(str(archive_collection(collection, archive_dir, batch_size)))
+        if promote:
+            added, replaced_before, replaced_after = promote_collection(collection, long_term, batch_size)
+            stats.record_added(long_term_name, added)
+            stats.record_updated(long_term_name, replaced_before, replaced_after)
+            report["promoted"] += len(added) + len(replaced_after)
+
+        client.delete_collection(name=collection.name)
+        evict_collection(config.memory_db_path, collection.name)
+        stats.drop(collection.name)
+
+    return report
+
+
+def main():
+    """CLI entry point for memory retention maintenance."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Enforce retention on per-symposium memory collections")
+    parser.add_argument("--domain", action="append", choices=list(MEMORY_COLLECTION_NAMES),
+                        help="Domain to maintain (repeatable; default: all)")
+    parser.add_argument("--max-age-days", type=float, default=DEFAULT_MEMORY_CONFIG.working_retention_days,
+                        help="Drop symposium collections older than this")
+    parser.add_argument("--max-collections", type=int, default=DEFAULT_MEMORY_CONFIG.max_symposium_collections,
+                        help="Symposium collections kept per domain (newest first)")
+    parser.add_argument("--no-archive", action="store_true", help="Drop expired collections without archiving")
+    parser.add_argument("--promote", action="store_true",
+                        help="Move remaining working memories of expired collections to long-term memory")
+    parser.add_argument("--compact", action="store_true", help="Compact long-term memory afterwards")
+    parser.add_argument("--dry-run", action="store_true", help="Report without changing anything")
+    args = parser.parse_args()
+
+    for domain in args.domain or list(MEMORY_COLLECTION_NAMES):
+        report = enforce_retention(
+            domain,
+            max_age_days=args.max_age_days,
+            max_collections=args.max_collections,
+            archive=not args.no_archive,
+            promote=args.promote,
+            dry_run=args.dry_run,
+        )
+        prefix = "ℹ️ (dry run)" if args.dry_run else "✓"
+        print(f"{prefix} {domain}: {len(report['kept'])} symposium collections kept, {len(report['expired'])} expired")
+        for name in report["expired"]:
+            print(f"  🗑 {name}")
+        if report["promoted"]:
+            print(f"  ⏩ {report['promoted']} working memories promoted to long-term")
+
+        if args.compact:
+            compaction = compact_domain(domain, dry_run=args.dry_run)
+            print(f"  ✓ Compacted long-term memory: {compaction['memories']} → {compaction['kept']}")
+
+
+if __name__ == "__main__":
+    main()
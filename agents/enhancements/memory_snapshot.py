@@ -0,0 +1,267 @@
+"""
+Memory Snapshots
+
+Long-term agent memory only exists inside the ChromaDB store at
+MemoryConfig.memory_db_path (agents/data/memory_db by default; older runs may
+have written to data/memory_db at the repository root), so moving a tuned set
+of agents to another machine used to mean copying the whole store. A snapshot
+is one domain's long-term collection as a columnar .npz bundle:
+
+- ids, documents and metadatas (JSON strings)
+- embeddings as float16 (half the size of float32, same neighbours in practice)
+- a manifest (domain, embedding model, collection metadata, export time)
+- a SHA-256 checksum over all of the above, verified before import
+
+Import writes the stored embeddings back in batches of the client's maximum
+batch size, so nothing is re-embedded and new worker nodes are seeded without
+any OpenAI calls.
+
+Usage:
+    python -m agents.enhancements.memory_snapshot export --output snapshots/
+    python -m agents.enhancements.memory_snapshot export --domain biology --memory-db data/memory_db --output snapshots/
+    python -m agents.enhancements.memory_snapshot import snapshots/biology_agent_memory.npz
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+from agents.enhancements.memory_config import (
+    MemoryConfig,
+    DEFAULT_MEMORY_CONFIG,
+    MEMORY_COLLECTION_NAMES,
+)
+from agents.enhancements.memory_stats import get_memory_statistics
+from agents.enhancements.memory_compaction import export_memories
+from knowledge_base.chroma_clients import get_chroma_client, get_shared_collection, max_batch_size
+
+
+# Configuration
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_ARRAYS = ("ids", "documents", "metadatas", "embeddings", "manifest")  # Checksummed, in this order
+
+
+def snapshot_checksum(arrays: Dict[str, np.ndarray]) -> str:
+    """SHA-256 over the raw bytes of the snapshot arrays."""
+    digest = hashlib.sha256()
+    for key in SNAPSHOT_ARRAYS:
+        array = np.ascontiguousarray(arrays[key])
+        digest.update(key.encode("utf-8"))
+        digest.update(array.dtype.str.encode("utf-8"))
+        digest.update(str(array.shape).encode("utf-8"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def export_domain(
+    domain: str,
+    output_dir: Path,
+    config: Optional[MemoryConfig] = None
+) -> Dict[str, Any]:
+    """
+    Write a domain's long-term memory collection to <output_dir>/<collection>.npz.
+
+    Args:
+        domain: Domain to export
+        output_dir: Directory for the snapshot (created if missing)
+        config: Memory configuration (default: DEFAULT_MEMORY_CONFIG)
+
+    Returns:
+        Report with domain, path, memories and checksum
+    """
+    config = config or DEFAULT_MEMORY_CONFIG
+    collection_name = MEMORY_COLLECTION_NAMES[domain]
+    client = get_chroma_client(config.memory_db_path)
+    collection = get_shared_collection(config.memory_db_path, collection_name)
+
+    ids, embeddings, documents, metadatas = export_memories(collection, max_batch_size(client))
+
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "domain": domain,
+        "collection": collection_name,
+        "collection_metadata": collection.metadata or {},
+        "embedding_model": config.embedding_model,
+        "exported_at": datetime.now().isoformat(),
+    }
+    arrays = {
+        "ids": np.asarray(ids, dtype=str),
+        "documents": np.asarray(documents, dtype=str),
+        "metadatas": np.asarray([json.dumps(m) for m in metadatas], dtype=str),
+        "embeddings": embeddings.astype(np.float16),
+        "manifest": np.asarray(json.dumps(manifest)),
+    }
+    checksum = snapshot_checksum(arrays)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{collection_name}.npz"
+    tmp_path = path.with_suffix(".tmp.npz")
+    np.savez_compressed(tmp_path, checksum=np.asarray(checksum), **arrays)
+    os.replace(tmp_path, path)
+
+    return {"domain": domain, "path": str(path), "memories": len(ids), "checksum": checksum}
+
+
+def load_snapshot(path: Path) -> Dict[str, Any]:
+    """
+    Read and verify a snapshot.
+
+    Args:
+        path: Snapshot file written by export_domain
+
+    Returns:
+        Dict with manifest, ids, documents, metadatas and float32 embeddings
+
+    Raises:
+        ValueError: If the checksum does not match or the format is unknown
+    """
+    with np.load(path, allow_pickle=False) as bundle:
+        arrays = {key: bundle[key] for key in SNAPSHOT_ARRAYS}
+        expected = str(bundle["checksum"])
+
+    if snapshot_checksum(arrays) != expected:
+        raise ValueError(f"Snapshot checksum mismatch: {path}")
+
+    manifest = json.loads(str(arrays["manifest"]))
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format_version')}: {path}")
+
+    return {
+        "manifest": manifest,
+        "ids": arrays["ids"].tolist(),
+        "documents": arrays["documents"].tolist(),
+        "metadatas": [json.loads(m) for m in arrays["metadatas"].tolist()],
+        "embeddings": arrays["embeddings"].astype(np.float32),
+    }
+
+
+def import_snapshot(
+    path: Path,
+    domain: Optional[str] = None,
+    config: Optional[MemoryConfig] = None,
+    overwrite: bool = False
+) -> Dict[str, Any]:
+    """
+    Load a snapshot into a domain's long-term memory collection.
+
+    Args:
+        path: Snapshot file written by export_domain
+        domain: Target domain (None = the domain the snapshot was exported from)
+        config: Memory configuration (default: DEFAULT_MEMORY_CONFIG)
+        overwrite: Replace memories whose ids already exist (default: skip them)
+
+    Returns:
+        Report with domain, memories, added, replaced and skipped counts
+
+    Raises:
+        ValueError: If the snapshot is corrupt or was embedded with a different model
+    """
+    config = config or DEFAULT_MEMORY_CONFIG
+    snapshot = load_snapshot(path)
+    manifest = snapshot["manifest"]
+    domain = domain or manifest["domain"]
+
+    if manifest["embedding_model"] != config.embedding_model:
+        raise ValueError(
+            f"Snapshot was embedded with {manifest['embedding_model']}, "
+            f"memory is configured for {config.embedding_model}"
+        )
+
+    ids = snapshot["ids"]
+    embeddings = snapshot["embeddings"]
+    documents = snapshot["documents"]
+    metadatas = snapshot["metadatas"]
+    if domain != manifest["domain"]:
+        metadatas = [{**m, "domain": domain} for m in metadatas]
+
+    collection_name = MEMORY_COLLECTION_NAMES[domain]
+    client = get_chroma_client(config.memory_db_path)
+    collection = get_shared_collection(
+        config.memory_db_path, collection_name, metadata={"domain": domain, "type": "agent_memory"}
+    )
+    batch_size = max_batch_size(client)
+    stats = get_memory_statistics(config.memory_db_path)
+    tracked = stats.is_tracked(collection_name)
+
+    report = {"domain": domain, "memories": len(ids), "added": 0, "replaced": 0, "skipped": 0}
+    for start in range(0, len(ids), batch_size):
+        chunk = slice(start, start + batch_size)
+        existing = collection.get(ids=ids[chunk], include=["metadatas"])
+        previous = dict(zip(existing['ids'], existing['metadatas']))
+
+        rows = [i for i in range(start, min(start + batch_size, len(ids))) if overwrite or ids[i] not in previous]
+        report["skipped"] += len(ids[chunk]) - len(rows)
+        if not rows:
+            continue
+
+        collection.upsert(
+            ids=[ids[i] for i in rows],
+            embeddings=embeddings[rows].tolist(),
+            documents=[documents[i] for i in rows],
+            metadatas=[metadatas[i] for i in rows],
+        )
+
+        added = [metadatas[i] for i in rows if ids[i] not in previous]
+        replaced = [i for i in rows if ids[i] in previous]
+        report["added"] += len(added)
+        report["replaced"] += len(replaced)
+        if tracked:
+            stats.record_added(collection_name, added)
+            stats.record_updated(collection_name, [previous[ids[i]] for i in replaced], [metadatas[i] for i in replaced])
+
+    # An untracked collection is counted from scratch the next time AgentMemory opens it
+    return report
+
+
+def main():
+    """CLI entry point for memory snapshot export and import."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export and import long-term agent memory snapshots")
+    parser.add_argument("--memory-db", type=Path, default=DEFAULT_MEMORY_CONFIG.memory_db_path,
+                        help="Memory store to read from or write to")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write one snapshot per domain")
+    export_parser.add_argument("--domain", action="append", choices=list(MEMORY_COLLECTION_NAMES),
+                               help="Domain to export (repeatable; default: all)")
+    export_parser.add_argument("--output", type=Path, required=True, help="Snapshot directory")
+
+    import_parser = subparsers.add_parser("import", help="Load snapshots into the memory store")
+    import_parser.add_argument("snapshots", type=Path, nargs="+", help="Snapshot files")
+    import_parser.add_argument("--domain", choices=list(MEMORY_COLLECTION_NAMES),
+                               help="Import into this domain instead of the exported one")
+    import_parser.add_argument("--overwrite", action="store_true", help="Replace memories that already exist")
+    args = parser.parse_args()
+
+    config = MemoryConfig(memory_db_path=args.memory_db)
+
+    if args.command == "export":
+        for domain in args.domain or list(MEMORY_COLLECTION_NAMES):
+            try:
+                report = export_domain(domain, args.output, config)
+            except Exception as e:
+                print(f"⚠ {domain}: {e}")
+                continue
+            print(f"✓ {domain}: {report['memories']} memories → {report['path']}")
+        return
+
+    for path in args.snapshots:
+        try:
+            report = import_snapshot(path, domain=args.domain, config=config, overwrite=args.overwrite)
+        except Exception as e:
+            print(f"✗ {path}: {e}")
+            continue
+        print(
+            f"✓ {report['domain']}: {report['added']} added, {report['replaced']} replaced, "
+            f"{report['skipped']} already present"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Memory Statistics Counters
+
+AgentMemory.get_statistics used to pull every document and metadata in a
+memory collection to count memories by type and importance. The counts are
+now kept in a small SQLite table next to the memory database and updated on
+every write, promotion and deletion, so statistics cost the same after one
+symposium or hundreds.
+
+Counters can drift if the collection is changed outside AgentMemory;
+AgentMemory.rebuild_statistics() recounts a collection from scratch.
+
+Storage: <memory_db>/memory_stats.sqlite3
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+
+
+# Configuration
+STATS_DB_FILE = "memory_stats.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory_counters (
+    collection TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (collection, dimension, key)
+);
+CREATE TABLE IF NOT EXISTS tracked_collections (
+    collection TEXT PRIMARY KEY,
+    rebuilt_at TEXT
+);
+"""
+
+
+def importance_bucket(importance: float) -> str:
+    """Importance bucket reported by get_statistics (high/medium/low)."""
+    if importance >= 0.8:
+        return "high"
+    if importance >= 0.5:
+        return "medium"
+    return "low"
+
+
+def _counter_keys(metadata: Dict[str, Any]) -> List[tuple]:
+    """(dimension, key) counters a memory contributes to."""
+    return [
+        ("type", metadata.get("memory_type", "unknown")),
+        ("importance", importance_bucket(metadata.get("importance", 0.5))),
+        ("symposium", metadata.get("symposium_id", "unknown")),
+    ]
+
+
+class MemoryStatistics:
+    """Per-collection memory counters by type, importance bucket and symposium."""
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize counters.
+
+        Args:
+            db_path: SQLite file (created on first use)
+        """
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _apply(self, conn: sqlite3.Connection, collection: str, metadatas: Iterable[Dict[str, Any]], sign: int):
+        deltas: Dict[tuple, int] = {}
+        for metadata in metadatas:
+            for counter in _counter_keys(metadata):
+                deltas[counter] = deltas.get(counter, 0) + sign
+
+        conn.executemany(
+            "INSERT INTO memory_counters (collection, dimension, key, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (collection, dimension, key) DO UPDATE SET count = count + excluded.count",
+            [(collection, dimension, key, delta) for (dimension, key), delta in deltas.items() if delta],
+        )
+
+    def record_added(self, collection: str, metadatas: List[Dict[str, Any]]):
+        """Count newly stored memories."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._apply(conn, collection, metadatas, +1)
+
+    def record_removed(self, collection: str, metadatas: List[Dict[str, Any]]):
+        """Uncount deleted memories."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._apply(conn, collection, metadatas, -1)
+
+    def record_updated(
+        self,
+        collection: str,
+        before: List[Dict[str, Any]],
+        after: List[Dict[str, Any]]
+    ):
+        """Move memories between counters after a metadata update (e.g. promotion)."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._apply(conn, collection, before, -1)
+                self._apply(conn, collection, after, +1)
+
+    def is_tracked(self, collection: str) -> bool:
+        """Whether the collection's counters have been built."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM tracked_collections WHERE collection = ?", (collection,)
+            ).fetchone()
+        return row is not None
+
+    def rebuild(self, collection: str, metadatas: Iterable[Dict[str, Any]]):
+        """
+        Replace a collection's counters with a fresh count.
+
+        Args:
+            collection: Memory collection name
+            metadatas: Metadata of every memory in the collection
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM memory_counters WHERE collection = ?", (collection,))
+                self._apply(conn, collection, metadatas, +1)
+                conn.execute(
+                    "INSERT OR REPLACE INTO tracked_collections (collection, rebuilt_at) VALUES (?, ?)",
+                    (collection, datetime.now().isoformat()),
+                )
+
+    def drop(self, collection: str):
+        """Forget a deleted collection's counters."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM memory_counters WHERE collection = ?", (collection,))
+                conn.execute("DELETE FROM tracked_collections WHERE collection = ?", (collection,))
+
+    def get(self, *collections: str) -> Dict[str, Any]:
+        """
+        Counters of one or more collections, summed.
+
+        Returns:
+            {total_memories, by_type, by_importance, by_symposium}
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT dimension, key, SUM(count) FROM memory_counters "
+                f"WHERE collection IN ({', '.join('?' for _ in collections)}) "
+                "GROUP BY dimension, key HAVING SUM(count) != 0",
+                collections,
+            ).fetchall()
+
+        counters = {"type": {}, "importance": {"high": 0, "medium": 0, "low": 0}, "symposium": {}}
+        for dimension, key, count in rows:
+            counters[dimension][key] = count
+
+        return {
+            "total_memories": sum(counters["type"].values()),
+            "by_type": counters["type"],
+            "by_importance": counters["importance"],
+            "by_symposium": counters["symposium"],
+        }
+
+
+# One counter store per memory database
+_statistics: Dict[str, MemoryStatistics] = {}
+_statistics_lock = threading.Lock()
+
+
+def get_memory_statistics(memory_db_path: Path) -> MemoryStatistics:
+    """Get the shared counters of a memory database."""
+    db_path = Path(memory_db_path).resolve() / STATS_DB_FILE
+    with _statistics_lock:
+        if str(db_path) not in _statistics:
+            _statistics[str(db_path)] = MemoryStatistics(db_path)
+        return _statistics[str(db_path)]
@@ -14,13 +14,15 @@ Retrieval: Semantic search using embeddings
 Author: Ion Transport Virtual Lab
 """
 
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-import chromadb
-from chromadb.config import Settings
+import numpy as np
 from langchain_openai import OpenAIEmbeddings
 from openai import OpenAI
 
@@ -32,7 +34,108 @@ from agents.enhancements.memory_config import (
     INSIGHT_EXTRACTION_PROMPT,
     CONSOLIDATION_CONFIG,
     get_memory_collection_name,
+    get_symposium_collection_name,
 )
+from agents.enhancements.memory_stats import get_memory_statistics
+from knowledge_base.chroma_clients import get_chroma_client, get_shared_collection, max_batch_size
+
+
+# Configuration
+QUERY_EMBEDDING_CACHE_SIZE = 256  # Recent query embeddings kept per agent (config.cache_embeddings)
+
+
+class ShortTermIndex:
+    """
+    Short-term memories of the current round, kept in process.
+
+    Embeddings live in a NumPy matrix searched with one matrix-vector
+    product; nothing is written to ChromaDB until promotion.
+    """
+
+    def __init__(self):
+        self.entries: List[Dict[str, Any]] = []
+        self._embeddings: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, memory_id: str, insight: str, embedding: List[float], metadata: Dict[str, Any]):
+        """Add a short-term memory."""
+        with self._lock:
+            self.entries.append({"id": memory_id, "insight": insight, "metadata": metadata})
+            self._embeddings.append(np.asarray(embedding, dtype=np.float32))
+            self._matrix = None
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        min_importance: Optional[float] = None,
+        round_number: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """
+        Nearest short-term memories by squared L2 distance (ChromaDB's metric).
+
+        Args:
+            query_embedding: Query embedding
+            top_k: Maximum number of memories
+            min_importance: Minimum importance
+            round_number: Only memories from this round
+
+        Returns:
+            Tuple of (entries, distances), nearest first
+        """
+        with self._lock:
+            if not self.entries:
+                return [], np.zeros(0)
+            if self._matrix is None:
+                self._matrix = np.vstack(self._embeddings)
+            matrix, entries = self._matrix, list(self.entries)
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        distances = (
+            np.einsum("ij,ij->i", matrix, matrix) - 2.0 * (matrix @ query) + float(query @ query)
+        ).astype(np.float64)
+
+        if min_importance or round_number is not None:
+            keep = np.array([
+                (not min_importance or e["metadata"].get("importance", 0) >= min_importance)
+                and (round_number is None or e["metadata"].get("round_number") == round_number)
+                for e in entries
+            ])
+            distances = np.where(keep, distances, np.inf)
+
+        order = [i for i in np.argsort(distances, kind="stable")[:top_k] if np.isfinite(distances[i])]
+        return [entries[i] for i in order], np.maximum(distances[order], 0.0)
+
+    def drain(self, memory_ids: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], List[List[float]]]:
+        """
+        Remove and return memories (for promotion).
+
+        Args:
+            memory_ids: Memories to remove (None = all)
+
+        Returns:
+            Tuple of (entries, embeddings)
+        """
+        with self._lock:
+            wanted = None if memory_ids is None else set(memory_ids)
+            taken, kept = [], []
+            for entry, embedding in zip(self.entries, self._embeddings):
+                (taken if wanted is None or entry["id"] in wanted else kept).append((entry, embedding))
+
+            self.entries = [entry for entry, _ in kept]
+            self._embeddings = [embedding for _, embedding in kept]
+            self._matrix = None
+
+        return [entry for entry, _ in taken], [embedding.tolist() for _, embedding in taken]
+
+    def clear(self):
+        """Drop every short-term memory."""
+        with self._lock:
+            self.entries, self._embeddings, self._matrix = [], [], None
 
 
 class AgentMemory:
@@ -40,7 +143,12 @@ class AgentMemory:
     Persistent memory system for AI agents.
 
     Stores and retrieves insights across symposium rounds using
-    semantic search over ChromaDB collections.
+    semantic search over ChromaDB collections: working memories of the
+    current symposium in their own collection ({domain}_agent_memory__<id>),
+    long-term memories in {domain}_agent_memory. Promotion moves working
+    memories into the long-term collection, and memory_retention archives
+    or drops old symposium collections, so recall only searches the
+    current symposium and the compacted long-term store.
     """
 
     def __init__(
@@ -61,29 +169,61 @@ class AgentMemory:
         self.config = config or DEFAULT_MEMORY_CONFIG
         self.symposium_id = symposium_id or self._generate_symposium_id()
 
-        # Initialize ChromaDB client
-        self.config.memory_db_path.mkdir(parents=True, exist_ok=True)
-        self.client = chromadb.PersistentClient(
-            path=str(self.config.memory_db_path),
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # Shared ChromaDB client (every agent's memory uses the same store)
+        self.client = get_chroma_client(self.config.memory_db_path)
 
         # Initialize embeddings (same model as RAG)
         self.embeddings = OpenAIEmbeddings(model=self.config.embedding_model)
 
-        # Get or create memory collection
+        # Get or create memory collections (long-term + this symposium's working memory)
         self.collection_name = get_memory_collection_name(agent_domain)
         self.collection = self._get_or_create_collection()
+        self.working_collection_name = get_symposium_collection_name(agent_domain, self.symposium_id)
+        self.working_collection = get_shared_collection(
+            self.config.memory_db_path,
+            self.working_collection_name,
+            metadata={
+                "domain": agent_domain,
+                "type": "symposium_memory",
+                "symposium_id": self.symposium_id,
+                "created_at": datetime.now().isoformat(),
+            }
+        )
 
         # OpenAI client for insight extraction
         self.openai_client = OpenAI()
 
-        # In-memory buffers
-        self.short_term_buffer: List[Dict[str, Any]] = []
+        # In-memory buffers (short-term memories reach ChromaDB only on promotion)
+        self.short_term = ShortTermIndex()
         self.working_memory_ids: List[str] = []  # IDs of memories from this symposium
+        self._query_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+
+        # Recall times, written to ChromaDB on promotion and close (not on the read path)
+        self._recalled: Dict[str, Dict[str, Dict[str, Any]]] = {}  # collection name -> id -> metadata
+        self._recalled_lock = threading.Lock()
+
+        # Write-behind queue (one worker keeps writes in order)
+        self._write_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: List[Future] = []
+
+        # Counters kept on write (first use on an existing store counts it once)
+        self.stats = get_memory_statistics(self.config.memory_db_path)
+        if not self.stats.is_tracked(self.collection_name):
+            self._rebuild_collection_statistics(self.collection, self.collection_name)
+        if not self.stats.is_tracked(self.working_collection_name):
+            if self.working_collection.count() == 0:
+                # A new symposium's collection starts empty: nothing to count
+                self.stats.rebuild(self.working_collection_name, [])
+            else:
+                self._rebuild_collection_statistics(self.working_collection, self.working_collection_name)
 
         print(f"    ✓ Memory initialized for {agent_domain} (symposium: {self.symposium_id})")
 
+    @property
+    def short_term_buffer(self) -> List[Dict[str, Any]]:
+        """Short-term memories of the current round ({id, insight, metadata})."""
+        return self.short_term.entries
+
     def _generate_symposium_id(self) -> str:
         """Generate unique symposium ID."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -91,15 +231,12 @@ class AgentMemory:
 
     def _get_or_create_collection(self):
         """Get or create ChromaDB collection for agent memory."""
-        try:
-            collection = self.client.get_collection(name=self.collection_name)
-            print(f"    ✓ Using existing memory collection: {self.collection_name}")
-        except Exception:
-            collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"domain": self.domain, "type": "agent_memory"}
-            )
-            print(f"    ✓ Created new memory collection: {self.collection_name}")
+        collection = get_shared_collection(
+            self.config.memory_db_path,
+            self.collection_name,
+            metadata={"domain": self.domain, "type": "agent_memory"}
+        )
+        print(f"    ✓ Using memory collection: {self.collection_name}")
 
         return collection
 
@@ -127,13 +264,59 @@ class AgentMemory:
         if len(insight) < self.config.min_insight_length:
             return None  # Skip very short insights
 
-        # Generate unique ID
-        memory_id = str(uuid.uuid4())
-
         # Generate embedding
         embedding = self.embeddings.embed_query(insight)
 
-        # Prepare metadata
+        metadata = self._build_metadata(memory_type, importance, round_number, context)
+        return self._store([insight], [embedding], [metadata])[0]
+
+    def remember_many(self, insights: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Store several insights with one embedding request and one write.
+
+        Args:
+            insights: Dicts with 'content' and optional 'context', 'importance',
+                'memory_type' and 'round_number' (same meaning as in remember)
+
+        Returns:
+            Memory IDs aligned with insights (None for skipped short insights)
+        """
+        kept = [
+            (i, data) for i, data in enumerate(insights)
+            if len(data["content"]) >= self.config.min_insight_length
+        ]
+        memory_ids: List[Optional[str]] = [None] * len(insights)
+        if not kept:
+            return memory_ids
+
+        texts = [data["content"] for _, data in kept]
+        embeddings = []
+        for start in range(0, len(texts), self.config.batch_size):
+            embeddings.extend(self.embeddings.embed_documents(texts[start:start + self.config.batch_size]))
+
+        metadatas = [
+            self._build_metadata(
+                data.get("memory_type", MemoryType.WORKING),
+                data.get("importance", MemoryImportance.MEDIUM),
+                data.get("round_number"),
+                data.get("context"),
+            )
+            for _, data in kept
+        ]
+
+        stored_ids = self._store(texts, embeddings, metadatas)
+        for (i, _), memory_id in zip(kept, stored_ids):
+            memory_ids[i] = memory_id
+        return memory_ids
+
+    def _build_metadata(
+        self,
+        memory_type: str,
+        importance: float,
+        round_number: Optional[int],
+        context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Metadata stored with a memory."""
         metadata = {
             "symposium_id": self.symposium_id,
             "domain": self.domain,
@@ -150,27 +333,73 @@ class AgentMemory:
                 if isinstance(value, (str, int, float, bool)):
                     metadata[key] = value
 
+        return metadata
+
+    def _store(
+        self,
+        insights: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Write embedded memories to ChromaDB in one add (short-term ones to the in-process index)."""
+        memory_ids = [str(uuid.uuid4()) for _ in insights]
+
+        working, long_term = [], []
+        for i, (memory_id, insight, metadata) in enumerate(zip(memory_ids, insights, metadatas)):
+            memory_type = metadata["memory_type"]
+
+            # Short-term memories stay in process until promotion
+            if memory_type == MemoryType.SHORT_TERM and self.config.enable_short_term:
+                self.short_term.add(memory_id, insight, embeddings[i], metadata)
+                continue
+
+            # Track working memory IDs
+            if memory_type == MemoryType.WORKING:
+                self.working_memory_ids.append(memory_id)
+                working.append(i)
+            else:
+                long_term.append(i)
+
         # Store in ChromaDB
-        self.collection.add(
-            ids=[memory_id],
-            embeddings=[embedding],
-            documents=[insight],
-            metadatas=[metadata]
-        )
+        for collection, name, indexes in (
+            (self.working_collection, self.working_collection_name, working),
+            (self.collection, self.collection_name, long_term),
+        ):
+            if not indexes:
+                continue
+            collection.add(
+                ids=[memory_ids[i] for i in indexes],
+                embeddings=[embeddings[i] for i in indexes],
+                documents=[insights[i] for i in indexes],
+                metadatas=[metadatas[i] for i in indexes]
+            )
+            self.stats.record_added(name, [metadatas[i] for i in indexes])
 
-        # Track working memory IDs
-        if memory_type == MemoryType.WORKING:
-            self.working_memory_ids.append(memory_id)
+        return memory_ids
 
-        # Add to short-term buffer
-        if memory_type == MemoryType.SHORT_TERM and self.config.enable_short_term:
-            self.short_term_buffer.append({
-                "id": memory_id,
-                "insight": insight,
-                "metadata": metadata
-            })
+    def flush(self) -> List[str]:
+        """
+        Wait for queued background writes.
 
-        return memory_id
+        Returns:
+            IDs of the memories those writes stored
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        memory_ids = []
+        for future in pending:
+            try:
+                memory_ids.extend(future.result())
+            except Exception as e:
+                print(f"    ⚠ Background memory write failed for {self.domain}: {e}")
+        return memory_ids
+
+    def close(self):
+        """Flush queued writes and recall times, and stop the write-behind worker."""
+        self.flush()
+        self.flush_recall_times()
+        if self._write_executor is not None:
+            self._write_executor.shutdown(wait=True)
+            self._write_executor = None
 
     def recall(
         self,
@@ -178,92 +407,185 @@ class AgentMemory:
         memory_types: Optional[List[str]] = None,
         top_k: Optional[int] = None,
         min_importance: Optional[float] = None,
-        round_number: Optional[int] = None
+        round_number: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant memories.
 
+        Filters run inside ChromaDB, so every candidate matches them and
+        top_k memories come back whenever that many pass the relevance
+        threshold. Candidates are ranked by similarity, weighted (with
+        importance scoring) by importance and by importance_decay_rate per
+        symposium of age.
+
         Args:
             query: Query string for semantic search
             memory_types: Filter by memory types (None = all types)
             top_k: Number of memories to return (None = use config default)
             min_importance: Minimum importance threshold
             round_number: Filter by specific round
+            query_embedding: Precomputed embedding of query (skips embedding;
+                see recall_for_agents)
 
         Returns:
-            List of memory dictionaries with content and metadata
+            List of memory dictionaries with content, metadata, similarity and score
         """
         if top_k is None:
             top_k = self.config.max_memories_per_recall
 
+        # Read your own writes: include memories still queued for storage
+        self.flush()
+
         # Generate query embedding
-        query_embedding = self.embeddings.embed_query(query)
+        if query_embedding is None:
+            query_embedding = self._embed_query(query)
+        n_candidates = top_k * self.config.recall_candidates_per_memory
 
-        # Build metadata filter
-        where_filter = {"domain": self.domain}
+        ids, documents, metadatas, distances, sources = [], [], [], [], []
 
-        if memory_types:
-            # ChromaDB doesn't support IN operator, so we need to query each type
-            # For simplicity, we'll filter in post-processing
-            pass
+        # Short-term memories: in-process index
+        if memory_types is None or MemoryType.SHORT_TERM in memory_types:
+            entries, short_term_distances = self.short_term.search(
+                query_embedding, n_candidates, min_importance, round_number
+            )
+            ids.extend(e['id'] for e in entries)
+            documents.extend(e['insight'] for e in entries)
+            metadatas.extend(e['metadata'] for e in entries)
+            distances.extend(short_term_distances)
+            sources.extend([None] * len(entries))
+
+        # Everything else: this symposium's working collection and the long-term
+        # collection (extra candidates only for re-scoring, not filtering)
+        collections = []
+        if memory_types is None or MemoryType.WORKING in memory_types:
+            collections.append(self.working_collection)
+        if memory_types is None or any(t != MemoryType.SHORT_TERM for t in memory_types):
+            collections.append(self.collection)
+
+        for collection in collections:
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_candidates,
+                where=self._recall_filter(memory_types, min_importance, round_number)
+            )
+            if results['ids'] and results['ids'][0]:
+                ids.extend(results['ids'][0])
+                documents.extend(results['documents'][0])
+                metadatas.extend(results['metadatas'][0])
+                distances.extend(results['distances'][0])
+                sources.extend([collection] * len(results['ids'][0]))
+
+        if not ids:
+            return []
 
-        if round_number is not None:
-            where_filter["round_number"] = round_number
+        distances = np.asarray(distances, dtype=np.float64)
 
-        # Query ChromaDB
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k * 2,  # Get extra, filter later
-            where=where_filter
-        )
+        # Convert distance to similarity
+        similarity = 1.0 / (1.0 + distances)
+        score = similarity
+        if self.config.use_importance_scoring:
+            importance = np.array([m.get('importance', MemoryImportance.MEDIUM) for m in metadatas], dtype=np.float64)
+            score = similarity * importance * self._age_decay(metadatas)
+
+        order = [i for i in np.argsort(-score, kind="stable") if similarity[i] >= self.config.relevance_threshold]
+        order = order[:top_k]
+        memories = [
+            {
+                'id': ids[i],
+                'content': documents[i],
+                'metadata': metadatas[i],
+                'similarity': float(similarity[i]),
+                'distance': float(distances[i]),
+                'score': float(score[i]),
+            }
+            for i in order
+        ]
+
+        # Recency of use for compaction's eviction policy (persisted later by flush_recall_times)
+        recalled_at = datetime.now().isoformat()
+        with self._recalled_lock:
+            for i, memory in zip(order, memories):
+                if sources[i] is not None:
+                    pending = self._recalled.setdefault(sources[i].name, {})
+                    pending[memory['id']] = {**memory['metadata'], 'last_recalled': recalled_at}
+
+        return memories
+
+    def flush_recall_times(self):
+        """Write buffered last_recalled times to ChromaDB in batched updates."""
+        with self._recalled_lock:
+            recalled, self._recalled = self._recalled, {}
+
+        batch_size = self._max_batch_size()
+        for collection in (self.working_collection, self.collection):
+            pending = recalled.get(collection.name)
+            if not pending:
+                continue
+            ids = list(pending)
+            for start in range(0, len(ids), batch_size):
+                chunk = ids[start:start + batch_size]
+                collection.update(ids=chunk, metadatas=[pending[i] for i in chunk])
+
+    def recall_recent(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search only the current round's short-term memories (no ChromaDB query).
 
-        # Format and filter results
-        memories = []
-        if results['documents'] and results['documents'][0]:
-            for i in range(len(results['documents'][0])):
-                metadata = results['metadatas'][0][i]
+        Args:
+            query: Query string
+            top_k: Number of memories to return (None = use config default)
 
-                # Apply filters
-                if memory_types and metadata.get('memory_type') not in memory_types:
-                    continue
+        Returns:
+            List of memory dictionaries, same format as recall
+        """
+        return self.recall(query, memory_types=[MemoryType.SHORT_TERM], top_k=top_k)
+
+    def _embed_query(self, query: str) -> List[float]:
+        """Query embedding, reusing recent ones when config.cache_embeddings is set."""
+        if not self.config.cache_embeddings:
+            return self.embeddings.embed_query(query)
+
+        embedding = self._query_embeddings.get(query)
+        if embedding is None:
+            embedding = self.embeddings.embed_query(query)
+            self._query_embeddings[query] = embedding
+            if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        else:
+            self._query_embeddings.move_to_end(query)
+        return embedding
 
-                if min_importance and metadata.get('importance', 0) < min_importance:
-                    continue
+    def _recall_filter(
+        self,
+        memory_types: Optional[List[str]],
+        min_importance: Optional[float],
+        round_number: Optional[int]
+    ) -> Dict[str, Any]:
+        """ChromaDB where clause for recall."""
+        conditions = [{"domain": {"$eq": self.domain}}]
 
-                # Calculate similarity (ChromaDB returns distances, we want similarity)
-                distance = results['distances'][0][i]
-                similarity = 1 / (1 + distance)  # Convert distance to similarity
+        if memory_types:
+            conditions.append({"memory_type": {"$in": list(memory_types)}})
 
-                if similarity < self.config.relevance_threshold:
-                    continue
+        if min_importance:
+            conditions.append({"importance": {"$gte": min_importance}})
 
-                memory = {
-                    'id': results['ids'][0][i],
-                    'content': results['documents'][0][i],
-                    'metadata': metadata,
-                    'similarity': similarity,
-                    'distance': distance,
-                }
-                memories.append(memory)
+        if round_number is not None:
+            conditions.append({"round_number": {"$eq": round_number}})
 
-        # Sort by importance * similarity
-        if self.config.use_importance_scoring:
-            memories.sort(
-                key=lambda m: m['metadata'].get('importance', 0.5) * m['similarity'],
-                reverse=True
-            )
-        else:
-            memories.sort(key=lambda m: m['similarity'], reverse=True)
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
 
-        # Return top-k
-        return memories[:top_k]
+    def _age_decay(self, metadatas: List[Dict[str, Any]]) -> np.ndarray:
+        """importance_decay_rate ** (age in symposia) for each memory."""
+        return age_decay([m.get("timestamp") for m in metadatas], self.config)
 
     def consolidate_round(
         self,
         round_summary: str,
         round_number: int,
         discussion_messages: Optional[List[Dict[str, str]]] = None,
-        use_llm: bool = True
+        use_llm: bool = True,
+        background: Optional[bool] = None
     ) -> List[str]:
         """
         Extract and store key insights from a discussion round.
@@ -273,13 +595,34 @@ class AgentMemory:
             round_number: Which round (1-4)
             discussion_messages: Optional full discussion for detailed extraction
             use_llm: Whether to use LLM for insight extraction (vs simple parsing)
+            background: Queue extraction and storage on the write-behind worker
+                (None = config.write_behind); recall and promotion wait for it
 
         Returns:
-            List of memory IDs created
+            List of memory IDs created (empty when queued; see flush())
         """
         if not self.config.consolidate_after_round:
             return []
 
+        if background is None:
+            background = self.config.write_behind
+
+        if background:
+            if self._write_executor is None:
+                self._write_executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix=f"memory-{self.domain}",
+                )
+            self._pending_writes.append(self._write_executor.submit(
+                self._consolidate, round_summary, round_number, use_llm
+            ))
+            print(f"\n🧠 Queued Round {round_number} memory consolidation for {self.domain}")
+            return []
+
+        return self._consolidate(round_summary, round_number, use_llm)
+
+    def _consolidate(self, round_summary: str, round_number: int, use_llm: bool) -> List[str]:
+        """Extract insights from a round and store them in one batch."""
         print(f"\n🧠 Consolidating Round {round_number} memories for {self.domain}...")
 
         insights = []
@@ -295,18 +638,12 @@ class AgentMemory:
                 "context": {"source": "round_summary"}
             }]
 
-        # Store insights
-        memory_ids = []
-        for insight_data in insights:
-            memory_id = self.remember(
-                insight=insight_data["content"],
-                context=insight_data.get("context", {}),
-                importance=insight_data.get("importance", MemoryImportance.MEDIUM),
-                memory_type=MemoryType.WORKING,
-                round_number=round_number
-            )
-            if memory_id:
-                memory_ids.append(memory_id)
+        # Store insights (one embedding request, one write)
+        stored = self.remember_many([
+            {**insight_data, "memory_type": MemoryType.WORKING, "round_number": round_number}
+            for insight_data in insights
+        ])
+        memory_ids = [memory_id for memory_id in stored if memory_id]
 
         print(f"    ✓ Stored {len(memory_ids)} insights from Round {round_number}")
         return memory_ids
@@ -431,8 +768,8 @@ class AgentMemory:
         return "\n".join(context_parts)
 
     def clear_short_term(self):
-        """Clear short-term memory buffer."""
-        self.short_term_buffer = []
+        """Clear short-term memory buffer (without promoting it)."""
+        self.short_term.clear()
 
     def promote_to_long_term(self, memory_ids: Optional[List[str]] = None):
         """
@@ -444,61 +781,227 @@ class AgentMemory:
         if not self.config.enable_long_term:
             return
 
-        ids_to_promote = memory_ids or self.working_memory_ids
+        self.flush()
+        # Before moving anything, so promoted memories carry their recall times
+        self.flush_recall_times()
+        promoted_short_term = self._promote_short_term(memory_ids)
 
-        for memory_id in ids_to_promote:
-            # Get the memory
-            result = self.collection.get(ids=[memory_id])
+        ids_to_promote = [i for i in (memory_ids or self.working_memory_ids) if i not in promoted_short_term]
+        if not ids_to_promote:
+            if promoted_short_term:
+                print(f"    ✓ Promoted {len(promoted_short_term)} memories to long-term storage")
+            return
 
-            if result['ids']:
-                # Update metadata to long-term
-                metadata = result['metadatas'][0]
+        promoted_at = datetime.now().isoformat()
+        batch_size = self._max_batch_size()
+
+        # Working memories move from this symposium's collection to the long-term one
+        moved = self.working_collection.get(ids=list(ids_to_promote), include=["embeddings", "documents", "metadatas"])
+        if moved['ids']:
+            # Copies left in long-term by an interrupted earlier move are replaced, not recounted
+            existing = self.collection.get(ids=moved['ids'], include=["metadatas"])
+            already_copied = dict(zip(existing['ids'], existing['metadatas']))
+
+            for start in range(0, len(moved['ids']), batch_size):
+                ids = moved['ids'][start:start + batch_size]
+                previous = [dict(metadata) for metadata in moved['metadatas'][start:start + batch_size]]
+                metadatas = [
+                    {**metadata, 'memory_type': MemoryType.LONG_TERM, 'promoted_at': promoted_at}
+                    for metadata in previous
+                ]
+
+                # Copy first, delete second: a crash in between leaves the batch in
+                # both collections, and the upsert makes the retry idempotent
+                self.collection.upsert(
+                    ids=ids,
+                    embeddings=moved['embeddings'][start:start + batch_size],
+                    documents=moved['documents'][start:start + batch_size],
+                    metadatas=metadatas
+                )
+                self.stats.record_added(
+                    self.collection_name, [m for i, m in zip(ids, metadatas) if i not in already_copied]
+                )
+                self.stats.record_updated(
+                    self.collection_name,
+                    [already_copied[i] for i in ids if i in already_copied],
+                    [m for i, m in zip(ids, metadatas) if i in already_copied]
+                )
+
+                self.working_collection.delete(ids=ids)
+                self.stats.record_removed(self.working_collection_name, previous)
+
+        # Memories already in the long-term collection (e.g. working memories
+        # stored before symposium collections existed) are updated in place
+        moved_ids = set(moved['ids'])
+        remaining = [i for i in ids_to_promote if i not in moved_ids]
+        updated_ids = []
+        if remaining:
+            # One read for every memory, then updates in batches the client accepts
+            result = self.collection.get(ids=remaining, include=["metadatas"])
+            previous = [dict(metadata) for metadata in result['metadatas']]
+            metadatas = []
+            for metadata in result['metadatas']:
                 metadata['memory_type'] = MemoryType.LONG_TERM
-                metadata['promoted_at'] = datetime.now().isoformat()
+                metadata['promoted_at'] = promoted_at
+                metadatas.append(metadata)
 
-                # Update in collection
+            for start in range(0, len(result['ids']), batch_size):
                 self.collection.update(
-                    ids=[memory_id],
-                    metadatas=[metadata]
+                    ids=result['ids'][start:start + batch_size],
+                    metadatas=metadatas[start:start + batch_size]
                 )
+            self.stats.record_updated(self.collection_name, previous, metadatas)
+            updated_ids = result['ids']
+
+        # Promoted memories are no longer working memories (later calls skip them)
+        promoted = moved_ids | set(updated_ids) | promoted_short_term
+        self.working_memory_ids = [i for i in self.working_memory_ids if i not in promoted]
+
+        print(f"    ✓ Promoted {len(moved_ids) + len(updated_ids) + len(promoted_short_term)} memories to long-term storage")
+
+    def _promote_short_term(self, memory_ids: Optional[List[str]] = None) -> set:
+        """Write short-term memories from the in-process index to ChromaDB as long-term (returns their IDs)."""
+        entries, embeddings = self.short_term.drain(memory_ids)
+        if not entries:
+            return set()
+
+        promoted_at = datetime.now().isoformat()
+        metadatas = [
+            {**entry['metadata'], 'memory_type': MemoryType.LONG_TERM, 'promoted_at': promoted_at}
+            for entry in entries
+        ]
+
+        self._add_batched(
+            self.collection,
+            [entry['id'] for entry in entries],
+            embeddings,
+            [entry['insight'] for entry in entries],
+            metadatas
+        )
+        self.stats.record_added(self.collection_name, metadatas)
+        return {entry['id'] for entry in entries}
+
+    def _add_batched(
+        self,
+        collection,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        """Add memories in batches the client accepts."""
+        batch_size = self._max_batch_size()
+        for start in range(0, len(ids), batch_size):
+            collection.add(
+                ids=ids[start:start + batch_size],
+                embeddings=embeddings[start:start + batch_size],
+                documents=documents[start:start + batch_size],
+                metadatas=metadatas[start:start + batch_size]
+            )
 
-        print(f"    ✓ Promoted {len(ids_to_promote)} memories to long-term storage")
+    def _max_batch_size(self) -> int:
+        """Largest add/update batch the ChromaDB client accepts."""
+        return max_batch_size(self.client)
 
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get memory statistics.
 
+        Counts come from counters maintained on write, not from a scan of
+        the collection.
+
         Returns:
             Dictionary with memory counts and metadata
         """
-        all_memories = self.collection.get()
-
-        total_count = len(all_memories['ids'])
-        by_type = {}
-        by_importance = {"high": 0, "medium": 0, "low": 0}
-
-        for metadata in all_memories['metadatas']:
-            # Count by type
-            mem_type = metadata.get('memory_type', 'unknown')
-            by_type[mem_type] = by_type.get(mem_type, 0) + 1
-
-            # Count by importance
-            importance = metadata.get('importance', 0.5)
-            if importance >= 0.8:
-                by_importance["high"] += 1
-            elif importance >= 0.5:
-                by_importance["medium"] += 1
-            else:
-                by_importance["low"] += 1
+        self.flush()
+        stats = self.stats.get(self.collection_name, self.working_collection_name)
 
         return {
-            "total_memories": total_count,
-            "by_type": by_type,
-            "by_importance": by_importance,
+            **stats,
             "current_symposium_count": len(self.working_memory_ids),
             "short_term_buffer_size": len(self.short_term_buffer),
         }
 
+    def rebuild_statistics(self) -> Dict[str, Any]:
+        """
+        Recount the statistics counters from the collections (repair).
+
+        Returns:
+            The rebuilt statistics
+        """
+        self.flush()
+        self._rebuild_collection_statistics(self.collection, self.collection_name)
+        self._rebuild_collection_statistics(self.working_collection, self.working_collection_name)
+
+        return self.get_statistics()
+
+    def _rebuild_collection_statistics(self, collection, name: str):
+        """Recount one collection's counters with a paged metadata scan."""
+        batch_size = self._max_batch_size()
+        metadatas = []
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            metadatas.extend(page['metadatas'])
+            if len(page['ids']) < batch_size:
+                break
+            offset += batch_size
+
+        self.stats.rebuild(name, metadatas)
+
+
+def age_decay(timestamps: List[Optional[str]], config: MemoryConfig) -> np.ndarray:
+    """
+    importance_decay_rate ** (age in symposia) for ISO timestamps.
+
+    Args:
+        timestamps: ISO timestamps (None = now, no decay)
+        config: Memory configuration (decay rate and symposium interval)
+
+    Returns:
+        Decay factors in (0, 1]
+    """
+    now = np.datetime64(datetime.now(), "us")
+    times = np.array([t or now for t in timestamps], dtype="datetime64[us]")
+    age_days = (now - times) / np.timedelta64(1, "D")
+    age_symposia = np.maximum(age_days, 0.0) / config.symposium_interval_days
+    return config.importance_decay_rate ** age_symposia
+
+
+def recall_for_agents(
+    memories: Dict[str, AgentMemory],
+    query: str,
+    top_k: Optional[int] = None,
+    **kwargs
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Recall the same query from several agents' memories at once.
+
+    The query is embedded once (all memories use the same embedding model)
+    and the per-domain recalls run concurrently.
+
+    Args:
+        memories: {domain: AgentMemory}
+        query: Query string shared by every agent
+        top_k: Memories per agent (None = each config's default)
+        **kwargs: Further recall arguments (memory_types, min_importance, round_number)
+
+    Returns:
+        {domain: memories}, same format as AgentMemory.recall
+    """
+    if not memories:
+        return {}
+
+    query_embedding = next(iter(memories.values()))._embed_query(query)
+
+    def recall_one(memory: AgentMemory) -> List[Dict[str, Any]]:
+        return memory.recall(query, top_k=top_k, query_embedding=query_embedding, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=len(memories), thread_name_prefix="memory-recall") as executor:
+        results = list(executor.map(recall_one, memories.values()))
+
+    return dict(zip(memories.keys(), results))
+
 
 def create_memory_for_all_domains(
     config: Optional[MemoryConfig] = None,
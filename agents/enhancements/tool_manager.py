@@ -8,7 +8,15 @@ tool execution and result formatting.
 import json
 from typing import List, Dict, Any, Tuple, Optional
 from tools import get_global_registry, register_default_tools
-from tools.rag_tool import get_rag_integration, RAG_TOOL_NAME, run_rag_query
+from tools.rag_tool import (
+    get_rag_integration,
+    RAG_TOOL_NAME,
+    run_rag_query,
+    prefetch_rag_queries,
+    get_rag_prefetch_stats,
+    get_rag_latency_stats,
+    filter_from_tool_args,
+)
 
 
 class ToolManager:
@@ -123,10 +131,39 @@ class ToolManager:
         # Cap top_k at 10
         top_k = min(top_k, 10)
 
+        # Optional content type / year range / paper filters
+        filter_metadata = filter_from_tool_args(args)
+
         # Run RAG query
-        output = run_rag_query(query, self.domain, top_k)
+        output = run_rag_query(query, self.domain, top_k, filter_metadata=filter_metadata)
         return output
 
+    def prefetch_rag(self, queries: List[str]) -> int:
+        """
+        Warm the knowledge base caches for anticipated RAG queries.
+
+        Args:
+            queries: Queries the agent is likely to issue
+
+        Returns:
+            Number of prefetches submitted
+        """
+        if not self.rag_integration.use_rag:
+            return 0
+        return prefetch_rag_queries(queries, self.domain)
+
+    def get_prefetch_statistics(self) -> Dict[str, Any]:
+        """Prefetch activity and hit rate for this agent's domain."""
+        if not self.rag_integration.use_rag:
+            return {}
+        return get_rag_prefetch_stats(self.domain)
+
+    def get_retrieval_latency(self) -> Dict[str, Any]:
+        """Per-stage knowledge base latency percentiles for this agent's domain."""
+        if not self.rag_integration.use_rag:
+            return {}
+        return get_rag_latency_stats(self.domain)
+
     def _execute_phase4_tool(self, tool_name: str, args: Dict[str, Any]) -> str:
         """Execute Phase 4 tool from registry."""
         tool = self.tool_registry.get_tool(tool_name)
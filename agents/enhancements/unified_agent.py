@@ -13,7 +13,7 @@ This is the recommended interface for creating expert agents.
 
 from typing import Optional, List, Dict, Any, Tuple
 from agents.base_agent import Agent
-from agents.enhancements.memory_system import AgentMemory
+from agents.enhancements.memory_system import AgentMemory, recall_for_agents
 from agents.enhancements.memory_config import MemoryConfig, DEFAULT_MEMORY_CONFIG
 from agents.enhancements.planning_system import AgentPlanner
 from agents.enhancements.tool_manager import ToolManager
@@ -21,6 +21,15 @@ from agents.enhancements.rag_validator import RAGValidator
 from agents.enhancements.react_layer import REACT_INSTRUCTION_TEMPLATE
 
 
+# Memories injected into each round's agenda
+ROUND_MEMORY_TOP_K = 3
+
+
+def round_memory_query(agenda: str, questions: List[str]) -> str:
+    """Memory recall query for a round (the same for every agent)."""
+    return f"{agenda}\n{' '.join(questions)}"
+
+
 class UnifiedAgent:
     """
     Fully-enhanced agent with all capabilities integrated.
@@ -192,27 +201,39 @@ rejected and you will be asked to retry with proper evidence retrieval.
         round_number: int,
         agenda: str,
         questions: List[str],
-        previous_summary: Optional[str] = None
+        previous_summary: Optional[str] = None,
+        memories: Optional[List[Dict[str, Any]]] = None
     ) -> str:
         """
         Prepare for a symposium round: planning + memory retrieval.
 
+        Knowledge base retrievals for the discussion questions and the plan's
+        evidence queries are prefetched in the background, so the agent's
+        tool calls during the meeting are mostly served from the cache.
+
         Args:
             round_number: Round number (1-4)
             agenda: Round agenda text
             questions: Discussion questions
             previous_summary: Summary from previous round (optional)
+            memories: Memories already recalled for this round, with the
+                questions already prefetched (None = do both here; see
+                prepare_agents_for_round)
 
         Returns:
             Enhanced agenda with plan and memories injected
         """
         self.current_round = round_number
 
+        # Questions are known up front: prefetch them while memory + planning run
+        if memories is None:
+            self.tool_manager.prefetch_rag(questions)
+
         # Step 1: Recall relevant memories from previous rounds
         memory_context = ""
         if round_number > 1:
-            query = f"{agenda}\n{' '.join(questions)}"
-            memories = self.memory.recall(query=query, top_k=3)
+            if memories is None:
+                memories = self.memory.recall(query=round_memory_query(agenda, questions), top_k=ROUND_MEMORY_TOP_K)
 
             if memories:
                 memory_context = "\n\n" + "="*80 + "\n"
@@ -232,6 +253,10 @@ rejected and you will be asked to retry with proper evidence retrieval.
             save_plan=True
         )
 
+        # Prefetch the evidence the plan says the agent will look for (the
+        # questions are already in flight; main points are claims, not queries)
+        self.tool_manager.prefetch_rag(plan.evidence_needed)
+
         # Step 3: Format plan for display
         plan_context = "\n\n" + "="*80 + "\n"
         plan_context += f"📋 YOUR STRATEGIC PLAN FOR ROUND {round_number}:\n"
@@ -325,15 +350,17 @@ rejected and you will be asked to retry with proper evidence retrieval.
             "tool_usage": self.tool_manager.get_usage_statistics(),
             "memory_stats": {
                 "symposium_id": self.memory.symposium_id,
-                "collection_name": self.memory.collection.name
+                "collection_name": self.memory.collection.name,
+                "working_collection_name": self.memory.working_collection_name
             },
             "validation_stats": self.rag_validator.get_validation_stats(),
+            "rag_prefetch": self.tool_manager.get_prefetch_statistics(),
             "planning_cost": self.planner.get_total_planning_cost()
         }
 
     def export_agent_data(self, output_dir: str):
         """
-        Export all agent data (plans, memories, stats).
+        Export all agent data (plans, memories, stats, retrieval latency).
 
         Args:
             output_dir: Directory to save exports
@@ -352,6 +379,14 @@ rejected and you will be asked to retry with proper evidence retrieval.
         with open(stats_file, 'w') as f:
             json.dump(self.get_statistics(), f, indent=2)
 
+        # Export retrieval latency percentiles (per stage)
+        latency_file = output_path / f"{self.domain}_retrieval_latency.json"
+        with open(latency_file, 'w') as f:
+            json.dump({
+                "domain": self.domain,
+                "stages": self.tool_manager.get_retrieval_latency()
+            }, f, indent=2)
+
         print(f"✓ Exported {self.domain} agent data to {output_dir}")
 
     def promote_to_long_term_memory(self):
@@ -369,6 +404,7 @@ rejected and you will be asked to retry with proper evidence retrieval.
         """
         # Promote current memories
         self.promote_to_long_term_memory()
+        self.memory.close()
 
         # Reset state
         self.current_round = 0
@@ -407,3 +443,51 @@ rejected and you will be asked to retry with proper evidence retrieval.
         elif isinstance(other, Agent):
             return self.base_agent == other
         return False
+
+
+def prepare_agents_for_round(
+    agents: Dict[str, UnifiedAgent],
+    round_number: int,
+    agenda: str,
+    questions: List[str],
+    previous_summary: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Prepare several agents for a round with one batched memory recall.
+
+    The shared round query is embedded once and every agent's memory is
+    searched concurrently, instead of one embedding and query per agent.
+    Question prefetches are issued for every agent first, since recall waits
+    for any write-behind consolidation of the previous round.
+
+    Args:
+        agents: {domain: UnifiedAgent}
+        round_number: Round number (1-4)
+        agenda: Round agenda text
+        questions: Discussion questions
+        previous_summary: Summary from previous round (optional)
+
+    Returns:
+        {domain: enhanced agenda}
+    """
+    for agent in agents.values():
+        agent.tool_manager.prefetch_rag(questions)
+
+    recalled = {}
+    if round_number > 1:
+        recalled = recall_for_agents(
+            {domain: agent.memory for domain, agent in agents.items()},
+            round_memory_query(agenda, questions),
+            top_k=ROUND_MEMORY_TOP_K,
+        )
+
+    return {
+        domain: agent.prepare_for_round(
+            round_number=round_number,
+            agenda=agenda,
+            questions=questions,
+            previous_summary=previous_summary,
+            memories=recalled.get(domain, [])
+        )
+        for domain, agent in agents.items()
+    }
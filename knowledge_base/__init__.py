@@ -7,6 +7,7 @@ ion transport symposium by maintaining a vector database of domain-specific pape
 Main Components:
 - ingest_papers.py: Ingests PDFs and creates vector database
 - query_rag.py: Queries the knowledge base and retrieves relevant information
+- retrieval_service.py / retrieval_client.py: Shared warm engine for many processes
 
 Usage:
     # Ingest papers (run once after adding new PDFs)
@@ -19,6 +20,13 @@ Usage:
     context = get_context_for_agent("pore size effects", domain="nanofluidics", top_k=5)
 """
 
-from .query_rag import query_papers, get_context_for_agent, RAGQueryEngine
+__all__ = ['query_papers', 'get_context_for_agent', 'aget_context_for_agent', 'get_query_engine', 'get_cache_stats', 'get_latency_stats', 'prefetch_context_for_agent', 'get_prefetch_stats', 'RAGQueryEngine']
 
-__all__ = ['query_papers', 'get_context_for_agent', 'RAGQueryEngine']
+
+def __getattr__(name):
+    # Import query_rag (chromadb, langchain) on first use, so lightweight
+    # submodules such as retrieval_client can be imported without it
+    if name in __all__:
+        from . import query_rag
+        return getattr(query_rag, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
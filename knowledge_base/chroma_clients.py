@@ -0,0 +1,120 @@
+"""
+Shared ChromaDB Clients
+
+Every AgentMemory used to open its own PersistentClient on memory_db, and every
+RAGQueryEngine, ingester and index tool its own on vector_db. This module keeps
+one client per (path, settings) for the whole process and caches collection
+handles on top of it, so agents start faster and the process holds one SQLite
+connection pool and one copy of each HNSW index per store.
+
+Collection handles are cached by (store, name). Code that deletes a collection
+must call evict_collection so the stale handle is not served again.
+
+Usage:
+    from knowledge_base.chroma_clients import get_chroma_client, get_shared_collection
+
+    client = get_chroma_client(vector_db_dir)
+    collection = get_shared_collection(memory_db_path, "biology_agent_memory", metadata={...})
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+
+# Shared state (guarded by _lock)
+_clients: Dict[Tuple, Any] = {}
+_collections: Dict[Tuple, Any] = {}
+_lock = threading.Lock()
+
+
+def _client_key(path, settings: Dict[str, Any]) -> Tuple:
+    return (str(Path(path).resolve()), tuple(sorted(settings.items())))
+
+
+def get_chroma_client(path, anonymized_telemetry: bool = False, **settings):
+    """
+    Process-wide PersistentClient for a store.
+
+    Args:
+        path: ChromaDB directory (created if missing)
+        anonymized_telemetry: ChromaDB telemetry setting
+        **settings: Further chromadb.config.Settings fields
+
+    Returns:
+        The shared client for this path and settings
+    """
+    settings["anonymized_telemetry"] = anonymized_telemetry
+    key = _client_key(path, settings)
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            import chromadb
+            from chromadb.config import Settings
+
+            Path(path).mkdir(parents=True, exist_ok=True)
+            client = chromadb.PersistentClient(path=key[0], settings=Settings(**settings))
+            _clients[key] = client
+        return client
+
+
+def get_shared_collection(path, name: str, metadata: Optional[Dict[str, Any]] = None, **settings):
+    """
+    Cached collection handle from the shared client of a store.
+
+    Args:
+        path: ChromaDB directory
+        name: Collection name (concrete, not an alias)
+        metadata: Create the collection with this metadata if it does not
+            exist; an existing collection keeps its own (None = it must exist)
+        **settings: Client settings (see get_chroma_client)
+
+    Returns:
+        ChromaDB collection
+
+    Raises:
+        Exception: ChromaDB's not-found error when metadata is None and the
+            collection does not exist
+    """
+    client = get_chroma_client(path, **settings)
+    key = (_client_key(path, {"anonymized_telemetry": False, **settings}), name)
+
+    collection = _collections.get(key)
+    if collection is not None:
+        return collection
+
+    with _lock:
+        collection = _collections.get(key)
+        if collection is None:
+            if metadata is None:
+                collection = client.get_collection(name=name)
+            else:
+                # Not get_or_create_collection: some ChromaDB versions overwrite an
+                # existing collection's metadata with the one passed in
+                try:
+                    collection = client.get_collection(name=name)
+                except Exception:
+                    try:
+                        collection = client.create_collection(name=name, metadata=metadata)
+                    except Exception:
+                        # Created concurrently by another process
+                        collection = client.get_collection(name=name)
+            _collections[key] = collection
+        return collection
+
+
+def max_batch_size(client) -> int:
+    """Largest add/update/delete batch a ChromaDB client accepts."""
+    get_max_batch_size = getattr(client, "get_max_batch_size", None)
+    if get_max_batch_size is not None:
+        return get_max_batch_size()
+    return getattr(client, "max_batch_size", 5000)
+
+
+def evict_collection(path, name: str):
+    """Drop cached handles of a collection (call after deleting it)."""
+    store = str(Path(path).resolve())
+    with _lock:
+        for key in [key for key in _collections if key[0][0] == store and key[1] == name]:
+            del _collections[key]
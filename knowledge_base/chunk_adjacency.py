@@ -0,0 +1,126 @@
+"""
+Chunk Adjacency Index
+
+Chunk IDs are MD5 hashes of content, so the neighbours of a retrieved chunk
+cannot be derived from its ID. This module keeps a small side index,
+(filename, chunk_id) → document ID, per collection. It is written at ingest
+time (and can be backfilled from existing metadata) so that a hit can be
+expanded with its ±n neighbouring chunks in a single collection.get().
+
+Storage: JSON file per collection in <vector_db>/chunk_adjacency/
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+INDEX_SUBDIR = "chunk_adjacency"
+BACKFILL_BATCH_SIZE = 1000  # Metadata rows fetched per get() when backfilling
+
+
+class ChunkAdjacencyIndex:
+    """Maps (filename, chunk_id) to document IDs for one collection."""
+
+    def __init__(self, collection_name: str, entries: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Initialize adjacency index.
+
+        Args:
+            collection_name: ChromaDB collection the index describes
+            entries: {filename: {str(chunk_id): doc_id}}
+        """
+        self.collection_name = collection_name
+        self.entries: Dict[str, Dict[str, str]] = entries or {}
+
+    def __len__(self) -> int:
+        return sum(len(chunks) for chunks in self.entries.values())
+
+    def add(self, filename: str, chunk_id: int, doc_id: str):
+        """Register one text chunk."""
+        self.entries.setdefault(filename, {})[str(chunk_id)] = doc_id
+
+    def add_chunks(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Register a batch of chunks (non-text chunks are ignored)."""
+        for doc_id, metadata in zip(ids, metadatas):
+            if metadata.get('content_type', 'text') != 'text':
+                continue
+            if 'chunk_id' not in metadata or 'filename' not in metadata:
+                continue
+            self.add(metadata['filename'], metadata['chunk_id'], doc_id)
+
+    def neighbor_ids(self, filename: str, chunk_id: int, radius: int) -> List[str]:
+        """
+        Document IDs of the chunks within ±radius of a chunk (excluding itself).
+
+        Args:
+            filename: Paper filename
+            chunk_id: Position of the chunk within the paper
+            radius: Number of neighbours on each side
+
+        Returns:
+            Neighbour IDs in document order
+        """
+        chunks = self.entries.get(filename, {})
+        ids = []
+        for offset in range(-radius, radius + 1):
+            if offset == 0:
+                continue
+            doc_id = chunks.get(str(int(chunk_id) + offset))
+            if doc_id is not None:
+                ids.append(doc_id)
+        return ids
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def index_path(vector_db_dir: Path, collection_name: str) -> Path:
+        """Location of the on-disk index file for a collection."""
+        return Path(vector_db_dir) / INDEX_SUBDIR / f"{collection_name}.json"
+
+    def save(self, vector_db_dir: Path) -> Path:
+        """Atomically write the index next to the vector database."""
+        path = self.index_path(vector_db_dir, self.collection_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        return path
+
+    @classmethod
+    def load(cls, vector_db_dir: Path, collection_name: str) -> Optional["ChunkAdjacencyIndex"]:
+        """Load a saved index, or None if it does not exist."""
+        path = cls.index_path(vector_db_dir, collection_name)
+        if not path.exists():
+            return None
+
+        with open(path, encoding='utf-8') as f:
+            return cls(collection_name, json.load(f))
+
+    @classmethod
+    def build_from_collection(cls, collection) -> "ChunkAdjacencyIndex":
+        """
+        Backfill an index from the metadata already stored in a collection.
+
+        Args:
+            collection: ChromaDB collection
+
+        Returns:
+            ChunkAdjacencyIndex
+        """
+        index = cls(collection.name)
+        total = collection.count()
+
+        for offset in range(0, total, BACKFILL_BATCH_SIZE):
+            batch = collection.get(include=['metadatas'], limit=BACKFILL_BATCH_SIZE, offset=offset)
+            if not batch['ids']:
+                break
+            index.add_chunks(batch['ids'], batch['metadatas'])
+
+        return index
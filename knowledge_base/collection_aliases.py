@@ -0,0 +1,232 @@
+"""
+Collection Alias Registry
+
+Lets the knowledge base be rebuilt without touching the collections agents are
+querying. Ingestion writes a complete new version (`{domain}_papers__v7`),
+validates it, then points the alias (`{domain}_papers`) at it in one atomic
+file replace. RAGQueryEngine resolves aliases on every query, so running
+symposia switch over on their next retrieval. Earlier versions stay available
+for rollback until garbage collected.
+
+A name without an alias resolves to itself, so unversioned collections from
+before versioning keep working until the first swap.
+
+Storage: <vector_db>/collection_aliases.json
+    {"aliases": {alias: collection}, "history": {alias: [previous collections]}}
+
+Usage:
+    python knowledge_base/ingest_papers.py --new-version      # build, validate, swap
+    python knowledge_base/ingest_papers.py --rollback nanofluidics
+    python knowledge_base/ingest_papers.py --gc --keep-versions 2
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from knowledge_base.chroma_clients import evict_collection
+
+
+# Configuration
+ALIAS_FILE = "collection_aliases.json"
+VERSION_SEPARATOR = "__v"
+KEEP_VERSIONS = 2  # Newest versions kept by garbage collection (the live one is always kept)
+
+_VERSION_PATTERN = re.compile(rf"^(?P<alias>.+){VERSION_SEPARATOR}(?P<version>\d+)$")
+
+# Side index files written per collection (see chunk_adjacency, truncated_index, domain_router)
+SIDE_INDEX_GLOBS = (
+    "chunk_adjacency/{name}.json",
+    "truncated_index/{name}_d*.npz",
+    "domain_centroids/{name}.npz",
+)
+
+
+def versioned_name(alias: str, version: int) -> str:
+    """Collection name of a version, e.g. nanofluidics_papers__v7."""
+    return f"{alias}{VERSION_SEPARATOR}{version}"
+
+
+def parse_versioned_name(name: str) -> Optional[Tuple[str, int]]:
+    """Split a versioned collection name into (alias, version), or None if unversioned."""
+    match = _VERSION_PATTERN.match(name)
+    if match is None:
+        return None
+    return match.group("alias"), int(match.group("version"))
+
+
+class CollectionAliasRegistry:
+    """Alias → collection mapping shared by ingestion and every query engine."""
+
+    def __init__(self, vector_db_dir: Path):
+        """
+        Initialize registry.
+
+        Args:
+            vector_db_dir: Vector database directory (the registry file lives there)
+        """
+        self.vector_db_dir = Path(vector_db_dir)
+        self.path = self.vector_db_dir / ALIAS_FILE
+        self._aliases: Dict[str, str] = {}
+        self._history: Dict[str, List[str]] = {}
+        self._mtime: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        """Reload the registry if another process has swapped an alias."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            self._aliases, self._history, self._mtime = {}, {}, None
+            return
+
+        if mtime != self._mtime:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self._aliases = data.get("aliases", {})
+            self._history = data.get("history", {})
+            self._mtime = mtime
+
+    def _write(self):
+        """Atomically replace the registry file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"aliases": self._aliases, "history": self._history}, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def resolve(self, name: str) -> str:
+        """
+        Collection currently behind a name.
+
+        Args:
+            name: Alias (e.g. nanofluidics_papers) or concrete collection name
+
+        Returns:
+            Target collection name (the name itself if it is not an alias)
+        """
+        with self._lock:
+            self._refresh()
+            return self._aliases.get(name, name)
+
+    def get_aliases(self) -> Dict[str, Any]:
+        """Current targets and rollback history of every alias."""
+        with self._lock:
+            self._refresh()
+            return {
+                alias: {"target": target, "history": list(self._history.get(alias, []))}
+                for alias, target in self._aliases.items()
+            }
+
+    def swap(self, alias: str, target: str) -> str:
+        """
+        Point an alias at a new collection.
+
+        Args:
+            alias: Alias to update
+            target: Collection to serve from now on
+
+        Returns:
+            The collection the alias resolved to before the swap
+        """
+        with self._lock:
+            self._refresh()
+            previous = self._aliases.get(alias, alias)
+            if previous != target:
+                self._history.setdefault(alias, []).append(previous)
+            self._aliases[alias] = target
+            self._write()
+            return previous
+
+    def rollback(self, alias: str) -> str:
+        """
+        Point an alias back at the collection it served before the last swap.
+
+        Args:
+            alias: Alias to roll back
+
+        Returns:
+            The collection now served
+
+        Raises:
+            ValueError: If the alias has no earlier version
+        """
+        with self._lock:
+            self._refresh()
+            history = self._history.get(alias, [])
+            if not history:
+                raise ValueError(f"No earlier version of '{alias}' to roll back to")
+
+            previous = history.pop()
+            if previous == alias:
+                # Back to the unversioned collection
+                self._aliases.pop(alias, None)
+            else:
+                self._aliases[alias] = previous
+            self._write()
+            return previous
+
+    def next_version(self, alias: str, client) -> int:
+        """Version number for a new build of an alias (one above any existing version)."""
+        versions = [0]
+        for name in list_collection_names(client) + [self.resolve(alias)]:
+            parsed = parse_versioned_name(name)
+            if parsed is not None and parsed[0] == alias:
+                versions.append(parsed[1])
+        return max(versions) + 1
+
+    def garbage_collect(self, alias: str, client, keep: int = KEEP_VERSIONS) -> List[str]:
+        """
+        Delete old versions of an alias and their side index files.
+
+        The live version and the newest `keep` versions are kept, so recent
+        rollbacks remain possible. Unversioned collections are never deleted.
+
+        Args:
+            alias: Alias whose versions to collect
+            client: ChromaDB client
+            keep: Number of newest versions to keep
+
+        Returns:
+            Names of the deleted collections
+        """
+        live = self.resolve(alias)
+        versions = []
+        for name in list_collection_names(client):
+            parsed = parse_versioned_name(name)
+            if parsed is not None and parsed[0] == alias:
+                versions.append((parsed[1], name))
+        versions.sort(reverse=True)
+
+        kept = {name for _, name in versions[:keep]} | {live}
+        deleted = []
+        for _, name in versions:
+            if name in kept:
+                continue
+            client.delete_collection(name=name)
+            evict_collection(self.vector_db_dir, name)
+            self._remove_side_indexes(name)
+            deleted.append(name)
+
+        if deleted:
+            with self._lock:
+                self._refresh()
+                history = self._history.get(alias, [])
+                self._history[alias] = [name for name in history if name not in deleted]
+                self._write()
+
+        return deleted
+
+    def _remove_side_indexes(self, collection_name: str):
+        for pattern in SIDE_INDEX_GLOBS:
+            for path in self.vector_db_dir.glob(pattern.format(name=collection_name)):
+                path.unlink()
+
+
+def list_collection_names(client) -> List[str]:
+    """Collection names across ChromaDB versions (objects before 0.6, names after)."""
+    return [getattr(c, "name", c) for c in client.list_collections()]
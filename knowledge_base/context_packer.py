@@ -0,0 +1,214 @@
+"""
+Token-Budgeted Context Packer
+
+Packs retrieved chunks into a compact, citation-grouped context string that
+fits a token budget:
+- Adjacent chunks of the same paper are merged (with the splitter overlap removed)
+- Each paper's citation header is printed once
+- Passages are admitted by relevance until the budget is spent; the last
+  admitted passage may be truncated
+
+Tool results are re-sent on every later turn of a meeting, so every token
+saved here is saved many times over.
+
+Usage:
+    from knowledge_base.context_packer import pack_results
+
+    context = pack_results(results, token_budget=1500)
+"""
+
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+
+from knowledge_base.diversification import paper_key
+
+
+# Configuration
+DEFAULT_TOKEN_BUDGET = 1500  # Tokens of evidence per tool result
+TOKENIZER_MODEL = "gpt-4o"  # Model whose tokenizer is used for counting
+MIN_TRUNCATED_PASSAGE_TOKENS = 60  # Don't admit truncated passages shorter than this
+MIN_OVERLAP_CHARS = 20  # Shortest suffix/prefix match treated as splitter overlap
+MAX_OVERLAP_CHARS = 400  # Longest suffix/prefix match searched (2x CHUNK_OVERLAP)
+
+
+@lru_cache(maxsize=4)
+def get_encoder(model: str = TOKENIZER_MODEL):
+    """
+    Get a cached tiktoken encoder.
+
+    Args:
+        model: Model name to pick the encoding for
+
+    Returns:
+        tiktoken Encoding, or None if tiktoken is not installed
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text (≈ chars/4 when tiktoken is unavailable)."""
+    encoder = get_encoder()
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens tokens, marking the cut with an ellipsis."""
+    encoder = get_encoder()
+    if encoder is None:
+        max_chars = max_tokens * 4
+        return text if len(text) <= max_chars else text[:max_chars].rstrip() + " …"
+
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens]).rstrip() + " …"
+
+
+def _join_overlapping(first: str, second: str) -> str:
+    """Concatenate two consecutive chunks, dropping the splitter overlap."""
+    limit = min(len(first), len(second), MAX_OVERLAP_CHARS)
+    for size in range(limit, MIN_OVERLAP_CHARS - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return first + "\n" + second
+
+
+def _format_header(metadata: Dict[str, Any]) -> str:
+    """Citation header for a paper: [Source N] is prefixed by the caller."""
+    citation = metadata.get('citation', 'Citation unavailable')
+    title = metadata.get('title', 'Unknown Title')
+    authors = metadata.get('authors', 'Unknown')
+    year = metadata.get('year', 'n.d.')
+    return f"{authors} ({year}) - {title}\nCitation: {citation}"
+
+
+def merge_adjacent_chunks(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge consecutive text chunks from the same paper into passages.
+
+    Args:
+        results: Retrieval results (text, metadata, distance), best first
+
+    Returns:
+        List of passages {paper, metadata, text, rank, start}; rank is the
+        best (lowest) retrieval rank of any member chunk
+    """
+    passages: List[Dict[str, Any]] = []
+    runs: Dict[str, List[Dict[str, Any]]] = {}
+
+    for rank, result in enumerate(results):
+        metadata = result['metadata']
+        paper = paper_key(metadata)
+        chunk_id = metadata.get('chunk_id')
+        content_type = metadata.get('content_type', 'text')
+
+        if chunk_id is None or content_type != 'text':
+            passages.append({
+                'paper': paper, 'metadata': metadata, 'text': result['text'],
+                'rank': rank, 'start': None,
+            })
+            continue
+
+        runs.setdefault(paper, []).append({
+            'chunk_id': int(chunk_id), 'text': result['text'],
+            'metadata': metadata, 'rank': rank,
+        })
+
+    for paper, chunks in runs.items():
+        chunks.sort(key=lambda c: c['chunk_id'])
+        current = None
+        for chunk in chunks:
+            if current is not None and chunk['chunk_id'] == current['end'] + 1:
+                current['text'] = _join_overlapping(current['text'], chunk['text'])
+                current['end'] = chunk['chunk_id']
+                current['rank'] = min(current['rank'], chunk['rank'])
+            elif current is not None and chunk['chunk_id'] == current['end']:
+                continue  # Duplicate chunk
+            else:
+                if current is not None:
+                    passages.append(current)
+                current = {
+                    'paper': paper, 'metadata': chunk['metadata'], 'text': chunk['text'],
+                    'rank': chunk['rank'], 'start': chunk['chunk_id'], 'end': chunk['chunk_id'],
+                }
+        if current is not None:
+            passages.append(current)
+
+    return passages
+
+
+def pack_results(
+    results: List[Dict[str, Any]],
+    token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET
+) -> str:
+    """
+    Pack retrieval results into a citation-grouped context string.
+
+    Args:
+        results: Retrieval results (text, metadata, distance), best first
+        token_budget: Maximum tokens for the packed context (None = unlimited)
+
+    Returns:
+        Formatted context string
+    """
+    if not results:
+        return ""
+
+    passages = merge_adjacent_chunks(results)
+    passages.sort(key=lambda p: p['rank'])
+
+    # Admit passages by relevance until the budget is spent
+    admitted: List[Dict[str, Any]] = []
+    headers: Dict[str, str] = {}
+    used = 0
+
+    for passage in passages:
+        header_cost = 0
+        if passage['paper'] not in headers:
+            header_cost = count_tokens(_format_header(passage['metadata'])) + 8
+
+        text = passage['text']
+        cost = header_cost + count_tokens(text)
+
+        if token_budget is not None and used + cost > token_budget:
+            remaining = token_budget - used - header_cost
+            if remaining < MIN_TRUNCATED_PASSAGE_TOKENS:
+                continue
+            text = truncate_to_tokens(text, remaining)
+            cost = header_cost + remaining
+
+        if passage['paper'] not in headers:
+            headers[passage['paper']] = _format_header(passage['metadata'])
+
+        admitted.append({**passage, 'text': text})
+        used += cost
+
+    # Group by paper (papers in order of best relevance, passages in document order)
+    paper_order: List[str] = []
+    by_paper: Dict[str, List[Dict[str, Any]]] = {}
+    for passage in admitted:
+        if passage['paper'] not in by_paper:
+            paper_order.append(passage['paper'])
+            by_paper[passage['paper']] = []
+        by_paper[passage['paper']].append(passage)
+
+    sections = []
+    for i, paper in enumerate(paper_order, 1):
+        paper_passages = sorted(
+            by_paper[paper],
+            key=lambda p: (p['start'] is None, p['start'] if p['start'] is not None else p['rank'])
+        )
+        body = "\n\n[...]\n\n".join(p['text'] for p in paper_passages)
+        sections.append(f"[Source {i}] {headers[paper]}\n\n{body}")
+
+    return "\n\n---\n\n".join(sections)
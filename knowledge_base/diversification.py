@@ -0,0 +1,117 @@
+"""
+Paper-Aware Result Diversification
+
+Nearest-neighbour search tends to return several adjacent chunks of the same
+paper. This module re-selects a candidate set with maximal marginal relevance
+(MMR) over the candidates' embeddings and caps how many chunks any one paper
+may contribute, so each retrieved slot carries distinct evidence.
+
+Usage:
+    from knowledge_base.diversification import mmr_select, paper_key
+
+    order = mmr_select(query_embedding, candidate_embeddings, top_k=5,
+                       group_keys=[paper_key(r['metadata']) for r in results],
+                       max_per_group=2)
+"""
+
+from typing import List, Dict, Any, Optional, Sequence
+import numpy as np
+
+
+def paper_key(metadata: Dict[str, Any]) -> str:
+    """
+    Identify the paper a chunk belongs to.
+
+    Prefers DOI, then filename, then title.
+
+    Args:
+        metadata: Chunk metadata
+
+    Returns:
+        Stable paper identifier string
+    """
+    for key in ('doi', 'filename', 'title'):
+        value = metadata.get(key)
+        if value and value != 'Unknown':
+            return str(value)
+    return 'unknown'
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length (zero rows are left as-is)."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def mmr_select(
+    query_embedding: Sequence[float],
+    candidate_embeddings: Sequence[Sequence[float]],
+    top_k: int,
+    lambda_mult: float = 0.7,
+    group_keys: Optional[List[str]] = None,
+    max_per_group: Optional[int] = None
+) -> List[int]:
+    """
+    Greedy maximal-marginal-relevance selection with an optional per-group cap.
+
+    score(i) = λ · sim(query, i) − (1 − λ) · max_{j ∈ selected} sim(i, j)
+
+    Similarities are cosine, computed once as a query vector and an n×n
+    candidate matrix; each greedy step is a vectorized update.
+
+    Args:
+        query_embedding: Query vector
+        candidate_embeddings: Candidate vectors (n, d), in retrieval order
+        top_k: Number of candidates to select
+        lambda_mult: Relevance/diversity trade-off (1.0 = pure relevance)
+        group_keys: Group (paper) of each candidate, for the per-group cap
+        max_per_group: Maximum selections per group (None = no cap)
+
+    Returns:
+        Indices into candidate_embeddings, in selection order
+    """
+    candidates = np.asarray(candidate_embeddings, dtype=np.float32)
+    n = len(candidates)
+    if n == 0 or top_k <= 0:
+        return []
+
+    candidates = _normalize_rows(candidates)
+    query = _normalize_rows(np.asarray(query_embedding, dtype=np.float32))
+
+    relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+
+    max_sim_to_selected = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    group_counts: Dict[str, int] = {}
+    selected: List[int] = []
+
+    def select_round(respect_cap: bool):
+        while len(selected) < min(top_k, n):
+            mask = available.copy()
+            if respect_cap and group_keys is not None and max_per_group is not None:
+                for i in np.flatnonzero(mask):
+                    if group_counts.get(group_keys[i], 0) >= max_per_group:
+                        mask[i] = False
+            if not mask.any():
+                return
+
+            redundancy = np.where(np.isfinite(max_sim_to_selected), max_sim_to_selected, 0.0)
+            scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+            scores[~mask] = -np.inf
+
+            best = int(np.argmax(scores))
+            selected.append(best)
+            available[best] = False
+            np.maximum(max_sim_to_selected, pairwise[best], out=max_sim_to_selected)
+            if group_keys is not None:
+                group_counts[group_keys[best]] = group_counts.get(group_keys[best], 0) + 1
+
+    select_round(respect_cap=True)
+
+    # Too few distinct papers to fill top_k under the cap: fill by plain MMR
+    if len(selected) < min(top_k, n):
+        select_round(respect_cap=False)
+
+    return selected
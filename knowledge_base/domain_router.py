@@ -0,0 +1,301 @@
+"""
+Domain Router
+
+Cross-disciplinary queries (query_papers(domain="all"), PI and critic
+questions) used to fan out to every domain collection. This module keeps a
+small summary of each collection's embedding space: the running mean of its
+chunk embeddings plus a few k-means cluster centres. A query embedding is
+scored against all of them with one matmul and only sent to the domains whose
+best similarity clears a threshold.
+
+The mean is updated incrementally at ingest; the clusters are refreshed by
+`build`. Both live in <vector_db>/domain_centroids/<collection>.npz.
+
+Usage:
+    # Build (or rebuild) centroids for every domain collection
+    python -m knowledge_base.domain_router build
+
+    # Show how a query would be routed
+    python -m knowledge_base.domain_router route "ion selectivity in biological channels"
+"""
+
+import os
+from pathlib import Path
+from typing import List, Dict, Optional
+import numpy as np
+
+from knowledge_base.truncated_index import export_collection_embeddings
+
+
+# Configuration
+INDEX_SUBDIR = "domain_centroids"
+DEFAULT_CLUSTERS = 8  # Cluster centres kept per domain (besides the mean)
+KMEANS_ITERATIONS = 20
+KMEANS_SEED = 0
+ROUTER_THRESHOLD = float(os.getenv("RAG_ROUTER_THRESHOLD", "0.35"))  # Cosine similarity to route a query to a domain
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Unit-normalize rows; zero rows (failed embeddings) stay zero."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def spherical_kmeans(vectors: np.ndarray, k: int, iterations: int = KMEANS_ITERATIONS) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity.
+
+    Args:
+        vectors: (n, d) unit vectors
+        k: Number of clusters (capped at n)
+        iterations: Assignment/update rounds
+
+    Returns:
+        (k, d) unit cluster centres
+    """
+    k = min(k, len(vectors))
+    if k == 0:
+        return np.zeros((0, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+
+    rng = np.random.default_rng(KMEANS_SEED)
+    centres = vectors[rng.choice(len(vectors), size=k, replace=False)]
+
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centres.T, axis=1)
+        updated = np.zeros_like(centres)
+        np.add.at(updated, assignment, vectors)
+        # Keep the previous centre for clusters that lost all members
+        empty = ~np.any(updated, axis=1)
+        updated[empty] = centres[empty]
+        updated = _normalize_rows(updated)
+        if np.allclose(updated, centres):
+            break
+        centres = updated
+
+    return centres
+
+
+class DomainCentroids:
+    """Embedding-space summary of one collection: running mean plus cluster centres."""
+
+    def __init__(
+        self,
+        collection_name: str,
+        total: Optional[np.ndarray] = None,
+        count: int = 0,
+        clusters: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize domain centroids.
+
+        Args:
+            collection_name: ChromaDB collection the centroids describe
+            total: Sum of the unit chunk embeddings (None = empty)
+            count: Number of embeddings summed into total
+            clusters: (k, d) unit cluster centres (None = none yet)
+        """
+        self.collection_name = collection_name
+        self.total = total
+        self.count = count
+        self.clusters = clusters
+
+    def add_embeddings(self, embeddings: List[List[float]]):
+        """Fold newly ingested chunk embeddings into the running mean."""
+        vectors = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        if vectors.size == 0:
+            return
+        batch_total = vectors.sum(axis=0)
+        self.total = batch_total if self.total is None else self.total + batch_total
+        self.count += len(vectors)
+
+    def vectors(self) -> np.ndarray:
+        """Unit vectors the router scores against (mean first, then clusters)."""
+        if self.total is None or self.count == 0:
+            return np.zeros((0, 0), dtype=np.float32)
+        rows = [self.total[None, :]]
+        if self.clusters is not None and len(self.clusters):
+            rows.append(self.clusters)
+        return _normalize_rows(np.vstack(rows))
+
+    @classmethod
+    def build_from_collection(cls, collection, n_clusters: int = DEFAULT_CLUSTERS) -> "DomainCentroids":
+        """
+        Compute mean and clusters from the embeddings stored in a collection.
+
+        Args:
+            collection: ChromaDB collection
+            n_clusters: Cluster centres to keep
+
+        Returns:
+            DomainCentroids
+        """
+        _, embeddings = export_collection_embeddings(collection)
+        centroids = cls(collection.name)
+        if len(embeddings) == 0:
+            return centroids
+
+        centroids.add_embeddings(embeddings)
+        vectors = _normalize_rows(embeddings)
+        centroids.clusters = spherical_kmeans(vectors[np.any(vectors, axis=1)], n_clusters)
+        return centroids
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def index_path(vector_db_dir: Path, collection_name: str) -> Path:
+        """Location of the on-disk centroid file for a collection."""
+        return Path(vector_db_dir) / INDEX_SUBDIR / f"{collection_name}.npz"
+
+    def save(self, vector_db_dir: Path) -> Optional[Path]:
+        """Write the centroids next to the vector database (nothing to write if empty)."""
+        if self.total is None:
+            return None
+
+        path = self.index_path(vector_db_dir, self.collection_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        clusters = self.clusters if self.clusters is not None else np.zeros((0, len(self.total)), dtype=np.float32)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, total=self.total, count=np.asarray(self.count), clusters=clusters)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, vector_db_dir: Path, collection_name: str) -> Optional["DomainCentroids"]:
+        """Load saved centroids, or None if they were never built."""
+        path = cls.index_path(vector_db_dir, collection_name)
+        if not path.exists():
+            return None
+
+        data = np.load(path)
+        return cls(collection_name, data["total"], int(data["count"]), data["clusters"])
+
+
+class DomainRouter:
+    """Scores a query embedding against every domain's centroids in one matmul."""
+
+    def __init__(self, centroids: Dict[str, DomainCentroids]):
+        """
+        Initialize router.
+
+        Args:
+            centroids: {domain: DomainCentroids}; empty domains are skipped
+        """
+        matrices = []
+        owners = []
+        self.domains: List[str] = []
+
+        for domain, domain_centroids in centroids.items():
+            vectors = domain_centroids.vectors()
+            if len(vectors) == 0:
+                continue
+            self.domains.append(domain)
+            matrices.append(vectors)
+            owners.extend([len(self.domains) - 1] * len(vectors))
+
+        self.matrix = np.vstack(matrices) if matrices else np.zeros((0, 0), dtype=np.float32)
+        self.owners = np.asarray(owners, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def scores(self, query_embedding: List[float]) -> Dict[str, float]:
+        """
+        Best cosine similarity of the query to each domain's centroids.
+
+        Args:
+            query_embedding: Query embedding
+
+        Returns:
+            {domain: similarity}, highest first
+        """
+        if not self.domains:
+            return {}
+
+        query = _normalize_rows(np.asarray(query_embedding, dtype=np.float32)[None, :])[0]
+        similarities = self.matrix @ query
+
+        best = np.full(len(self.domains), -np.inf, dtype=np.float32)
+        np.maximum.at(best, self.owners, similarities)
+
+        order = np.argsort(-best)
+        return {self.domains[i]: float(best[i]) for i in order}
+
+    def route(
+        self,
+        query_embedding: List[float],
+        threshold: float = ROUTER_THRESHOLD,
+        include_domain: Optional[str] = None
+    ) -> List[str]:
+        """
+        Domains worth querying for a query embedding.
+
+        Args:
+            query_embedding: Query embedding
+            threshold: Minimum similarity for a domain to be queried
+            include_domain: Always query this domain (e.g. the caller's own)
+
+        Returns:
+            Domain names, most similar first; never empty when any domain
+            has centroids (the best domain is kept even below threshold)
+        """
+        scores = self.scores(query_embedding)
+        routed = [domain for domain, score in scores.items() if score >= threshold]
+
+        if not routed and scores:
+            routed = [next(iter(scores))]
+        if include_domain is not None and include_domain not in routed:
+            routed.append(include_domain)
+
+        return routed
+
+
+def main():
+    """CLI entry point for building and inspecting domain centroids."""
+    import argparse
+    from knowledge_base.query_rag import get_query_engine, DOMAINS
+
+    parser = argparse.ArgumentParser(description="Domain router centroids")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build centroids for every domain collection")
+    build_parser.add_argument("--clusters", type=int, default=DEFAULT_CLUSTERS, help="Cluster centres per domain")
+
+    route_parser = subparsers.add_parser("route", help="Show domain scores for a query")
+    route_parser.add_argument("query", help="Query text")
+    route_parser.add_argument("--threshold", type=float, default=ROUTER_THRESHOLD, help="Routing threshold")
+
+    args = parser.parse_args()
+    engine = get_query_engine()
+
+    if args.command == "build":
+        for domain, collection_name in DOMAINS.items():
+            if collection_name is None:
+                continue
+            try:
+                collection = engine.get_collection(collection_name)
+            except Exception:
+                print(f"⚠ {domain}: collection not found")
+                continue
+            centroids = DomainCentroids.build_from_collection(collection, args.clusters)
+            centroids.save(engine.vector_db_dir)
+            print(f"✓ {domain}: {centroids.count} chunks, {len(centroids.vectors())} centroids")
+        return
+
+    router = engine.get_domain_router()
+    if router is None:
+        print("✗ No domain centroids. Run: python -m knowledge_base.domain_router build")
+        return
+
+    query_embedding = engine._embed_query(args.query)
+    for domain, score in router.scores(query_embedding).items():
+        marker = "→" if score >= args.threshold else " "
+        print(f"  {marker} {domain:20s} {score:.3f}")
+    print(f"\nRouted to: {', '.join(router.route(query_embedding, args.threshold))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Retrieval Evaluation Harness
+
+Runs the golden query set (data/golden_queries.json) through RAGQueryEngine
+and reports, per domain and overall:
+- recall@k: fraction of a query's relevant papers found in the top k results
+- MRR: mean reciprocal rank of the first relevant result
+- result volume: tokens of the packed context handed to the agent
+- latency: p50/p95/p99 of end-to-end query time, plus the engine's per-stage
+  breakdown
+
+Query embeddings come from a recorded file, so the benchmark runs offline and
+its quality numbers match production. Record them once with the real model
+(needs OPENAI_API_KEY), then replay:
+
+    python -m knowledge_base.evaluate_retrieval --record
+    python -m knowledge_base.evaluate_retrieval --output eval.json
+
+Every retrieval-side change (chunking, quantization, MMR, hybrid search)
+should be compared against a baseline run of this harness, e.g.:
+
+    python -m knowledge_base.evaluate_retrieval --index-mode full --output base.json
+    python -m knowledge_base.evaluate_retrieval --index-mode truncated --output trunc.json
+
+--embeddings hashing runs without any recording, but only measures the
+pipeline (latency, payload sizes), not quality.
+"""
+
+import json
+import time
+import unicodedata
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+from knowledge_base.context_packer import count_tokens, DEFAULT_TOKEN_BUDGET
+from knowledge_base.metadata_filters import normalize_doi
+from knowledge_base.offline_embeddings import RecordedEmbeddings, HashingEmbeddings
+
+
+# Configuration
+DATA_DIR = Path(__file__).parent.parent / "data"
+GOLDEN_QUERIES_FILE = DATA_DIR / "golden_queries.json"
+RECORDED_EMBEDDINGS_FILE = DATA_DIR / "golden_query_embeddings.json"
+
+
+def load_golden_queries(path: Path = GOLDEN_QUERIES_FILE, domain: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load the golden query set.
+
+    Args:
+        path: Golden query JSON file
+        domain: Only keep queries of this domain (None = all)
+
+    Returns:
+        List of {domain, query, relevant}
+    """
+    with open(path, encoding='utf-8') as f:
+        queries = json.load(f)["queries"]
+    if domain is not None:
+        queries = [q for q in queries if q["domain"] == domain]
+    return queries
+
+
+def _normalize_key(value: str) -> str:
+    """Comparable form of a filename or DOI."""
+    value = unicodedata.normalize("NFC", str(value).strip())
+    if value.lower().endswith(".pdf"):
+        return value.lower()
+    return normalize_doi(value)
+
+
+def _result_keys(metadata: Dict[str, Any]) -> set:
+    keys = set()
+    for field in ('filename', 'doi'):
+        if metadata.get(field):
+            keys.add(_normalize_key(metadata[field]))
+    return keys
+
+
+def score_results(results: List[Dict[str, Any]], relevant: List[str], k: int) -> Dict[str, float]:
+    """
+    Recall@k and reciprocal rank for one query.
+
+    Args:
+        results: Retrieval results, best first
+        relevant: Relevant filenames/DOIs
+        k: Cutoff
+
+    Returns:
+        {'recall', 'reciprocal_rank'}
+    """
+    targets = {_normalize_key(r) for r in relevant}
+    found = set()
+    reciprocal_rank = 0.0
+
+    for rank, result in enumerate(results[:k], 1):
+        matched = _result_keys(result['metadata']) & targets
+        if matched:
+            found |= matched
+            if reciprocal_rank == 0.0:
+                reciprocal_rank = 1.0 / rank
+
+    recall = len(found) / len(targets) if targets else 0.0
+    return {"recall": recall, "reciprocal_rank": reciprocal_rank}
+
+
+def _percentiles_ms(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000.0, [50, 95, 99])
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+
+
+def _summarize(rows: List[Dict[str, Any]], k: int) -> Dict[str, Any]:
+    return {
+        "num_queries": len(rows),
+        f"recall@{k}": round(float(np.mean([r["recall"] for r in rows])), 4) if rows else 0.0,
+        "mrr": round(float(np.mean([r["reciprocal_rank"] for r in rows])), 4) if rows else 0.0,
+        "mean_context_tokens": round(float(np.mean([r["context_tokens"] for r in rows])), 1) if rows else 0.0,
+        "mean_result_tokens": round(float(np.mean([r["result_tokens"] for r in rows])), 1) if rows else 0.0,
+        "latency_ms": _percentiles_ms([t for r in rows for t in r["latencies"]]),
+    }
+
+
+def evaluate(
+    engine,
+    queries: List[Dict[str, Any]],
+    top_k: int = 5,
+    token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+    diversify: bool = True,
+    expand_neighbors: int = 0,
+    repeats: int = 1
+) -> Dict[str, Any]:
+    """
+    Run the golden queries and compute quality, volume and latency metrics.
+
+    The result cache is cleared before every query, so latency reflects real
+    retrieval rather than cache hits.
+
+    Args:
+        engine: RAGQueryEngine
+        queries: Golden queries ({domain, query, relevant})
+        top_k: Results per query
+        token_budget: Token budget of the packed context
+        diversify: Apply MMR diversification
+        expand_neighbors: Neighbouring chunks added per hit
+        repeats: Timed runs per query (all runs feed the latency percentiles)
+
+    Returns:
+        Report with 'overall', 'by_domain', 'stages' and per-query 'queries'
+    """
+    rows = []
+
+    for item in queries:
+        latencies = []
+        results = []
+        for _ in range(max(repeats, 1)):
+            engine.result_cache.clear()
+            start = time.perf_counter()
+            results = engine.query_domain(
+                item["query"], item["domain"], top_k,
+                diversify=diversify, expand_neighbors=expand_neighbors,
+            )
+            latencies.append(time.perf_counter() - start)
+
+        scores = score_results(results, item["relevant"], top_k)
+        context = engine.format_results_for_llm(results, token_budget=token_budget) if results else ""
+
+        rows.append({
+            "domain": item["domain"],
+            "query": item["query"],
+            "latencies": latencies,
+            **scores,
+            "context_tokens": count_tokens(context),
+            "result_tokens": sum(count_tokens(r['text']) for r in results),
+            "retrieved": [r['metadata'].get('filename') for r in results],
+        })
+
+    by_domain = {}
+    for domain in sorted({r["domain"] for r in rows}):
+        by_domain[domain] = _summarize([r for r in rows if r["domain"] == domain], top_k)
+
+    return {
+        "settings": {
+            "top_k": top_k,
+            "token_budget": token_budget,
+            "diversify": diversify,
+            "expand_neighbors": expand_neighbors,
+            "index_mode": engine.index_mode,
+            "repeats": repeats,
+        },
+        "overall": _summarize(rows, top_k),
+        "by_domain": by_domain,
+        "stages": engine.get_latency_stats(),
+        "queries": [
+            {
+                "domain": row["domain"],
+                "query": row["query"],
+                "recall": row["recall"],
+                "reciprocal_rank": row["reciprocal_rank"],
+                "retrieved": row["retrieved"],
+            }
+            for row in rows
+        ],
+    }
+
+
+def _print_summary(name: str, summary: Dict[str, Any], k: int):
+    latency = summary["latency_ms"]
+    print(f"\n{name}:")
+    print(f"  Queries: {summary['num_queries']}")
+    print(f"  Recall@{k}: {summary[f'recall@{k}']:.3f}  MRR: {summary['mrr']:.3f}")
+    print(f"  Context tokens (mean): {summary['mean_context_tokens']:.0f}  "
+          f"Result tokens (mean): {summary['mean_result_tokens']:.0f}")
+    print(f"  Latency p50/p95/p99 (ms): {latency['p50']:.1f}/{latency['p95']:.1f}/{latency['p99']:.1f}")
+
+
+def main():
+    """CLI entry point for the retrieval benchmark."""
+    import argparse
+    from knowledge_base.query_rag import RAGQueryEngine
+
+    parser = argparse.ArgumentParser(description="Evaluate retrieval quality and latency on the golden query set")
+    parser.add_argument("--golden", type=Path, default=GOLDEN_QUERIES_FILE, help="Golden query JSON file")
+    parser.add_argument("--domain", default=None, help="Only evaluate one domain")
+    parser.add_argument("--embeddings", choices=["recorded", "hashing"], default="recorded",
+                        help="Query embedding backend (recorded = replay real-model embeddings)")
+    parser.add_argument("--recording", type=Path, default=RECORDED_EMBEDDINGS_FILE,
+                        help="Recorded query embeddings file")
+    parser.add_argument("--record", action="store_true",
+                        help="Embed missing queries with the real model and save them (needs OPENAI_API_KEY)")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_TOKEN_BUDGET, help="Packed context budget")
+    parser.add_argument("--no-diversify", dest="diversify", action="store_false", help="Disable MMR")
+    parser.add_argument("--expand-neighbors", type=int, default=0, help="Neighbouring chunks added per hit")
+    parser.add_argument("--index-mode", choices=["full", "truncated"], default=None, help="Retrieval index mode")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per query")
+    parser.add_argument("--output", type=Path, default=None, help="Write report JSON to this file")
+    args = parser.parse_args()
+
+    queries = load_golden_queries(args.golden, args.domain)
+
+    if args.embeddings == "hashing":
+        embeddings = HashingEmbeddings()
+    else:
+        backend = None
+        if args.record:
+            from langchain_openai import OpenAIEmbeddings
+            from knowledge_base.query_rag import EMBEDDING_MODEL
+            backend = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+        embeddings = RecordedEmbeddings(args.recording, backend=backend)
+
+    engine = RAGQueryEngine(
+        index_mode=args.index_mode,
+        semantic_cache_threshold=None,
+        embeddings=embeddings,
+    )
+
+    if args.record:
+        for item in queries:
+            embeddings.embed_query(item["query"])
+        saved = embeddings.save()
+        print(f"✓ Recorded {len(embeddings)} query embeddings" + (f" to {saved}" if saved else ""))
+
+    report = evaluate(
+        engine,
+        queries,
+        top_k=args.top_k,
+        token_budget=args.token_budget,
+        diversify=args.diversify,
+        expand_neighbors=args.expand_neighbors,
+        repeats=args.repeats,
+    )
+
+    print(f"\n{'='*80}")
+    print(f"RETRIEVAL EVALUATION (index={engine.index_mode}, top_k={args.top_k}, "
+          f"diversify={args.diversify}, embeddings={args.embeddings})")
+    print(f"{'='*80}")
+    if args.embeddings == "hashing":
+        print("ℹ️  Hashing embeddings: quality metrics are not meaningful, latency/volume only")
+
+    for domain, summary in report["by_domain"].items():
+        _print_summary(domain, summary, args.top_k)
+    _print_summary("OVERALL", report["overall"], args.top_k)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
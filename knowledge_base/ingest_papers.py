@@ -20,8 +20,6 @@ import os
 import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-import chromadb
-from chromadb.config import Settings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 import hashlib
@@ -32,6 +30,13 @@ import re
 import time
 import json
 
+from knowledge_base.chunk_adjacency import ChunkAdjacencyIndex
+from knowledge_base.domain_router import DomainCentroids
+from knowledge_base.collection_aliases import CollectionAliasRegistry, versioned_name, KEEP_VERSIONS
+from knowledge_base.chroma_clients import get_chroma_client
+from knowledge_base.paper_registry import PaperRegistry, PAPERS_DB_FILE
+from knowledge_base.metadata_filters import normalize_metadata, normalize_collection_metadata
+
 # Import multimodal modules
 try:
     from ion_transport.knowledge_base.multimodal_extractor import MultimodalExtractor
@@ -311,11 +316,14 @@ class PDFIngester:
         self.vector_db_dir = vector_db_dir
         self.enable_multimodal = enable_multimodal and MULTIMODAL_AVAILABLE
 
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=str(vector_db_dir),
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # Shared ChromaDB client (one per store for the whole process)
+        self.client = get_chroma_client(vector_db_dir)
+
+        # {domain}_papers is an alias of the live versioned collection
+        self.aliases = CollectionAliasRegistry(vector_db_dir)
+
+        # Citation metadata is stored once per paper; chunks reference it by paper_id
+        self.papers = PaperRegistry(Path(vector_db_dir) / PAPERS_DB_FILE)
 
         # Initialize OpenAI embeddings
         self.embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
@@ -343,9 +351,17 @@ class PDFIngester:
             if MULTIMODAL_AVAILABLE:
                 print("ℹ️  Multimodal RAG disabled: Text-only mode")
 
-    def get_or_create_collection(self, domain: str):
-        """Get or create ChromaDB collection for a domain."""
-        collection_name = f"{domain}_papers"
+    def get_or_create_collection(self, domain: str, collection_name: Optional[str] = None):
+        """
+        Get or create ChromaDB collection for a domain.
+
+        Args:
+            domain: Domain name
+            collection_name: Concrete collection (None = the live collection
+                behind the domain alias)
+        """
+        if collection_name is None:
+            collection_name = self.aliases.resolve(f"{domain}_papers")
         try:
             collection = self.client.get_collection(name=collection_name)
             print(f"✓ Using existing collection: {collection_name}")
@@ -417,13 +433,20 @@ class PDFIngester:
 
         return metadata
 
-    def process_pdf(self, pdf_path: Path, domain: str) -> List[Dict[str, Any]]:
+    def process_pdf(
+        self,
+        pdf_path: Path,
+        domain: str,
+        base_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Process a single PDF file and extract all content.
 
         Args:
             pdf_path: Path to PDF file
             domain: Domain category
+            base_metadata: Per-chunk paper reference from PaperRegistry.chunk_metadata
+                (None = extract and register the paper here)
 
         Returns:
             List of document chunks with metadata
@@ -445,7 +468,8 @@ class PDFIngester:
             doc.close()
 
             # Extract metadata
-            base_metadata = self.extract_pdf_metadata(pdf_path)
+            if base_metadata is None:
+                base_metadata = self.papers.chunk_metadata(self.extract_pdf_metadata(pdf_path))
 
             # Split into chunks
             chunks = self.text_splitter.split_text(full_text)
@@ -479,7 +503,7 @@ class PDFIngester:
         Args:
             pdf_path: Path to PDF file
             domain: Domain category
-            base_metadata: Base metadata from PDF
+            base_metadata: Per-chunk paper reference (paper_id, filename, domain, year)
 
         Returns:
             List of figure chunks with embeddings
@@ -578,7 +602,7 @@ class PDFIngester:
         Args:
             pdf_path: Path to PDF file
             domain: Domain category
-            base_metadata: Base metadata from PDF
+            base_metadata: Per-chunk paper reference (paper_id, filename, domain, year)
 
         Returns:
             List of equation chunks with embeddings
@@ -666,12 +690,14 @@ class PDFIngester:
 
         return hashlib.md5(unique_string.encode()).hexdigest()
 
-    def ingest_domain(self, domain: str) -> int:
+    def ingest_domain(self, domain: str, collection_name: Optional[str] = None) -> int:
         """
         Ingest all PDFs from a domain folder.
 
         Args:
             domain: Domain name (electrochemistry, membrane_science, etc.)
+            collection_name: Collection to ingest into (None = the live collection;
+                a new version name rebuilds the domain from scratch)
 
         Returns:
             Number of documents ingested
@@ -690,11 +716,23 @@ class PDFIngester:
             return 0
 
         # Get or create collection
-        collection = self.get_or_create_collection(domain)
+        collection = self.get_or_create_collection(domain, collection_name)
 
         # Get already-processed PDFs
         already_processed = self.get_already_processed_pdfs(collection)
 
+        # Load (or backfill) the (filename, chunk_id) → id adjacency index
+        adjacency = ChunkAdjacencyIndex.load(self.vector_db_dir, collection.name)
+        if adjacency is None:
+            adjacency = ChunkAdjacencyIndex.build_from_collection(collection)
+            adjacency.save(self.vector_db_dir)
+
+        # Load (or build) the domain centroids used to route cross-domain queries
+        centroids = DomainCentroids.load(self.vector_db_dir, collection.name)
+        if centroids is None:
+            centroids = DomainCentroids.build_from_collection(collection)
+            centroids.save(self.vector_db_dir)
+
         # Filter to only new PDFs
         pdf_files = [pdf for pdf in all_pdf_files if pdf.name not in already_processed]
 
@@ -715,15 +753,15 @@ class PDFIngester:
 
         # Process each PDF
         for pdf_path in tqdm(pdf_files, desc=f"Ingesting {domain}"):
+            # Register the paper once; its chunks only reference it
+            base_metadata = self.papers.chunk_metadata(self.extract_pdf_metadata(pdf_path))
+
             # Process text chunks
-            doc_chunks = self.process_pdf(pdf_path, domain)
+            doc_chunks = self.process_pdf(pdf_path, domain, base_metadata)
 
             if not doc_chunks:
                 continue
 
-            # Get base metadata for figures
-            base_metadata = self.extract_pdf_metadata(pdf_path) if doc_chunks else {}
-
             # Process figures if multimodal is enabled
             figure_chunks = []
             if self.enable_multimodal:
@@ -743,7 +781,7 @@ class PDFIngester:
             # Prepare data for ChromaDB (text chunks)
             if doc_chunks:
                 texts = [chunk["text"] for chunk in doc_chunks]
-                metadatas = [chunk["metadata"] for chunk in doc_chunks]
+                metadatas = [normalize_metadata(chunk["metadata"]) for chunk in doc_chunks]
                 ids = [self.generate_doc_id(chunk["text"], chunk["metadata"])
                        for chunk in doc_chunks]
 
@@ -758,6 +796,8 @@ class PDFIngester:
                         metadatas=metadatas,
                         ids=ids,
                     )
+                    adjacency.add_chunks(ids, metadatas)
+                    centroids.add_embeddings(embeddings)
 
                     total_chunks += len(doc_chunks)
 
@@ -767,7 +807,7 @@ class PDFIngester:
             # Add figure chunks to collection (they already have embeddings)
             if figure_chunks:
                 fig_texts = [chunk["text"] for chunk in figure_chunks]
-                fig_metadatas = [chunk["metadata"] for chunk in figure_chunks]
+                fig_metadatas = [normalize_metadata(chunk["metadata"]) for chunk in figure_chunks]
                 fig_embeddings = [chunk["embedding"] for chunk in figure_chunks]
                 fig_ids = [self.generate_doc_id(chunk["text"], chunk["metadata"])
                            for chunk in figure_chunks]
@@ -780,6 +820,7 @@ class PDFIngester:
                         metadatas=fig_metadatas,
                         ids=fig_ids,
                     )
+                    centroids.add_embeddings(fig_embeddings)
 
                     total_figures += len(figure_chunks)
 
@@ -789,7 +830,7 @@ class PDFIngester:
             # Add equation chunks to collection (they already have embeddings)
             if equation_chunks:
                 eq_texts = [chunk["text"] for chunk in equation_chunks]
-                eq_metadatas = [chunk["metadata"] for chunk in equation_chunks]
+                eq_metadatas = [normalize_metadata(chunk["metadata"]) for chunk in equation_chunks]
                 eq_embeddings = [chunk["embedding"] for chunk in equation_chunks]
                 eq_ids = [self.generate_doc_id(chunk["text"], chunk["metadata"])
                           for chunk in equation_chunks]
@@ -802,12 +843,16 @@ class PDFIngester:
                         metadatas=eq_metadatas,
                         ids=eq_ids,
                     )
+                    centroids.add_embeddings(eq_embeddings)
 
                     total_equations += len(equation_chunks)
 
                 except Exception as e:
                     print(f"    ✗ Error adding equations to database: {str(e)}")
 
+        adjacency.save(self.vector_db_dir)
+        centroids.save(self.vector_db_dir)
+
         summary = f"\n✓ Ingested {total_chunks} text chunks from {len(pdf_files)} new papers"
         if total_figures > 0:
             summary += f"\n✓ Ingested {total_figures} figure chunks with multimodal analysis"
@@ -841,6 +886,120 @@ class PDFIngester:
         print(f"Total chunks across all domains: {total_chunks_all}")
         print(f"\nYou can now query the knowledge base using query_rag.py")
 
+    def validate_version(self, domain: str, collection) -> List[str]:
+        """
+        Check a freshly built collection before it goes live.
+
+        Args:
+            domain: Domain name
+            collection: New collection version
+
+        Returns:
+            List of problems (empty = safe to swap)
+        """
+        problems = []
+        count = collection.count()
+        if count == 0:
+            return ["collection is empty"]
+
+        # Papers served by the live version must not disappear
+        try:
+            live = self.client.get_collection(name=self.aliases.resolve(f"{domain}_papers"))
+        except Exception:
+            live = None
+        if live is not None and live.name != collection.name:
+            missing = self.get_already_processed_pdfs(live) - self.get_already_processed_pdfs(collection)
+            if missing:
+                problems.append(f"{len(missing)} papers of the live version are missing: {sorted(missing)[:5]}")
+
+        # The index must answer queries: a stored chunk should retrieve itself
+        sample = collection.get(include=['embeddings'], limit=1)
+        embedding = sample['embeddings'][0]
+        if live is not None and live.count() > 0:
+            live_sample = live.get(include=['embeddings'], limit=1)
+            if len(live_sample['embeddings'][0]) != len(embedding):
+                problems.append(
+                    f"embedding dimension changed ({len(live_sample['embeddings'][0])} → {len(embedding)})"
+                )
+        hit = collection.query(query_embeddings=[list(embedding)], n_results=1, include=[])
+        if not hit['ids'][0] or hit['ids'][0][0] != sample['ids'][0]:
+            problems.append("smoke query did not return the probed chunk")
+
+        return problems
+
+    def build_new_versions(self, domains: Optional[List[str]] = None, swap: bool = True):
+        """
+        Rebuild domains into new collection versions, leaving the live ones untouched.
+
+        Each domain is ingested from scratch into {domain}_papers__v<n>,
+        validated, and (if swap) made live by an atomic alias swap. Running
+        symposia keep querying the previous version until the swap.
+
+        Args:
+            domains: Domains to rebuild (None = all)
+            swap: Swap the alias after validation (False = build only)
+        """
+        print("\n" + "="*80)
+        print("🔁 BUILDING NEW KNOWLEDGE BASE VERSIONS")
+        print("="*80)
+
+        for domain in domains or DOMAINS.keys():
+            alias = f"{domain}_papers"
+            name = versioned_name(alias, self.aliases.next_version(alias, self.client))
+
+            self.ingest_domain(domain, name)
+            try:
+                collection = self.client.get_collection(name=name)
+            except Exception:
+                print(f"\n{domain.upper()}: ✗ Nothing was built")
+                continue
+
+            problems = self.validate_version(domain, collection)
+            if problems:
+                print(f"\n{domain.upper()}: ✗ {name} failed validation, live version unchanged:")
+                for problem in problems:
+                    print(f"  - {problem}")
+            elif swap:
+                previous = self.aliases.swap(alias, name)
+                print(f"\n{domain.upper()}: ✓ {alias} → {name} (was {previous})")
+            else:
+                print(f"\n{domain.upper()}: ✓ {name} built and validated (not live)")
+
+    def rollback_domain(self, domain: str):
+        """Point a domain back at the collection version it served before the last swap."""
+        alias = f"{domain}_papers"
+        try:
+            previous = self.aliases.rollback(alias)
+        except ValueError as e:
+            print(f"✗ {e}")
+            return
+        print(f"✓ {alias} → {previous}")
+
+    def collect_garbage(self, keep: int = KEEP_VERSIONS):
+        """Delete collection versions that are neither live nor among the newest `keep`."""
+        for domain in DOMAINS.keys():
+            deleted = self.aliases.garbage_collect(f"{domain}_papers", self.client, keep)
+            for name in deleted:
+                print(f"🗑  Deleted {name}")
+        print(f"✓ Kept the live version and the newest {keep} versions per domain")
+
+    def normalize_all_metadata(self):
+        """Migrate existing collections to normalized metadata (int years, content_type)."""
+        print("\n" + "="*80)
+        print("🔧 NORMALIZING CHUNK METADATA")
+        print("="*80)
+
+        for domain in DOMAINS.keys():
+            collection_name = self.aliases.resolve(f"{domain}_papers")
+            try:
+                collection = self.client.get_collection(name=collection_name)
+            except Exception:
+                print(f"\n{domain.upper()}: Collection not created yet")
+                continue
+
+            updated = normalize_collection_metadata(collection)
+            print(f"\n{domain.upper()}: ✓ Updated {updated} of {collection.count()} chunks")
+
     def get_collection_stats(self):
         """Print statistics about all collections."""
         print("\n" + "="*80)
@@ -848,7 +1007,7 @@ class PDFIngester:
         print("="*80)
 
         for domain in DOMAINS.keys():
-            collection_name = f"{domain}_papers"
+            collection_name = self.aliases.resolve(f"{domain}_papers")
             try:
                 collection = self.client.get_collection(name=collection_name)
                 count = collection.count()
@@ -922,6 +1081,45 @@ def main():
         action="store_false",
         help="Disable multimodal RAG (text-only mode)"
     )
+    parser.add_argument(
+        "--normalize-metadata",
+        action="store_true",
+        help="Migrate existing chunks to normalized metadata (int year, content_type) for filtering"
+    )
+    parser.add_argument(
+        "--new-version",
+        action="store_true",
+        help="Rebuild into new collection versions and swap them live once validated"
+    )
+    parser.add_argument(
+        "--no-swap",
+        dest="swap",
+        action="store_false",
+        help="With --new-version: build and validate only, keep serving the current version"
+    )
+    parser.add_argument(
+        "--domain",
+        action="append",
+        choices=list(DOMAINS.keys()),
+        help="With --new-version: only rebuild this domain (repeatable)"
+    )
+    parser.add_argument(
+        "--rollback",
+        metavar="DOMAIN",
+        choices=list(DOMAINS.keys()),
+        help="Serve the previous collection version of a domain again"
+    )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="Delete old collection versions"
+    )
+    parser.add_argument(
+        "--keep-versions",
+        type=int,
+        default=KEEP_VERSIONS,
+        help="With --gc: newest versions to keep per domain (the live one is always kept)"
+    )
     parser.add_argument(
         "--init-memory",
         action="store_true",
@@ -945,9 +1143,18 @@ def main():
     # Initialize ingester with multimodal option
     ingester = PDFIngester(base_dir, vector_db_dir, enable_multimodal=args.multimodal)
 
-    # Check if user wants to see stats or ingest
+    # Check if user wants to see stats, migrate metadata, or ingest
     if args.stats:
         ingester.get_collection_stats()
+    elif args.normalize_metadata:
+        ingester.normalize_all_metadata()
+    elif args.rollback:
+        ingester.rollback_domain(args.rollback)
+    elif args.gc:
+        ingester.collect_garbage(args.keep_versions)
+    elif args.new_version:
+        ingester.build_new_versions(args.domain, swap=args.swap)
+        ingester.get_collection_stats()
     else:
         # Run ingestion
         ingester.ingest_all()
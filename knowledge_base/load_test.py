@@ -0,0 +1,413 @@
+"""
+Concurrent Load Test for the RAG Path
+
+Drives run_rag_query / get_context_for_agent from N threads (one shared
+engine, as inside one symposium process) or N processes (one engine each,
+as with several symposia on one box, all on the same SQLite-backed Chroma
+store) and reports:
+- throughput (queries/s)
+- latency p50/p95/p99/max
+- error rate (with the most common errors)
+- lock contention on the engine's internal locks (threads mode)
+
+A sweep over concurrency levels locates the knee where adding callers stops
+adding throughput or tail latency blows up.
+
+Query embeddings are stubbed (feature hashing, with optional artificial
+latency to stand in for the embeddings API), so runs need no network and
+measure the local retrieval path. Results are not meaningful for quality.
+
+Usage:
+    python -m knowledge_base.load_test --workers 8 --requests 400
+    python -m knowledge_base.load_test --sweep 1,2,4,8,16,32 --mode process
+    python -m knowledge_base.load_test --sweep 1,4,16 --unique-fraction 1.0 --no-result-cache
+"""
+
+import contextlib
+import io
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+from knowledge_base.evaluate_retrieval import load_golden_queries, GOLDEN_QUERIES_FILE
+from knowledge_base.offline_embeddings import HashingEmbeddings
+
+
+# Configuration
+DEFAULT_SWEEP = (1, 2, 4, 8, 16)
+KNEE_MIN_SPEEDUP = 1.10  # Next level must add ≥10% throughput...
+KNEE_MAX_P99_GROWTH = 2.0  # ...without more than doubling p99 latency
+ERROR_PREFIX = "Unable to retrieve information from knowledge base"
+
+
+class DelayedEmbeddings:
+    """Stub embedder: hashing vectors plus a fixed delay standing in for the API call."""
+
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+        self._backend = HashingEmbeddings()
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.delay_seconds > 0:
+            time.sleep(self.delay_seconds)
+        return self._backend.embed_query(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+
+class ContentionLock:
+    """
+    Lock/RLock proxy that counts contended acquisitions and time spent waiting.
+
+    An acquisition is contended when a non-blocking attempt fails.
+    """
+
+    def __init__(self, lock, name: str):
+        self._lock = lock
+        self.name = name
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(blocking=False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+
+        start = time.perf_counter()
+        acquired = self._lock.acquire(timeout=timeout)
+        waited = time.perf_counter() - start
+        if acquired:
+            # Counters are only updated while holding the lock
+            self.acquisitions += 1
+            self.contended += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "contended_rate": self.contended / self.acquisitions if self.acquisitions else 0.0,
+            "total_wait_ms": round(self.wait_seconds * 1000.0, 2),
+            "max_wait_ms": round(self.max_wait_seconds * 1000.0, 2),
+        }
+
+
+def instrument_engine_locks(engine) -> List[ContentionLock]:
+    """Replace the engine's internal locks with contention-counting proxies."""
+    locks = [
+        ContentionLock(engine._index_lock, "index_lock"),
+        ContentionLock(engine.embedding_cache._lock, "embedding_cache"),
+        ContentionLock(engine.result_cache._lock, "result_cache"),
+        ContentionLock(engine.latency._lock, "latency_recorder"),
+    ]
+    engine._index_lock = locks[0]
+    engine.embedding_cache._lock = locks[1]
+    engine.result_cache._lock = locks[2]
+    engine.latency._lock = locks[3]
+    return locks
+
+
+def build_engine(embed_delay: float = 0.0, result_cache: bool = True, index_mode: Optional[str] = None):
+    """
+    Create an engine with the stub embedder and install it as the shared engine.
+
+    Args:
+        embed_delay: Seconds of simulated embeddings API latency per query
+        result_cache: Keep the result cache (False = every query hits Chroma)
+        index_mode: Retrieval index mode (None = environment default)
+
+    Returns:
+        RAGQueryEngine
+    """
+    from knowledge_base.query_rag import RAGQueryEngine, set_query_engine
+    from knowledge_base.query_cache import QueryResultCache
+
+    engine = RAGQueryEngine(index_mode=index_mode, embeddings=DelayedEmbeddings(embed_delay))
+    if not result_cache:
+        engine.result_cache = QueryResultCache(max_entries=0, similarity_threshold=None)
+    set_query_engine(engine)
+    return engine
+
+
+def make_workload(
+    queries: List[Dict[str, Any]],
+    num_requests: int,
+    unique_fraction: float,
+    seed: int = 0
+) -> List[Tuple[str, str]]:
+    """
+    Build a request list by sampling the query mix.
+
+    Args:
+        queries: Query mix ({domain, query}); sampled uniformly
+        num_requests: Requests to generate
+        unique_fraction: Share of requests made unique (cache misses)
+        seed: Sampling seed
+
+    Returns:
+        List of (query, domain)
+    """
+    rng = random.Random(seed)
+    workload = []
+    for i in range(num_requests):
+        item = rng.choice(queries)
+        query = item["query"]
+        if rng.random() < unique_fraction:
+            query = f"{query} (variant {i})"
+        workload.append((query, item["domain"]))
+    return workload
+
+
+def _call(target: str, query: str, domain: str, top_k: int) -> Optional[str]:
+    """Run one request; returns an error string or None."""
+    try:
+        if target == "tool":
+            from tools.rag_tool import run_rag_query
+            output = run_rag_query(query, domain, top_k)
+            if output.startswith(ERROR_PREFIX):
+                return output.splitlines()[0][:200]
+        else:
+            from knowledge_base.query_rag import get_context_for_agent
+            get_context_for_agent(query, domain, top_k)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"[:200]
+
+
+def _run_requests(workload: List[Tuple[str, str]], workers: int, target: str, top_k: int) -> List[Tuple[float, Optional[str]]]:
+    """Execute a workload on a thread pool; returns (latency, error) per request."""
+    def one(request):
+        start = time.perf_counter()
+        error = _call(target, request[0], request[1], top_k)
+        return time.perf_counter() - start, error
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag-load") as pool:
+        return list(pool.map(one, workload))
+
+
+def _process_worker(args) -> Dict[str, Any]:
+    """Entry point of one load-test process (builds its own engine)."""
+    workload, target, top_k, embed_delay, result_cache, index_mode = args
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_engine(embed_delay, result_cache, index_mode)
+        _run_requests(workload[:1], 1, target, top_k)  # Warm up lazy loads
+
+        started = time.time()
+        samples = _run_requests(workload, 1, target, top_k)
+        finished = time.time()
+    return {"samples": samples, "started": started, "finished": finished}
+
+
+def _summarize(samples: List[Tuple[float, Optional[str]]], elapsed: float, workers: int) -> Dict[str, Any]:
+    latencies = np.asarray([s[0] for s in samples]) * 1000.0
+    errors = Counter(s[1] for s in samples if s[1] is not None)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        "workers": workers,
+        "requests": len(samples),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_qps": round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(float(p50), 2),
+            "p95": round(float(p95), 2),
+            "p99": round(float(p99), 2),
+            "max": round(float(latencies.max()), 2) if len(latencies) else 0.0,
+        },
+        "errors": sum(errors.values()),
+        "error_rate": sum(errors.values()) / len(samples) if samples else 0.0,
+        "top_errors": errors.most_common(3),
+    }
+
+
+def run_level(
+    workers: int,
+    queries: List[Dict[str, Any]],
+    num_requests: int,
+    mode: str = "thread",
+    target: str = "context",
+    top_k: int = 5,
+    unique_fraction: float = 0.5,
+    embed_delay: float = 0.0,
+    result_cache: bool = True,
+    index_mode: Optional[str] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Run one load level.
+
+    Args:
+        workers: Concurrent callers (threads or processes)
+        queries: Query mix
+        num_requests: Total requests across all callers
+        mode: "thread" (shared engine) or "process" (engine per process)
+        target: "tool" (run_rag_query) or "context" (get_context_for_agent)
+        top_k: Results per query
+        unique_fraction: Share of requests that miss the caches
+        embed_delay: Simulated embeddings API latency (seconds)
+        result_cache: Keep the result cache enabled
+        index_mode: Retrieval index mode
+        seed: Workload seed
+
+    Returns:
+        Summary (throughput, latency percentiles, errors, lock contention)
+    """
+    workload = make_workload(queries, num_requests, unique_fraction, seed)
+
+    if mode == "process":
+        import multiprocessing
+
+        shards = [workload[i::workers] for i in range(workers)]
+        ctx = multiprocessing.get_context("spawn")  # Never fork an open Chroma client
+        with ctx.Pool(workers) as pool:
+            outputs = pool.map(
+                _process_worker,
+                [(shard, target, top_k, embed_delay, result_cache, index_mode) for shard in shards],
+            )
+
+        # Engines load inside each process; time only the request phases
+        elapsed = max(o["finished"] for o in outputs) - min(o["started"] for o in outputs)
+        samples = [sample for output in outputs for sample in output["samples"]]
+        return _summarize(samples, elapsed, workers)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = build_engine(embed_delay, result_cache, index_mode)
+        locks = instrument_engine_locks(engine)
+
+        # Warm up lazy index loads so they don't count against the first level
+        _run_requests(workload[:1], 1, target, top_k)
+
+        start = time.perf_counter()
+        samples = _run_requests(workload, workers, target, top_k)
+        elapsed = time.perf_counter() - start
+
+    summary = _summarize(samples, elapsed, workers)
+    summary["locks"] = {lock.name: lock.get_stats() for lock in locks}
+    summary["result_cache_hit_rate"] = engine.get_cache_stats()["results"]["hit_rate"]
+    summary["stages"] = engine.get_latency_stats()
+    return summary
+
+
+def find_knee(levels: List[Dict[str, Any]]) -> Optional[int]:
+    """
+    Concurrency level after which scaling degrades.
+
+    The knee is the last level before one that adds less than
+    KNEE_MIN_SPEEDUP throughput or grows p99 by more than KNEE_MAX_P99_GROWTH.
+
+    Returns:
+        Worker count at the knee, or None if scaling never degraded
+    """
+    for previous, current in zip(levels, levels[1:]):
+        speedup = current["throughput_qps"] / previous["throughput_qps"] if previous["throughput_qps"] else 0.0
+        p99_growth = (
+            current["latency_ms"]["p99"] / previous["latency_ms"]["p99"]
+            if previous["latency_ms"]["p99"] else 1.0
+        )
+        if speedup < KNEE_MIN_SPEEDUP or p99_growth > KNEE_MAX_P99_GROWTH or current["error_rate"] > 0:
+            return previous["workers"]
+    return None
+
+
+def _print_level(level: Dict[str, Any]):
+    latency = level["latency_ms"]
+    print(f"  workers={level['workers']:>3}  {level['throughput_qps']:>8.1f} q/s  "
+          f"p50/p95/p99/max={latency['p50']:.1f}/{latency['p95']:.1f}/{latency['p99']:.1f}/{latency['max']:.1f} ms  "
+          f"errors={level['error_rate']:.1%}")
+    for name, stats in level.get("locks", {}).items():
+        if stats["contended"]:
+            print(f"      lock {name}: {stats['contended_rate']:.1%} contended, "
+                  f"wait total={stats['total_wait_ms']:.1f} ms max={stats['max_wait_ms']:.1f} ms")
+    for error, count in level["top_errors"]:
+        print(f"      ✗ {count}× {error}")
+
+
+def main():
+    """CLI entry point for the load test."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Concurrent load test for RAG retrieval")
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread",
+                        help="Concurrent threads on one engine, or processes with an engine each")
+    parser.add_argument("--target", choices=["context", "tool"], default="context",
+                        help="Drive get_context_for_agent or run_rag_query")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrency (single level)")
+    parser.add_argument("--sweep", default=None,
+                        help=f"Comma-separated concurrency levels, e.g. {','.join(map(str, DEFAULT_SWEEP))}")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per level")
+    parser.add_argument("--queries", type=Path, default=GOLDEN_QUERIES_FILE, help="Query mix (golden query JSON)")
+    parser.add_argument("--domain", default=None, help="Only use queries of this domain")
+    parser.add_argument("--unique-fraction", type=float, default=0.5, help="Share of requests that miss the caches")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="Simulated embeddings API latency")
+    parser.add_argument("--no-result-cache", dest="result_cache", action="store_false",
+                        help="Disable the result cache so every request reaches Chroma")
+    parser.add_argument("--index-mode", choices=["full", "truncated"], default=None, help="Retrieval index mode")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--output", type=Path, default=None, help="Write results JSON to this file")
+    args = parser.parse_args()
+
+    queries = load_golden_queries(args.queries, args.domain)
+    levels_to_run = [int(w) for w in args.sweep.split(",")] if args.sweep else [args.workers]
+
+    print(f"\n{'='*80}")
+    print(f"RAG LOAD TEST (mode={args.mode}, target={args.target}, requests/level={args.requests}, "
+          f"unique={args.unique_fraction:.0%}, embed latency={args.embed_latency_ms:.0f} ms)")
+    print(f"{'='*80}")
+
+    levels = []
+    for workers in levels_to_run:
+        level = run_level(
+            workers,
+            queries,
+            args.requests,
+            mode=args.mode,
+            target=args.target,
+            top_k=args.top_k,
+            unique_fraction=args.unique_fraction,
+            embed_delay=args.embed_latency_ms / 1000.0,
+            result_cache=args.result_cache,
+            index_mode=args.index_mode,
+        )
+        levels.append(level)
+        _print_level(level)
+
+    knee = find_knee(levels) if len(levels) > 1 else None
+    if len(levels) > 1:
+        if knee is None:
+            print(f"\n✓ Throughput kept scaling up to {levels[-1]['workers']} workers")
+        else:
+            print(f"\n⚠ Scaling degrades beyond {knee} workers")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"settings": vars(args), "levels": levels, "knee_workers": knee}, f, indent=2, default=str)
+        print(f"\n✓ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Metadata Normalization and Filters
+
+Chunk metadata is written by several ingest paths (text, figures, equations)
+and originally stored `year` as a string and left `content_type` unset on
+text chunks. ChromaDB range operators ($gte/$lte) only compare numbers, so
+metadata is normalized at ingest (and can be migrated in place) to:
+- content_type: always set ("text", "figure" or "equation")
+- year: int when known (unknown years keep their placeholder string and are
+  excluded by range filters)
+- no None values (ChromaDB metadata values must be str/int/float/bool)
+
+build_metadata_filter() turns the knowledge base tool's optional arguments
+into a ChromaDB `where` clause.
+
+Usage:
+    from knowledge_base.metadata_filters import build_metadata_filter
+
+    where = build_metadata_filter(content_type="equation", year_min=2020)
+    # {'$and': [{'content_type': {'$eq': 'equation'}}, {'year': {'$gte': 2020}}]}
+"""
+
+import re
+from typing import List, Dict, Any, Optional
+
+
+CONTENT_TYPES = ("text", "figure", "equation")
+MIGRATION_BATCH_SIZE = 500  # Metadata rows read/updated per batch
+
+_DOI_PREFIX = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def parse_year(value: Any) -> Optional[int]:
+    """Parse a publication year ("2021", 2021, "2021-05") into an int, or None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    match = re.match(r"\s*(\d{4})", str(value)) if value is not None else None
+    return int(match.group(1)) if match else None
+
+
+def normalize_doi(doi: str) -> str:
+    """Strip URL/"doi:" prefixes so DOIs compare equal however they were written."""
+    return _DOI_PREFIX.sub("", doi.strip()).lower()
+
+
+def normalize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize chunk metadata for filtering.
+
+    Args:
+        metadata: Chunk metadata as produced by the ingest paths
+
+    Returns:
+        New metadata dict (the input is not modified)
+    """
+    normalized = {key: value for key, value in metadata.items() if value is not None}
+
+    normalized.setdefault('content_type', 'text')
+
+    year = parse_year(normalized.get('year'))
+    if year is not None:
+        normalized['year'] = year
+
+    if isinstance(normalized.get('doi'), str):
+        normalized['doi'] = normalize_doi(normalized['doi'])
+
+    return normalized
+
+
+def build_metadata_filter(
+    content_type: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    paper: Optional[str] = None,
+    paper_ids: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Build a ChromaDB `where` clause from knowledge base tool arguments.
+
+    Args:
+        content_type: "text", "figure" or "equation"
+        year_min: Earliest publication year (inclusive)
+        year_max: Latest publication year (inclusive)
+        paper: DOI, exact title or PDF filename of a single paper
+        paper_ids: Registry IDs the paper resolved to (see paper_registry);
+            needed for chunks that no longer carry DOI/title themselves
+
+    Returns:
+        `where` dict, or None when no filter applies
+
+    Raises:
+        ValueError: If content_type is unknown or the year range is empty
+    """
+    clauses = []
+
+    if content_type:
+        if content_type not in CONTENT_TYPES:
+            raise ValueError(f"Invalid content_type '{content_type}'. Choose from: {list(CONTENT_TYPES)}")
+        clauses.append({'content_type': {'$eq': content_type}})
+
+    year_min = parse_year(year_min) if year_min is not None else None
+    year_max = parse_year(year_max) if year_max is not None else None
+    if year_min is not None and year_max is not None and year_min > year_max:
+        raise ValueError(f"Empty year range: {year_min}–{year_max}")
+    if year_min is not None:
+        clauses.append({'year': {'$gte': year_min}})
+    if year_max is not None:
+        clauses.append({'year': {'$lte': year_max}})
+
+    if paper and paper.strip():
+        paper = paper.strip()
+        alternatives = [
+            {'doi': {'$eq': normalize_doi(paper)}},
+            {'title': {'$eq': paper}},
+            {'filename': {'$eq': paper}},
+        ]
+        if paper_ids:
+            alternatives.append({'paper_id': {'$in': list(paper_ids)}})
+        clauses.append({'$or': alternatives})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {'$and': clauses}
+
+
+def normalize_collection_metadata(collection) -> int:
+    """
+    Migrate an existing collection's metadata in place.
+
+    Args:
+        collection: ChromaDB collection
+
+    Returns:
+        Number of chunks whose metadata changed
+    """
+    updated = 0
+    total = collection.count()
+
+    for offset in range(0, total, MIGRATION_BATCH_SIZE):
+        batch = collection.get(include=['metadatas'], limit=MIGRATION_BATCH_SIZE, offset=offset)
+        if not batch['ids']:
+            break
+
+        ids, metadatas = [], []
+        for doc_id, metadata in zip(batch['ids'], batch['metadatas']):
+            normalized = normalize_metadata(metadata or {})
+            if normalized != metadata:
+                ids.append(doc_id)
+                metadatas.append(normalized)
+
+        if ids:
+            collection.update(ids=ids, metadatas=metadatas)
+            updated += len(ids)
+
+    return updated
@@ -0,0 +1,128 @@
+"""
+Offline Embedding Backends
+
+Drop-in replacements for OpenAIEmbeddings (embed_query, embed_documents,
+aembed_query) so retrieval can be benchmarked without network access:
+
+- RecordedEmbeddings: replays query embeddings recorded from the real model.
+  Recording needs the API once; replays are offline and exact, so quality
+  metrics match production.
+- HashingEmbeddings: deterministic feature-hashing vectors. Needs nothing, but
+  its vectors don't live in the OpenAI embedding space, so against a real
+  collection it only exercises the pipeline (latency, payload sizes), not
+  retrieval quality.
+
+Usage:
+    from knowledge_base.offline_embeddings import RecordedEmbeddings
+
+    embeddings = RecordedEmbeddings("data/golden_query_embeddings.json")
+    engine = RAGQueryEngine(embeddings=embeddings)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional
+import numpy as np
+
+
+# Configuration
+EMBEDDING_DIMS = 1536  # text-embedding-3-small
+
+
+class RecordedEmbeddings:
+    """Replays recorded embeddings; optionally records misses from a live backend."""
+
+    def __init__(self, recording_file: Path, backend=None):
+        """
+        Initialize recorded embeddings.
+
+        Args:
+            recording_file: JSON file {text: vector}
+            backend: Live embeddings used (and recorded) on a miss;
+                None = offline, a miss raises KeyError
+        """
+        self.recording_file = Path(recording_file)
+        self.backend = backend
+        self._vectors: Dict[str, List[float]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.recording_file.exists():
+            with open(self.recording_file, encoding='utf-8') as f:
+                self._vectors = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Recorded embedding for text (recorded from the backend on a miss)."""
+        with self._lock:
+            vector = self._vectors.get(text)
+        if vector is not None:
+            return vector
+
+        if self.backend is None:
+            raise KeyError(
+                f"No recorded embedding for {text!r}; re-run with recording enabled"
+            )
+
+        vector = self.backend.embed_query(text)
+        with self._lock:
+            self._vectors[text] = vector
+            self._dirty = True
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+    def save(self) -> Optional[Path]:
+        """Write newly recorded embeddings (no-op if nothing changed)."""
+        with self._lock:
+            if not self._dirty:
+                return None
+            self.recording_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.recording_file.with_suffix(".json.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._vectors, f)
+            os.replace(tmp_path, self.recording_file)
+            self._dirty = False
+        return self.recording_file
+
+
+class HashingEmbeddings:
+    """Deterministic feature-hashing embeddings (no model, no network)."""
+
+    def __init__(self, dims: int = EMBEDDING_DIMS):
+        """
+        Initialize hashing embeddings.
+
+        Args:
+            dims: Vector dimension (match the collection's dimension)
+        """
+        self.dims = dims
+
+    def embed_query(self, text: str) -> List[float]:
+        """Unit vector from signed hashes of the text's lowercase word tokens."""
+        vector = np.zeros(self.dims, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(token.encode('utf-8')).digest()
+            index = int.from_bytes(digest[:4], 'little') % self.dims
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
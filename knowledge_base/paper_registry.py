@@ -0,0 +1,220 @@
+"""
+Paper Registry
+
+Citation metadata (title, authors, journal, formatted citation, DOI, file
+path) used to be copied into every chunk of a paper, figure and equation
+chunks included. It now lives once per paper in a small SQLite table next to
+the vector database; chunks keep a `paper_id` plus the fields ChromaDB has to
+filter or group on (filename, domain, year, content type, position).
+
+The query engine joins citation fields back onto retrieved chunks from an
+in-memory cache, so formatting and callers see the same metadata as before.
+Chunks ingested before the registry existed still carry their own citation
+fields and are left as they are (rebuild with `ingest_papers.py --new-version`
+to slim them).
+
+Storage: <vector_db>/papers.sqlite3
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from knowledge_base.metadata_filters import normalize_doi, parse_year
+
+
+# Configuration
+PAPERS_DB_FILE = "papers.sqlite3"
+PAPER_FIELDS = ("filename", "domain", "file_path", "title", "authors", "year", "journal", "citation", "doi")
+
+# Paper fields kept on every chunk: filters ($gte on year), de-duplication,
+# adjacency and per-paper grouping work on them without a join
+CHUNK_PAPER_FIELDS = ("paper_id", "filename", "domain", "year")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    paper_id TEXT PRIMARY KEY,
+    filename TEXT,
+    domain TEXT,
+    file_path TEXT,
+    title TEXT,
+    authors TEXT,
+    year INTEGER,
+    journal TEXT,
+    citation TEXT,
+    doi TEXT
+);
+CREATE INDEX IF NOT EXISTS papers_doi ON papers (doi);
+CREATE INDEX IF NOT EXISTS papers_title ON papers (title);
+CREATE INDEX IF NOT EXISTS papers_filename ON papers (filename);
+"""
+
+
+def make_paper_id(filename: str) -> str:
+    """Stable paper ID derived from the PDF filename."""
+    return hashlib.md5(filename.encode()).hexdigest()[:16]
+
+
+class PaperRegistry:
+    """SQLite papers table with an in-memory cache for joins at query time."""
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize registry.
+
+        Args:
+            db_path: SQLite file (created on first write)
+        """
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def register(self, metadata: Dict[str, Any]) -> str:
+        """
+        Insert or update a paper from its extracted metadata.
+
+        Args:
+            metadata: Paper metadata (see PDFIngester.extract_pdf_metadata)
+
+        Returns:
+            The paper's ID
+        """
+        paper_id = make_paper_id(metadata["filename"])
+        row = {field: metadata.get(field) for field in PAPER_FIELDS}
+        row["year"] = parse_year(row["year"])
+        if isinstance(row["doi"], str):
+            row["doi"] = normalize_doi(row["doi"])
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                f"INSERT OR REPLACE INTO papers (paper_id, {', '.join(PAPER_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' for _ in PAPER_FIELDS)})",
+                [paper_id] + [row[field] for field in PAPER_FIELDS],
+            )
+            conn.commit()
+            self._cache[paper_id] = _without_none(row)
+
+        return paper_id
+
+    def chunk_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Register a paper and return the per-chunk base metadata referencing it.
+
+        Args:
+            metadata: Full paper metadata
+
+        Returns:
+            {paper_id, filename, domain, year} for the paper's chunks
+        """
+        reference = {"paper_id": self.register(metadata)}
+        for field in CHUNK_PAPER_FIELDS[1:]:
+            if metadata.get(field) is not None:
+                reference[field] = metadata[field]
+        return reference
+
+    def get_many(self, paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Paper metadata by ID, from the cache (one SELECT for any misses).
+
+        Args:
+            paper_ids: Paper IDs
+
+        Returns:
+            {paper_id: metadata} for the IDs that exist
+        """
+        with self._lock:
+            missing = [pid for pid in set(paper_ids) if pid not in self._cache]
+            if missing and self.db_path.exists():
+                rows = self._connect().execute(
+                    f"SELECT * FROM papers WHERE paper_id IN ({', '.join('?' for _ in missing)})",
+                    missing,
+                ).fetchall()
+                for row in rows:
+                    paper = dict(row)
+                    self._cache[paper.pop("paper_id")] = _without_none(paper)
+
+            return {pid: self._cache[pid] for pid in paper_ids if pid in self._cache}
+
+    def hydrate(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Join paper metadata onto retrieved chunks (in place).
+
+        Fields already on a chunk win, so chunks from before the registry are
+        unchanged.
+
+        Args:
+            results: Retrieval results with 'metadata'
+
+        Returns:
+            The same results
+        """
+        paper_ids = [r['metadata'].get('paper_id') for r in results if r.get('metadata')]
+        papers = self.get_many([pid for pid in paper_ids if pid])
+        if not papers:
+            return results
+
+        for result in results:
+            metadata = result.get('metadata')
+            paper = papers.get(metadata.get('paper_id')) if metadata else None
+            if paper is None:
+                continue
+            for field, value in paper.items():
+                metadata.setdefault(field, value)
+
+        return results
+
+    def find(self, paper: str) -> List[str]:
+        """
+        IDs of papers matching a DOI, exact title or filename.
+
+        Args:
+            paper: DOI (any prefix form), title or PDF filename
+
+        Returns:
+            Matching paper IDs
+        """
+        paper = paper.strip()
+        if not paper or not self.db_path.exists():
+            return []
+
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT paper_id FROM papers WHERE doi = ? OR title = ? OR filename = ?",
+                (normalize_doi(paper), paper, paper),
+            ).fetchall()
+        return [row["paper_id"] for row in rows]
+
+    def count(self) -> int:
+        """Number of registered papers."""
+        if not self.db_path.exists():
+            return 0
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+
+def _without_none(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in row.items() if value is not None}
+
+
+# Shared registry for the default vector database
+_paper_registry = None
+
+
+def get_paper_registry() -> PaperRegistry:
+    """Get the registry of the default vector database (data/vector_db)."""
+    global _paper_registry
+    if _paper_registry is None:
+        _paper_registry = PaperRegistry(Path(__file__).parent.parent / "data" / "vector_db" / PAPERS_DB_FILE)
+    return _paper_registry
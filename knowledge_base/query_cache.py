@@ -0,0 +1,354 @@
+"""
+Query Caches for RAG Retrieval
+
+Agents often ask the same thing twice, or paraphrase it ("pore size effects on
+selectivity" vs "how does pore diameter affect ion selectivity"). Two caches
+avoid repeating the work:
+
+- EmbeddingCache: exact query text → embedding (skips the embeddings API call)
+- QueryResultCache: per-collection cache of recent queries and their results.
+  An exact-text match is served directly; otherwise the query embedding is
+  compared against the matrix of cached query embeddings in one dot product
+  and a cached entry within the cosine threshold is reused.
+
+Entries expire after max_age_seconds, which bounds how stale a served result
+can be relative to the underlying collection.
+
+Each result entry records its source ("query" or "prefetch"), so the share of
+prefetched entries that were later used can be reported per collection.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Hashable, Tuple
+import numpy as np
+
+
+# Configuration
+EMBEDDING_CACHE_SIZE = 1024  # Query embeddings kept (exact text)
+RESULT_CACHE_ENTRIES = 64  # Cached queries per collection/parameter partition
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Cosine similarity needed to reuse a cached result
+RESULT_CACHE_MAX_AGE = 3600.0  # Seconds before a cached result is considered stale
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache of query text → embedding."""
+
+    def __init__(self, max_entries: int = EMBEDDING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for text, or None."""
+        with self._lock:
+            embedding = self._entries.get(text)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return embedding
+
+    def put(self, text: str, embedding: List[float]):
+        """Store an embedding."""
+        with self._lock:
+            self._entries[text] = embedding
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class _Partition:
+    """Cached entries for one collection + parameter combination."""
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.matrix: Optional[np.ndarray] = None  # Normalized embeddings, row-aligned with keys
+        self.keys: List[str] = []
+
+    def rebuild_matrix(self):
+        self.keys = [k for k, e in self.entries.items() if e['embedding'] is not None]
+        if self.keys:
+            self.matrix = np.vstack([self.entries[k]['embedding'] for k in self.keys])
+        else:
+            self.matrix = None
+
+
+class QueryResultCache:
+    """
+    Thread-safe exact + semantic cache of retrieval results.
+
+    Partitions are keyed by (collection, query parameters) so a cached result
+    is only ever reused for an identical request shape.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_CACHE_ENTRIES,
+        similarity_threshold: Optional[float] = SEMANTIC_CACHE_THRESHOLD,
+        max_age_seconds: float = RESULT_CACHE_MAX_AGE
+    ):
+        """
+        Initialize result cache.
+
+        Args:
+            max_entries: Entries kept per partition (LRU eviction)
+            similarity_threshold: Cosine threshold for semantic reuse (None = exact only)
+            max_age_seconds: Entries older than this are never served
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.max_age_seconds = max_age_seconds
+        self._partitions: Dict[Hashable, _Partition] = {}
+        self._lock = threading.RLock()
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.oldest_served_age = 0.0
+        self._semantic_similarity_sum = 0.0
+
+        # Per (collection, source) accounting, e.g. source "query" vs "prefetch":
+        # stored entries, lookups served, and entries served at least once
+        self._source_stats: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    @staticmethod
+    def _collection_of(partition_key: Hashable) -> str:
+        if isinstance(partition_key, tuple) and partition_key:
+            return str(partition_key[0])
+        return str(partition_key)
+
+    def _count_source(self, partition_key: Hashable, source: str, counter: str):
+        key = (self._collection_of(partition_key), source)
+        stats = self._source_stats.setdefault(key, {'stored': 0, 'served': 0, 'used': 0})
+        stats[counter] += 1
+
+    def _serve(self, partition_key: Hashable, entry: Dict[str, Any]) -> Dict[str, Any]:
+        age = time.time() - entry['created_at']
+        self.oldest_served_age = max(self.oldest_served_age, age)
+
+        self._count_source(partition_key, entry['source'], 'served')
+        if entry['hits'] == 0:
+            self._count_source(partition_key, entry['source'], 'used')
+
+        entry['hits'] += 1
+        return entry
+
+    def _drop_expired(self, partition: _Partition) -> bool:
+        now = time.time()
+        stale = [k for k, e in partition.entries.items() if now - e['created_at'] > self.max_age_seconds]
+        for key in stale:
+            del partition.entries[key]
+        self.expired += len(stale)
+        return bool(stale)
+
+    def lookup_exact(
+        self,
+        partition_key: Hashable,
+        query: str,
+        record: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Exact-text lookup (needs no embedding).
+
+        Does not count a miss, since a semantic lookup usually follows.
+
+        Args:
+            partition_key: Collection + parameter key
+            query: Query text
+            record: Whether this lookup counts in hit statistics
+
+        Returns:
+            Cache entry {query, results, created_at, hits, source, formatted} or None
+        """
+        with self._lock:
+            partition = self._partitions.get(partition_key)
+            if partition is None:
+                return None
+            if self._drop_expired(partition):
+                partition.rebuild_matrix()
+
+            entry = partition.entries.get(query)
+            if entry is None:
+                return None
+
+            partition.entries.move_to_end(query)
+            if not record:
+                return entry
+            self.exact_hits += 1
+            return self._serve(partition_key, entry)
+
+    def contains(self, partition_key: Hashable, query: str) -> bool:
+        """Whether an unexpired exact-text entry exists (does not touch statistics)."""
+        with self._lock:
+            partition = self._partitions.get(partition_key)
+            if partition is None or query not in partition.entries:
+                return False
+            return time.time() - partition.entries[query]['created_at'] <= self.max_age_seconds
+
+    def lookup_similar(
+        self,
+        partition_key: Hashable,
+        embedding,
+        record: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Semantic lookup: the closest cached query within the cosine threshold.
+
+        Args:
+            partition_key: Collection + parameter key
+            embedding: Query embedding
+            record: Whether this lookup counts in hit/miss statistics
+
+        Returns:
+            Cache entry or None (counted as a miss)
+        """
+        with self._lock:
+            partition = self._partitions.get(partition_key)
+            if partition is not None and self._drop_expired(partition):
+                partition.rebuild_matrix()
+
+            if (
+                self.similarity_threshold is None
+                or partition is None
+                or partition.matrix is None
+            ):
+                self.misses += int(record)
+                return None
+
+            similarities = partition.matrix @ self._normalize(embedding)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                self.misses += int(record)
+                return None
+
+            key = partition.keys[best]
+            partition.entries.move_to_end(key)
+            if not record:
+                return partition.entries[key]
+            self.semantic_hits += 1
+            self._semantic_similarity_sum += float(similarities[best])
+            return self._serve(partition_key, partition.entries[key])
+
+    def put(
+        self,
+        partition_key: Hashable,
+        query: str,
+        embedding,
+        results: List[Dict[str, Any]],
+        source: str = "query"
+    ) -> Dict[str, Any]:
+        """
+        Store results for a query.
+
+        Args:
+            partition_key: Collection + parameter key
+            query: Query text
+            embedding: Query embedding (None = exact-match only)
+            results: Retrieval results
+            source: Who produced the entry ("query", "prefetch"), for hit accounting
+
+        Returns:
+            The stored entry
+        """
+        entry = {
+            'query': query,
+            'embedding': self._normalize(embedding) if embedding is not None else None,
+            'results': results,
+            'created_at': time.time(),
+            'hits': 0,
+            'formatted': {},
+            'source': source,
+        }
+
+        with self._lock:
+            self._count_source(partition_key, source, 'stored')
+            partition = self._partitions.setdefault(partition_key, _Partition())
+            partition.entries[query] = entry
+            partition.entries.move_to_end(query)
+            while len(partition.entries) > self.max_entries:
+                partition.entries.popitem(last=False)
+            partition.rebuild_matrix()
+
+        return entry
+
+    def clear(self, collection_name: Optional[str] = None):
+        """Drop all entries (or only those of one collection)."""
+        with self._lock:
+            if collection_name is None:
+                self._partitions.clear()
+                return
+            for key in [k for k in self._partitions if isinstance(k, tuple) and k and k[0] == collection_name]:
+                del self._partitions[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates and staleness bounds."""
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            hits = self.exact_hits + self.semantic_hits
+            return {
+                "entries": sum(len(p.entries) for p in self._partitions.values()),
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "semantic_hit_rate": self.semantic_hits / lookups if lookups else 0.0,
+                "mean_semantic_similarity": (
+                    self._semantic_similarity_sum / self.semantic_hits if self.semantic_hits else None
+                ),
+                "similarity_threshold": self.similarity_threshold,
+                "expired_entries": self.expired,
+                "max_age_seconds": self.max_age_seconds,
+                "oldest_served_age_seconds": round(self.oldest_served_age, 1),
+                "by_source": {
+                    source: self.get_source_stats(source)
+                    for source in sorted({s for _, s in self._source_stats})
+                },
+            }
+
+    def get_source_stats(self, source: str, collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Usage of entries produced by one source (e.g. "prefetch").
+
+        Args:
+            source: Entry source passed to put()
+            collection_name: Restrict to one collection (None = all)
+
+        Returns:
+            {stored, served, used, used_rate}; used_rate is the fraction of
+            stored entries that served at least one lookup
+        """
+        totals = {'stored': 0, 'served': 0, 'used': 0}
+        with self._lock:
+            for (collection, entry_source), stats in self._source_stats.items():
+                if entry_source != source:
+                    continue
+                if collection_name is not None and collection != collection_name:
+                    continue
+                for counter, value in stats.items():
+                    totals[counter] += value
+
+        totals['used_rate'] = totals['used'] / totals['stored'] if totals['stored'] else 0.0
+        return totals
@@ -12,18 +12,63 @@ Usage:
         domain="nanofluidics",
         top_k=5
     )
+
+    # From asyncio code (shares the engine and caches with the sync path)
+    context = await aget_context_for_agent("EDL overlap", domain="nanofluidics")
 """
 
+import os
+import json
+import asyncio
+import functools
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, Future
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-import chromadb
-from chromadb.config import Settings
 from langchain_openai import OpenAIEmbeddings
 
+from knowledge_base.truncated_index import (
+    TruncatedIndex,
+    DEFAULT_TRUNCATED_DIMS,
+    DEFAULT_TRUNCATED_INT8,
+    rerank_with_full_vectors,
+)
+from knowledge_base.diversification import mmr_select, paper_key
+from knowledge_base.context_packer import pack_results, DEFAULT_TOKEN_BUDGET
+from knowledge_base.chunk_adjacency import ChunkAdjacencyIndex
+from knowledge_base.query_cache import EmbeddingCache, QueryResultCache, SEMANTIC_CACHE_THRESHOLD
+from knowledge_base.retrieval_metrics import LatencyRecorder
+from knowledge_base.domain_router import DomainCentroids, DomainRouter, ROUTER_THRESHOLD
+from knowledge_base.collection_aliases import CollectionAliasRegistry
+from knowledge_base.paper_registry import PaperRegistry, PAPERS_DB_FILE
+from knowledge_base.chroma_clients import get_chroma_client, get_shared_collection
+
 
 # Configuration
 EMBEDDING_MODEL = "text-embedding-3-small"
 
+# Index mode: "full" queries ChromaDB directly; "truncated" searches a compact
+# truncated-dimension index and re-scores candidates with the full vectors
+# (build it first with: python -m knowledge_base.truncated_index build)
+INDEX_MODE = os.getenv("RAG_INDEX_MODE", "full")
+TRUNCATED_DIMS = int(os.getenv("RAG_TRUNCATED_DIMS", DEFAULT_TRUNCATED_DIMS))
+TRUNCATED_INT8 = os.getenv("RAG_TRUNCATED_INT8", "1" if DEFAULT_TRUNCATED_INT8 else "0") == "1"
+RERANK_CANDIDATE_MULTIPLIER = 10  # First-stage candidates = top_k * multiplier
+
+# Result diversification (maximal marginal relevance + per-paper cap)
+MMR_LAMBDA = 0.7  # 1.0 = pure relevance, lower = more diverse
+MMR_FETCH_MULTIPLIER = 4  # Candidates considered = top_k * multiplier
+MAX_CHUNKS_PER_PAPER = 2  # Per-paper cap on returned chunks
+
+# Async API: ChromaDB calls run in a bounded thread pool
+CHROMA_EXECUTOR_WORKERS = 4
+
+# Background prefetch (warms the caches before agents issue tool calls)
+PREFETCH_WORKERS = 2
+PREFETCH_SOURCE = "prefetch"  # Result cache entry source for prefetched queries
+
 # Domain mapping
 DOMAINS = {
     "electrochemistry": "electrochemistry_papers",
@@ -37,12 +82,27 @@ DOMAINS = {
 class RAGQueryEngine:
     """Query engine for retrieving information from ChromaDB knowledge base."""
 
-    def __init__(self, vector_db_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        vector_db_dir: Optional[Path] = None,
+        index_mode: Optional[str] = None,
+        truncated_dims: int = TRUNCATED_DIMS,
+        quantize: bool = TRUNCATED_INT8,
+        semantic_cache_threshold: Optional[float] = SEMANTIC_CACHE_THRESHOLD,
+        embeddings=None
+    ):
         """
         Initialize RAG query engine.
 
         Args:
             vector_db_dir: Path to vector database. If None, uses default location.
+            index_mode: "full" or "truncated" (None = INDEX_MODE from environment)
+            truncated_dims: Dimension of the truncated first-stage index
+            quantize: Whether the truncated index is int8-quantized
+            semantic_cache_threshold: Cosine similarity above which a cached
+                result for a paraphrased query is reused (None = exact-text only)
+            embeddings: Embeddings backend with embed_query/aembed_query
+                (None = OpenAI; see offline_embeddings for recorded/fake backends)
         """
         if vector_db_dir is None:
             # Default location: ion_transport/data/vector_db/
@@ -51,69 +111,626 @@ class RAGQueryEngine:
 
         self.vector_db_dir = vector_db_dir
 
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=str(vector_db_dir),
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # Shared ChromaDB client (one per store for the whole process)
+        self.client = get_chroma_client(vector_db_dir)
+
+        # Domain collection names are aliases of versioned collections (blue/green rebuilds)
+        self.aliases = CollectionAliasRegistry(vector_db_dir)
+
+        # Citation metadata stored once per paper, joined onto retrieved chunks
+        self.papers = PaperRegistry(Path(vector_db_dir) / PAPERS_DB_FILE)
 
         # Initialize embeddings
-        self.embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+        self.embeddings = embeddings if embeddings is not None else OpenAIEmbeddings(model=EMBEDDING_MODEL)
 
-    def query_collection(
+        # Two-stage retrieval settings
+        self.index_mode = index_mode or INDEX_MODE
+        if self.index_mode not in ("full", "truncated"):
+            raise ValueError(f"Invalid index_mode '{self.index_mode}'. Choose from: ['full', 'truncated']")
+        self.truncated_dims = truncated_dims
+        self.quantize = quantize
+        self._truncated_indexes: Dict[str, Optional[TruncatedIndex]] = {}
+        self._adjacency_indexes: Dict[str, ChunkAdjacencyIndex] = {}
+        self._domain_router: Optional[DomainRouter] = None
+        self._domain_router_key: Optional[tuple] = None  # Resolved collections + centroid mtimes it was loaded from
+        self._index_lock = threading.Lock()  # Lazy index loads may race under the executor
+
+        # Query caches (exact-text embeddings + exact/semantic results)
+        self.embedding_cache = EmbeddingCache()
+        self.result_cache = QueryResultCache(similarity_threshold=semantic_cache_threshold)
+
+        # Per-stage latency (embed, search, post_process, format, total) per domain
+        self.latency = LatencyRecorder()
+
+        # Bounded executor for ChromaDB work issued from the async API
+        self._executor = ThreadPoolExecutor(
+            max_workers=CHROMA_EXECUTOR_WORKERS,
+            thread_name_prefix="rag-chroma",
+        )
+
+        # Separate pool for background prefetch so it never queues ahead of live queries
+        self._prefetch_executor = ThreadPoolExecutor(
+            max_workers=PREFETCH_WORKERS,
+            thread_name_prefix="rag-prefetch",
+        )
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_counts: Dict[str, Dict[str, int]] = {}
+        self._prefetch_in_flight: Dict[tuple, Future] = {}  # (partition_key, query) -> running prefetch
+
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query, reusing the cached embedding for repeated text."""
+        embedding = self.embedding_cache.get(query)
+        if embedding is None:
+            embedding = self.embeddings.embed_query(query)
+            self.embedding_cache.put(query, embedding)
+        return embedding
+
+    async def _aembed_query(self, query: str) -> List[float]:
+        """Async embed via the async embeddings client, sharing the embedding cache."""
+        embedding = self.embedding_cache.get(query)
+        if embedding is None:
+            embedding = await self.embeddings.aembed_query(query)
+            self.embedding_cache.put(query, embedding)
+        return embedding
+
+    async def _run_in_executor(self, func, *args, **kwargs):
+        """Run a blocking call in the bounded ChromaDB executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    @staticmethod
+    def _domain_label(collection_name: str) -> str:
+        """Domain name of a collection (the collection name if not a known domain)."""
+        for domain, name in DOMAINS.items():
+            if name == collection_name:
+                return domain
+        return collection_name
+
+    def _span(self, collection_name: str, stage: str, record: bool = True):
+        """Latency span for a stage (no-op when not recording, e.g. prefetch)."""
+        if not record:
+            return nullcontext()
+        return self.latency.span(self._domain_label(collection_name), stage)
+
+    def get_latency_stats(self, domain: Optional[str] = None) -> Dict[str, Any]:
+        """Per-stage latency percentiles (p50/p95/p99), per domain."""
+        return self.latency.get_stats(domain)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit rates and staleness bounds of the query caches."""
+        return {
+            "embeddings": self.embedding_cache.get_stats(),
+            "results": self.result_cache.get_stats(),
+        }
+
+    def prefetch(
         self,
-        query: str,
-        collection_name: str,
+        queries: List[str],
+        domain: str,
         top_k: int = 5,
-        filter_metadata: Optional[Dict] = None
-    ) -> List[Dict[str, Any]]:
+        token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET
+    ) -> List[Future]:
         """
-        Query a specific ChromaDB collection.
+        Warm the caches for queries an agent is likely to issue.
+
+        Each query is embedded, retrieved and packed in the background with
+        the same request shape as get_context, so a later tool call with the
+        same (or a semantically close) query is served from the cache.
+        Prefetch lookups do not count towards the cache hit statistics.
 
         Args:
-            query: Query string
-            collection_name: Name of collection to query
-            top_k: Number of results to return
-            filter_metadata: Optional metadata filters
+            queries: Anticipated queries (duplicates and blanks are dropped)
+            domain: Domain to retrieve from
+            top_k: Number of chunks per query (match the tool call default)
+            token_budget: Token budget of the packed context to memoize
 
         Returns:
-            List of results with text, metadata, and distance
+            Futures of the submitted prefetches
         """
+        self._validate_context_domain(domain)
+        partition_key = self._cache_key(
+            DOMAINS[domain], top_k, None, True, MAX_CHUNKS_PER_PAPER, 0
+        )
+
+        futures = []
+        for query in dict.fromkeys(q.strip() for q in queries if q and q.strip()):
+            key = (partition_key, query)
+            future = None
+            if not self.result_cache.contains(partition_key, query):
+                with self._prefetch_lock:
+                    if key not in self._prefetch_in_flight:
+                        future = self._prefetch_executor.submit(self._prefetch_one, query, domain, top_k, token_budget)
+                        self._prefetch_in_flight[key] = future
+            if future is None:
+                self._count_prefetch(domain, 'skipped')
+                continue
+            self._count_prefetch(domain, 'issued')
+            # Outside the lock: the callback runs inline if the prefetch already finished
+            future.add_done_callback(functools.partial(self._prefetch_done, key))
+            futures.append(future)
+
+        return futures
+
+    def _prefetch_done(self, key: tuple, future: Future):
+        with self._prefetch_lock:
+            if self._prefetch_in_flight.get(key) is future:
+                del self._prefetch_in_flight[key]
+
+    def _pending_prefetch(self, partition_key: tuple, query: str) -> Optional[Future]:
+        """Prefetch still running for this request, if any."""
+        with self._prefetch_lock:
+            return self._prefetch_in_flight.get((partition_key, query))
+
+    def _prefetch_one(self, query: str, domain: str, top_k: int, token_budget: Optional[int]):
+        """Run one prefetch; failures are counted, never raised."""
         try:
-            collection = self.client.get_collection(name=collection_name)
+            self._get_context(query, domain, top_k, token_budget, 0, cache_source=PREFETCH_SOURCE)
+            self._count_prefetch(domain, 'completed')
         except Exception as e:
-            print(f"Error: Collection '{collection_name}' not found: {e}")
+            self._count_prefetch(domain, 'failed')
+            print(f"⚠ Prefetch failed for [{domain}] \"{query}\": {e}")
+
+    def _count_prefetch(self, domain: str, counter: str):
+        with self._prefetch_lock:
+            counts = self._prefetch_counts.setdefault(
+                domain, {'issued': 0, 'skipped': 0, 'completed': 0, 'failed': 0}
+            )
+            counts[counter] += 1
+
+    def get_prefetch_stats(self, domain: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Prefetch activity and how often prefetched results were used.
+
+        Args:
+            domain: Restrict to one domain (None = all domains)
+
+        Returns:
+            {issued, skipped, completed, failed, stored, served, used, hit_rate};
+            hit_rate is the fraction of prefetched entries that later served
+            at least one real lookup
+        """
+        with self._prefetch_lock:
+            if domain is None:
+                counts = {'issued': 0, 'skipped': 0, 'completed': 0, 'failed': 0}
+                for domain_counts in self._prefetch_counts.values():
+                    for counter, value in domain_counts.items():
+                        counts[counter] += value
+            else:
+                counts = dict(self._prefetch_counts.get(
+                    domain, {'issued': 0, 'skipped': 0, 'completed': 0, 'failed': 0}
+                ))
+
+        usage = self.result_cache.get_source_stats(
+            PREFETCH_SOURCE, DOMAINS[domain] if domain is not None else None
+        )
+        counts.update({
+            'stored': usage['stored'],
+            'served': usage['served'],
+            'used': usage['used'],
+            'hit_rate': usage['used_rate'],
+        })
+        return counts
+
+    def _get_truncated_index(self, collection) -> Optional[TruncatedIndex]:
+        """
+        Load (once) the truncated index for a collection.
+
+        Returns None when the index is missing or stale, in which case the
+        caller falls back to a full ChromaDB query.
+        """
+        name = collection.name
+        with self._index_lock:
+            if name in self._truncated_indexes:
+                return self._truncated_indexes[name]
+
+            index = TruncatedIndex.load(self.vector_db_dir, name, self.truncated_dims, self.quantize)
+
+            if index is None:
+                print(f"⚠ No truncated index for '{name}', using full index. "
+                      f"Run: python -m knowledge_base.truncated_index build")
+            elif index.is_stale(collection):
+                print(f"⚠ Truncated index for '{name}' is stale, using full index. Rebuild it to re-enable.")
+                index = None
+
+            self._truncated_indexes[name] = index
+            return index
+
+    def _get_adjacency_index(self, collection) -> ChunkAdjacencyIndex:
+        """Load (once) the chunk adjacency index, backfilling it if it was never built."""
+        name = collection.name
+        with self._index_lock:
+            if name not in self._adjacency_indexes:
+                index = ChunkAdjacencyIndex.load(self.vector_db_dir, name)
+                if index is None:
+                    print(f"ℹ️  Building chunk adjacency index for '{name}' (one-time)")
+                    index = ChunkAdjacencyIndex.build_from_collection(collection)
+                    index.save(self.vector_db_dir)
+                self._adjacency_indexes[name] = index
+
+            return self._adjacency_indexes[name]
+
+    def _centroid_sources(self) -> tuple:
+        """(domain, resolved collection, centroid file mtime) for every domain collection."""
+        sources = []
+        for domain, collection_name in DOMAINS.items():
+            if collection_name is None:
+                continue
+            resolved = self.aliases.resolve(collection_name)
+            try:
+                mtime = os.stat(DomainCentroids.index_path(self.vector_db_dir, resolved)).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            sources.append((domain, resolved, mtime))
+        return tuple(sources)
+
+    def get_domain_router(self) -> Optional[DomainRouter]:
+        """
+        Cross-domain router, or None if no centroids were built.
+
+        Reloaded whenever an alias swap changes the collections behind the
+        domains or an ingest rewrites their centroid files, so long-lived
+        engines never route with stale centroids.
+        """
+        with self._index_lock:
+            sources = self._centroid_sources()
+            if sources != self._domain_router_key:
+                centroids = {}
+                for domain, collection_name, mtime in sources:
+                    if mtime is None:
+                        continue
+                    domain_centroids = DomainCentroids.load(self.vector_db_dir, collection_name)
+                    if domain_centroids is not None:
+                        centroids[domain] = domain_centroids
+
+                router = DomainRouter(centroids)
+                if len(router) == 0:
+                    print("ℹ️  No domain centroids, cross-domain queries search every domain. "
+                          "Run: python -m knowledge_base.domain_router build")
+                    router = None
+
+                self._domain_router = router
+                self._domain_router_key = sources
+
+            return self._domain_router
+
+    def route_query(
+        self,
+        query: str,
+        threshold: float = ROUTER_THRESHOLD,
+        include_domain: Optional[str] = None
+    ) -> List[str]:
+        """
+        Domains a cross-domain query should be sent to.
+
+        Args:
+            query: Query string
+            threshold: Minimum centroid similarity for a domain to be queried
+            include_domain: Always query this domain (e.g. the caller's own)
+
+        Returns:
+            Domain names, most similar first (every domain if no router is available)
+        """
+        all_domains = [domain for domain in DOMAINS if DOMAINS[domain] is not None]
+        if include_domain is not None and include_domain not in all_domains:
+            raise ValueError(f"Invalid domain. Choose from: {all_domains}")
+
+        router = self.get_domain_router()
+        if router is None:
+            return all_domains
+
+        routed = router.route(self._embed_query(query), threshold, include_domain)
+        # Domains without centroids yet (e.g. newly created) can't be ruled out
+        routed.extend(domain for domain in all_domains if domain not in router.domains and domain not in routed)
+        return routed
+
+    def _expand_neighbors(
+        self,
+        collection,
+        results: List[Dict[str, Any]],
+        radius: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Add the ±radius neighbouring chunks of each text hit.
+
+        All neighbours are fetched with one collection.get(). Each neighbour is
+        placed right after its hit, inherits the hit's distance and is marked
+        with 'expanded_from'.
+        """
+        index = self._get_adjacency_index(collection)
+        seen = {r['id'] for r in results}
+        neighbors_of: Dict[str, List[str]] = {}
+
+        for result in results:
+            metadata = result['metadata']
+            if metadata.get('content_type', 'text') != 'text' or 'chunk_id' not in metadata:
+                continue
+            ids = [
+                i for i in index.neighbor_ids(metadata.get('filename', ''), metadata['chunk_id'], radius)
+                if i not in seen
+            ]
+            seen.update(ids)
+            neighbors_of[result['id']] = ids
+
+        wanted = [i for ids in neighbors_of.values() for i in ids]
+        if not wanted:
+            return results
+
+        fetched = collection.get(ids=wanted, include=['documents', 'metadatas'])
+        self.papers.hydrate([{'metadata': metadata} for metadata in fetched['metadatas']])
+        by_id = {
+            doc_id: (fetched['documents'][i], fetched['metadatas'][i])
+            for i, doc_id in enumerate(fetched['ids'])
+        }
+
+        expanded = []
+        for result in results:
+            expanded.append(result)
+            for doc_id in neighbors_of.get(result['id'], []):
+                if doc_id not in by_id:
+                    continue
+                text, metadata = by_id[doc_id]
+                expanded.append({
+                    'text': text,
+                    'metadata': metadata,
+                    'distance': result['distance'],
+                    'id': doc_id,
+                    'expanded_from': result['id'],
+                })
+
+        return expanded
+
+    def _search_truncated(
+        self,
+        collection,
+        index: TruncatedIndex,
+        query_embedding: List[float],
+        n_results: int,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Truncated-dimension candidate search followed by full-vector rerank."""
+        candidate_ids, _ = index.search(query_embedding, n_results * RERANK_CANDIDATE_MULTIPLIER)
+        if not candidate_ids:
             return []
 
-        # Generate query embedding
-        query_embedding = self.embeddings.embed_query(query)
+        candidates = collection.get(
+            ids=candidate_ids,
+            include=['embeddings', 'documents', 'metadatas'],
+        )
+
+        results = []
+        for i, distance in rerank_with_full_vectors(query_embedding, candidates, n_results):
+            result = {
+                'text': candidates['documents'][i],
+                'metadata': candidates['metadatas'][i],
+                'distance': distance,
+                'id': candidates['ids'][i],
+            }
+            if include_embeddings:
+                result['embedding'] = candidates['embeddings'][i]
+            results.append(result)
+
+        return results
+
+    def _search(
+        self,
+        collection,
+        query_embedding: List[float],
+        n_results: int,
+        filter_metadata: Optional[Dict] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Nearest-neighbour search over a collection.
+
+        Uses the truncated two-stage index when enabled (and no metadata filter
+        is given), otherwise a direct ChromaDB query. Paper metadata is joined
+        onto the results from the paper registry.
+        """
+        if self.index_mode == "truncated" and filter_metadata is None:
+            index = self._get_truncated_index(collection)
+            if index is not None:
+                return self.papers.hydrate(self._search_truncated(
+                    collection, index, query_embedding, n_results, include_embeddings
+                ))
+
+        include = ['documents', 'metadatas', 'distances']
+        if include_embeddings:
+            include.append('embeddings')
 
-        # Query collection
         results = collection.query(
             query_embeddings=[query_embedding],
-            n_results=top_k,
+            n_results=n_results,
             where=filter_metadata,
+            include=include,
         )
 
         # Format results
         formatted_results = []
         if results['documents']:
             for i in range(len(results['documents'][0])):
-                formatted_results.append({
+                result = {
                     'text': results['documents'][0][i],
                     'metadata': results['metadatas'][0][i],
                     'distance': results['distances'][0][i],
                     'id': results['ids'][0][i],
-                })
+                }
+                if include_embeddings:
+                    result['embedding'] = results['embeddings'][0][i]
+                formatted_results.append(result)
+
+        return self.papers.hydrate(formatted_results)
+
+    def _diversify(
+        self,
+        query_embedding: List[float],
+        candidates: List[Dict[str, Any]],
+        top_k: int,
+        max_per_paper: Optional[int] = MAX_CHUNKS_PER_PAPER
+    ) -> List[Dict[str, Any]]:
+        """Select top_k candidates by MMR with a per-paper cap."""
+        if len(candidates) <= 1:
+            return candidates[:top_k]
+
+        order = mmr_select(
+            query_embedding,
+            [c['embedding'] for c in candidates],
+            top_k,
+            lambda_mult=MMR_LAMBDA,
+            group_keys=[paper_key(c['metadata']) for c in candidates],
+            max_per_group=max_per_paper,
+        )
+        return [candidates[i] for i in order]
+
+    def query_collection(
+        self,
+        query: str,
+        collection_name: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        diversify: bool = True,
+        max_per_paper: Optional[int] = MAX_CHUNKS_PER_PAPER,
+        expand_neighbors: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Query a specific ChromaDB collection.
+
+        Args:
+            query: Query string
+            collection_name: Name of collection to query
+            top_k: Number of results to return
+            filter_metadata: Optional metadata filters
+            diversify: Re-select a wider candidate set by MMR so one paper
+                cannot fill every slot (False = raw nearest neighbours)
+            max_per_paper: Maximum chunks per paper when diversifying (None = no cap)
+            expand_neighbors: Add the ±n neighbouring chunks of each text hit
+                (fetched in one get; marked with 'expanded_from')
+
+        Returns:
+            List of results with text, metadata, and distance
+        """
+        with self._span(collection_name, "total"):
+            entry = self._query_collection_entry(
+                query, collection_name, top_k, filter_metadata, diversify, max_per_paper, expand_neighbors
+            )
+        if entry is None:
+            return []
+
+        # Copies, so callers can't mutate cached results
+        return [dict(result) for result in entry['results']]
+
+    def get_collection(self, collection_name: str):
+        """ChromaDB collection currently behind a (possibly aliased) collection name."""
+        return get_shared_collection(self.vector_db_dir, self.aliases.resolve(collection_name))
+
+    def _cache_key(
+        self,
+        collection_name: str,
+        top_k: int,
+        filter_metadata: Optional[Dict],
+        diversify: bool,
+        max_per_paper: Optional[int],
+        expand_neighbors: int
+    ) -> tuple:
+        """Result cache partition for a request shape (and the collection version serving it)."""
+        return (
+            collection_name,
+            top_k,
+            json.dumps(filter_metadata, sort_keys=True) if filter_metadata else None,
+            diversify,
+            max_per_paper,
+            expand_neighbors,
+            self.index_mode,
+            self.aliases.resolve(collection_name),
+        )
+
+    def _query_collection_entry(
+        self,
+        query: str,
+        collection_name: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        diversify: bool = True,
+        max_per_paper: Optional[int] = MAX_CHUNKS_PER_PAPER,
+        expand_neighbors: int = 0,
+        query_embedding: Optional[List[float]] = None,
+        cache_source: str = "query"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run (or serve from cache) a collection query.
 
-        return formatted_results
+        Lookup order: exact query text, then a semantically similar cached
+        query, then a real search whose results are cached.
+
+        Args:
+            query_embedding: Precomputed query embedding (None = embed here)
+            cache_source: Source recorded on a new cache entry; prefetch
+                lookups are not counted in the hit statistics
+
+        Returns:
+            Result cache entry ({'results', 'formatted', ...}), or None if the
+            collection does not exist
+        """
+        partition_key = self._cache_key(
+            collection_name, top_k, filter_metadata, diversify, max_per_paper, expand_neighbors
+        )
+
+        record = cache_source != PREFETCH_SOURCE
+
+        entry = self.result_cache.lookup_exact(partition_key, query, record=record)
+        if entry is not None:
+            return entry
+
+        try:
+            collection = self.get_collection(collection_name)
+        except Exception as e:
+            print(f"Error: Collection '{collection_name}' not found: {e}")
+            return None
+
+        # Generate query embedding
+        if query_embedding is None:
+            with self._span(collection_name, "embed", record):
+                query_embedding = self._embed_query(query)
+
+        entry = self.result_cache.lookup_similar(partition_key, query_embedding, record=record)
+        if entry is not None:
+            return entry
+
+        if diversify:
+            with self._span(collection_name, "search", record):
+                candidates = self._search(
+                    collection,
+                    query_embedding,
+                    top_k * MMR_FETCH_MULTIPLIER,
+                    filter_metadata,
+                    include_embeddings=True,
+                )
+            with self._span(collection_name, "post_process", record):
+                results = self._diversify(query_embedding, candidates, top_k, max_per_paper)
+
+                # Embeddings were only needed for MMR; keep payloads small
+                for result in results:
+                    result.pop('embedding', None)
+
+                if expand_neighbors > 0:
+                    results = self._expand_neighbors(collection, results, expand_neighbors)
+        else:
+            with self._span(collection_name, "search", record):
+                results = self._search(collection, query_embedding, top_k, filter_metadata)
+
+            if expand_neighbors > 0:
+                with self._span(collection_name, "post_process", record):
+                    results = self._expand_neighbors(collection, results, expand_neighbors)
+
+        return self.result_cache.put(partition_key, query, query_embedding, results, source=cache_source)
 
     def query_domain(
         self,
         query: str,
         domain: str,
         top_k: int = 5,
-        filter_metadata: Optional[Dict] = None
+        filter_metadata: Optional[Dict] = None,
+        diversify: bool = True,
+        expand_neighbors: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Query papers from a specific domain.
@@ -123,6 +740,8 @@ class RAGQueryEngine:
             domain: Domain name (electrochemistry, membrane_science, biology, nanofluidics)
             top_k: Number of results to return
             filter_metadata: Optional metadata filters
+            diversify: Apply paper-aware MMR diversification
+            expand_neighbors: Add the ±n neighbouring chunks of each text hit
 
         Returns:
             List of results with text, metadata, and distance
@@ -131,30 +750,98 @@ class RAGQueryEngine:
             raise ValueError(f"Invalid domain. Choose from: {list(DOMAINS.keys())}")
 
         collection_name = DOMAINS[domain]
-        return self.query_collection(query, collection_name, top_k, filter_metadata)
+        return self.query_collection(
+            query, collection_name, top_k, filter_metadata, diversify,
+            expand_neighbors=expand_neighbors,
+        )
+
+    async def aquery_collection(
+        self,
+        query: str,
+        collection_name: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        diversify: bool = True,
+        max_per_paper: Optional[int] = MAX_CHUNKS_PER_PAPER,
+        expand_neighbors: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of query_collection.
+
+        The query is embedded with the async embeddings client and the
+        ChromaDB work runs in a bounded executor; caches are shared with
+        the sync path.
+        """
+        partition_key = self._cache_key(
+            collection_name, top_k, filter_metadata, diversify, max_per_paper, expand_neighbors
+        )
+        start = time.perf_counter()
+        entry = self.result_cache.lookup_exact(partition_key, query)
+
+        if entry is None:
+            with self._span(collection_name, "embed"):
+                query_embedding = await self._aembed_query(query)
+            entry = await self._run_in_executor(
+                self._query_collection_entry,
+                query, collection_name, top_k, filter_metadata, diversify, max_per_paper,
+                expand_neighbors, query_embedding=query_embedding,
+            )
+
+        self.latency.record(self._domain_label(collection_name), "total", time.perf_counter() - start)
+        if entry is None:
+            return []
+
+        return [dict(result) for result in entry['results']]
+
+    async def aquery_domain(
+        self,
+        query: str,
+        domain: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        diversify: bool = True,
+        expand_neighbors: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Async variant of query_domain."""
+        if domain not in DOMAINS:
+            raise ValueError(f"Invalid domain. Choose from: {list(DOMAINS.keys())}")
+
+        return await self.aquery_collection(
+            query, DOMAINS[domain], top_k, filter_metadata, diversify,
+            expand_neighbors=expand_neighbors,
+        )
 
     def query_all_domains(
         self,
         query: str,
-        top_k_per_domain: int = 3
+        top_k_per_domain: int = 3,
+        route: bool = True,
+        include_domain: Optional[str] = None,
+        threshold: float = ROUTER_THRESHOLD
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Query across all domains and return results grouped by domain.
+        Query across domains and return results grouped by domain.
 
         Args:
             query: Query string
             top_k_per_domain: Number of results per domain
+            route: Only query the domains whose centroids match the query
+                (False = every domain)
+            include_domain: Always query this domain when routing
+            threshold: Minimum centroid similarity when routing
 
         Returns:
-            Dictionary mapping domain names to results
+            Dictionary mapping the queried domain names to results
         """
-        all_results = {}
+        if route:
+            domains = self.route_query(query, threshold, include_domain)
+        else:
+            domains = [domain for domain in DOMAINS if DOMAINS[domain] is not None]
 
-        for domain, collection_name in DOMAINS.items():
-            if domain == "all":
-                continue
+        all_results = {}
 
-            results = self.query_collection(query, collection_name, top_k_per_domain)
+        for domain in domains:
+            results = self.query_collection(query, DOMAINS[domain], top_k_per_domain)
             all_results[domain] = results
 
         return all_results
@@ -162,14 +849,19 @@ class RAGQueryEngine:
     def format_results_for_llm(
         self,
         results: List[Dict[str, Any]],
-        include_metadata: bool = True
+        include_metadata: bool = True,
+        token_budget: Optional[int] = None
     ) -> str:
         """
         Format query results for LLM consumption.
 
+        With metadata, adjacent chunks of a paper are merged and each paper's
+        citation header is printed once (see context_packer).
+
         Args:
             results: List of query results
             include_metadata: Whether to include metadata in output
+            token_budget: Maximum tokens for the formatted context (None = unlimited)
 
         Returns:
             Formatted string for LLM context
@@ -177,37 +869,210 @@ class RAGQueryEngine:
         if not results:
             return "No relevant information found in the knowledge base."
 
-        formatted = []
-        for i, result in enumerate(results, 1):
-            text = result['text']
-            metadata = result['metadata']
-
-            if include_metadata:
-                # Extract citation metadata
-                citation = metadata.get('citation', 'Citation unavailable')
-                title = metadata.get('title', 'Unknown Title')
-                authors = metadata.get('authors', 'Unknown')
-                year = metadata.get('year', 'n.d.')
-
-                # Format: [Source 1] Authors (Year) - Title
-                #         Citation: Journal (Year), Volume, Pages
-                #         <content>
-                formatted.append(
-                    f"[Source {i}] {authors} ({year}) - {title}\n"
-                    f"Citation: {citation}\n\n{text}\n"
-                )
-            else:
-                formatted.append(f"[{i}] {text}\n")
+        if include_metadata:
+            # Citation headers come from the paper registry (no-op for hydrated results)
+            self.papers.hydrate(results)
+            # Format: [Source 1] Authors (Year) - Title
+            #         Citation: Journal (Year), Volume, Pages
+            #         <merged passages>
+            return pack_results(results, token_budget)
 
+        formatted = [f"[{i}] {result['text']}\n" for i, result in enumerate(results, 1)]
         return "\n---\n".join(formatted)
 
+    def get_context(
+        self,
+        query: str,
+        domain: str,
+        top_k: int = 5,
+        token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+        expand_neighbors: int = 0,
+        filter_metadata: Optional[Dict] = None
+    ) -> str:
+        """
+        Retrieve and pack context for a domain query.
+
+        The packed string is memoized on the result cache entry, so a cache
+        hit also skips formatting.
+
+        Args:
+            query: Query string
+            domain: Domain name
+            top_k: Number of relevant chunks to retrieve
+            token_budget: Maximum tokens of packed evidence (None = unlimited)
+            expand_neighbors: Add the ±n neighbouring chunks of each hit
+            filter_metadata: Optional ChromaDB `where` clause
+                (see metadata_filters.build_metadata_filter)
+
+        Returns:
+            Formatted context string with citations
+        """
+        return self.get_context_details(
+            query, domain, top_k, token_budget, expand_neighbors, filter_metadata
+        )['context']
+
+    def get_context_details(
+        self,
+        query: str,
+        domain: str,
+        top_k: int = 5,
+        token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+        expand_neighbors: int = 0,
+        filter_metadata: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """
+        get_context, plus what was actually returned.
+
+        Returns:
+            {'context', 'num_results', 'num_sources', 'bytes', 'elapsed_ms'}
+        """
+        self._validate_context_domain(domain)
+
+        start = time.perf_counter()
+        details = self._get_context(
+            query, domain, top_k, token_budget, expand_neighbors, filter_metadata=filter_metadata
+        )
+        elapsed = time.perf_counter() - start
+
+        self.latency.record(domain, "total", elapsed)
+        details['elapsed_ms'] = round(elapsed * 1000.0, 1)
+        return details
+
+    async def aget_context(
+        self,
+        query: str,
+        domain: str,
+        top_k: int = 5,
+        token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+        expand_neighbors: int = 0,
+        filter_metadata: Optional[Dict] = None
+    ) -> str:
+        """Async variant of get_context (async embedding, ChromaDB in the executor)."""
+        details = await self.aget_context_details(
+            query, domain, top_k, token_budget, expand_neighbors, filter_metadata
+        )
+        return details['context']
+
+    async def aget_context_details(
+        self,
+        query: str,
+        domain: str,
+        top_k: int = 5,
+        token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+        expand_neighbors: int = 0,
+        filter_metadata: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Async variant of get_context_details."""
+        self._validate_context_domain(domain)
+
+        start = time.perf_counter()
+        query_embedding = None
+        partition_key = self._cache_key(
+            DOMAINS[domain], top_k, filter_metadata, True, MAX_CHUNKS_PER_PAPER, expand_neighbors
+        )
+        if not self.result_cache.contains(partition_key, query) and self._pending_prefetch(partition_key, query) is None:
+            with self.latency.span(domain, "embed"):
+                query_embedding = await self._aembed_query(query)
+
+        details = await self._run_in_executor(
+            self._get_context, query, domain, top_k, token_budget, expand_neighbors, query_embedding,
+            filter_metadata=filter_metadata,
+        )
+        elapsed = time.perf_counter() - start
+
+        self.latency.record(domain, "total", elapsed)
+        details['elapsed_ms'] = round(elapsed * 1000.0, 1)
+        return details
+
+    @staticmethod
+    def _validate_context_domain(domain: str):
+        if domain not in DOMAINS or DOMAINS[domain] is None:
+            raise ValueError(f"Invalid domain. Choose from: {[d for d in DOMAINS if d != 'all']}")
+
+    def _get_context(
+        self,
+        query: str,
+        domain: str,
+        top_k: int,
+        token_budget: Optional[int],
+        expand_neighbors: int,
+        query_embedding: Optional[List[float]] = None,
+        cache_source: str = "query",
+        filter_metadata: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """
+        Shared implementation of get_context/aget_context/prefetch.
+
+        Returns:
+            {'context', 'num_results', 'num_sources', 'bytes'}
+        """
+        self._validate_context_domain(domain)
+
+        # A prefetch of this exact request is running: wait for it instead of repeating it
+        if cache_source != PREFETCH_SOURCE:
+            prefetch = self._pending_prefetch(
+                self._cache_key(DOMAINS[domain], top_k, filter_metadata, True, MAX_CHUNKS_PER_PAPER, expand_neighbors),
+                query,
+            )
+            if prefetch is not None:
+                prefetch.result()  # _prefetch_one never raises
+
+        entry = self._query_collection_entry(
+            query, DOMAINS[domain], top_k, filter_metadata, expand_neighbors=expand_neighbors,
+            query_embedding=query_embedding, cache_source=cache_source,
+        )
+
+        if entry is None or not entry['results']:
+            message = f"No relevant information found in {domain} knowledge base for: {query}"
+            if filter_metadata:
+                message += " (with the requested filters; try widening them)"
+            return {'context': message, 'num_results': 0, 'num_sources': 0, 'bytes': 0}
+
+        formatted = entry['formatted'].get(token_budget)
+        if formatted is None:
+            with self._span(DOMAINS[domain], "format", cache_source != PREFETCH_SOURCE):
+                formatted = self.format_results_for_llm(entry['results'], token_budget=token_budget)
+            entry['formatted'][token_budget] = formatted
+
+        return {
+            'context': formatted,
+            'num_results': len(entry['results']),
+            'num_sources': formatted.count("[Source "),
+            'bytes': len(formatted.encode('utf-8')),
+        }
+
+
+# Shared engine instance
+_query_engine = None
+
+
+def get_query_engine() -> RAGQueryEngine:
+    """Get or create the shared RAG query engine (keeps indexes loaded between calls)."""
+    global _query_engine
+    if _query_engine is None:
+        _query_engine = RAGQueryEngine()
+    return _query_engine
+
+
+def set_query_engine(engine: Optional[RAGQueryEngine]):
+    """
+    Replace the shared engine used by the convenience functions.
+
+    Lets tools such as the load tester inject an engine with an offline
+    embeddings backend; None resets to a lazily created default engine.
+    """
+    global _query_engine
+    _query_engine = engine
+
 
 # Convenience functions for direct use
 def query_papers(
     query: str,
     domain: str = "all",
     top_k: int = 5,
-    format_for_llm: bool = False
+    format_for_llm: bool = False,
+    route: bool = True,
+    include_domain: Optional[str] = None
 ) -> Any:
     """
     Convenient function to query papers.
@@ -217,19 +1082,25 @@ def query_papers(
         domain: Domain to search (or 'all' for all domains)
         top_k: Number of results
         format_for_llm: Whether to format results for LLM
+        route: With domain='all', only search the domains the router
+            matches to the query
+        include_domain: With domain='all', always search this domain
 
     Returns:
         Query results (formatted string if format_for_llm=True, else list/dict)
     """
-    engine = RAGQueryEngine()
+    engine = get_query_engine()
 
     if domain == "all":
-        results = engine.query_all_domains(query, top_k_per_domain=top_k)
+        results = engine.query_all_domains(
+            query, top_k_per_domain=top_k, route=route, include_domain=include_domain
+        )
         if format_for_llm:
             # Flatten and format all results
             all_results_flat = []
             for domain_name, domain_results in results.items():
                 all_results_flat.extend(domain_results)
+            all_results_flat.sort(key=lambda r: r['distance'])
             return engine.format_results_for_llm(all_results_flat)
         return results
     else:
@@ -239,7 +1110,14 @@ def query_papers(
         return results
 
 
-def get_context_for_agent(query: str, domain: str, top_k: int = 5) -> str:
+def get_context_for_agent(
+    query: str,
+    domain: str,
+    top_k: int = 5,
+    token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+    expand_neighbors: int = 0,
+    filter_metadata: Optional[Dict] = None
+) -> str:
     """
     Get formatted context for an AI agent from the knowledge base.
 
@@ -249,35 +1127,76 @@ def get_context_for_agent(query: str, domain: str, top_k: int = 5) -> str:
         query: What the agent wants to know
         domain: Agent's domain (electrochemistry, membrane_science, biology, nanofluidics)
         top_k: Number of relevant chunks to retrieve
+        token_budget: Maximum tokens of packed evidence (None = unlimited)
+        expand_neighbors: Add the ±n neighbouring chunks of each hit
+        filter_metadata: Optional ChromaDB `where` clause (content type, year range, paper)
 
     Returns:
         Formatted context string with citations
     """
-    engine = RAGQueryEngine()
-    results = engine.query_domain(query, domain, top_k)
-
-    if not results:
-        return f"No relevant information found in {domain} knowledge base for: {query}"
-
-    # Format with citations
-    context_parts = []
-    for i, result in enumerate(results, 1):
-        text = result['text']
-        metadata = result['metadata']
-
-        # Extract citation metadata
-        citation = metadata.get('citation', 'Citation unavailable')
-        title = metadata.get('title', 'Unknown Title')
-        authors = metadata.get('authors', 'Unknown')
-        year = metadata.get('year', 'n.d.')
-
-        # Format with full citation info
-        context_parts.append(
-            f"[Source {i}] {authors} ({year}) - {title}\n"
-            f"Citation: {citation}\n\n{text}"
-        )
+    engine = get_query_engine()
+    return engine.get_context(
+        query, domain, top_k, token_budget=token_budget, expand_neighbors=expand_neighbors,
+        filter_metadata=filter_metadata,
+    )
+
+
+async def aget_context_for_agent(
+    query: str,
+    domain: str,
+    top_k: int = 5,
+    token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+    expand_neighbors: int = 0,
+    filter_metadata: Optional[Dict] = None
+) -> str:
+    """
+    Async variant of get_context_for_agent for asyncio callers.
+
+    Shares the engine and its caches with the sync path.
+    """
+    engine = get_query_engine()
+    return await engine.aget_context(
+        query, domain, top_k, token_budget=token_budget, expand_neighbors=expand_neighbors,
+        filter_metadata=filter_metadata,
+    )
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit rates and staleness bounds of the shared engine's query caches."""
+    return get_query_engine().get_cache_stats()
+
+
+def get_latency_stats(domain: Optional[str] = None) -> Dict[str, Any]:
+    """Per-stage retrieval latency percentiles of the shared engine (optionally one domain)."""
+    return get_query_engine().get_latency_stats(domain)
+
+
+def prefetch_context_for_agent(
+    queries: List[str],
+    domain: str,
+    top_k: int = 5,
+    token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET
+) -> List[Future]:
+    """
+    Warm the shared engine's caches for an agent's anticipated queries.
+
+    Returns immediately; retrieval runs in the background.
+
+    Args:
+        queries: Anticipated queries (e.g. discussion questions, planned evidence)
+        domain: Agent's domain
+        top_k: Number of chunks per query
+        token_budget: Token budget of the packed context to memoize
+
+    Returns:
+        Futures of the submitted prefetches
+    """
+    return get_query_engine().prefetch(queries, domain, top_k, token_budget=token_budget)
+
 
-    return "\n\n---\n\n".join(context_parts)
+def get_prefetch_stats(domain: Optional[str] = None) -> Dict[str, Any]:
+    """Prefetch activity and hit rate of the shared engine (optionally per domain)."""
+    return get_query_engine().get_prefetch_stats(domain)
 
 
 # CLI interface for testing
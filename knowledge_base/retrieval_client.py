@@ -0,0 +1,181 @@
+"""
+Retrieval Service Client
+
+Thin stdlib-only client for knowledge_base.retrieval_service. Importing it
+does not import chromadb or langchain, so callers that go through the service
+skip the knowledge base cold start entirely.
+
+run_rag_query uses the service automatically when RAG_SERVICE_URL is set.
+
+Usage:
+    from knowledge_base.retrieval_client import RetrievalClient
+
+    client = RetrievalClient("http://127.0.0.1:8765")
+    details = client.get_context_details("EDL overlap", "nanofluidics")
+
+    # CLI (same arguments as query_rag.py)
+    python -m knowledge_base.retrieval_client "ion selectivity mechanisms" nanofluidics 5
+"""
+
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import List, Dict, Any, Optional
+
+
+# Configuration
+SERVICE_URL_ENV = "RAG_SERVICE_URL"
+REQUEST_TIMEOUT = 60.0  # Seconds; covers a cold embedding + search on the service
+
+
+class RetrievalServiceError(RuntimeError):
+    """The retrieval service was unreachable or rejected a request."""
+
+
+class RetrievalClient:
+    """HTTP client for the local retrieval service."""
+
+    def __init__(self, base_url: str, timeout: float = REQUEST_TIMEOUT):
+        """
+        Initialize client.
+
+        Args:
+            base_url: Service URL, e.g. http://127.0.0.1:8765
+            timeout: Per-request timeout in seconds
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            headers={"Content-Type": "application/json"},
+            method="POST" if data is not None else "GET",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", str(e))
+            except Exception:
+                message = str(e)
+            if e.code == 400:
+                raise ValueError(message) from e
+            raise RetrievalServiceError(message) from e
+        except (urllib.error.URLError, OSError) as e:
+            raise RetrievalServiceError(f"Retrieval service unreachable at {self.base_url}: {e}") from e
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("/health")
+
+    def stats(self, domain: Optional[str] = None) -> Dict[str, Any]:
+        return self._request("/stats" + (f"?domain={domain}" if domain else ""))
+
+    def query_domain(
+        self,
+        query: str,
+        domain: str,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        diversify: bool = True,
+        expand_neighbors: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Same as RAGQueryEngine.query_domain, served remotely."""
+        return self._request("/query_domain", {
+            "query": query, "domain": domain, "top_k": top_k,
+            "filter_metadata": filter_metadata, "diversify": diversify,
+            "expand_neighbors": expand_neighbors,
+        })["results"]
+
+    def query_many(self, requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Several query_domain requests in one round trip.
+
+        Args:
+            requests: query_domain keyword dicts ({query, domain, top_k, ...})
+
+        Returns:
+            Results per request, in order
+        """
+        return self._request("/query_many", {"requests": requests})["results"]
+
+    def get_context_details(
+        self,
+        query: str,
+        domain: str,
+        top_k: int = 5,
+        token_budget: Optional[int] = None,
+        expand_neighbors: int = 0,
+        filter_metadata: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Same as RAGQueryEngine.get_context_details, served remotely."""
+        payload = {
+            "query": query, "domain": domain, "top_k": top_k,
+            "expand_neighbors": expand_neighbors, "filter_metadata": filter_metadata,
+        }
+        if token_budget is not None:
+            payload["token_budget"] = token_budget
+        return self._request("/get_context", payload)
+
+    def get_context(self, query: str, domain: str, top_k: int = 5, **kwargs) -> str:
+        """Same as get_context_for_agent, served remotely."""
+        return self.get_context_details(query, domain, top_k, **kwargs)["context"]
+
+    def prefetch(
+        self,
+        queries: List[str],
+        domain: str,
+        top_k: int = 5,
+        token_budget: Optional[int] = None
+    ) -> int:
+        """Warm the service's caches; returns the number of prefetches submitted."""
+        payload = {"queries": queries, "domain": domain, "top_k": top_k}
+        if token_budget is not None:
+            payload["token_budget"] = token_budget
+        return self._request("/prefetch", payload)["submitted"]
+
+
+# Client for RAG_SERVICE_URL (None when the variable is unset)
+_retrieval_client = None
+
+
+def get_retrieval_client() -> Optional[RetrievalClient]:
+    """Get the client for RAG_SERVICE_URL, or None to query in-process."""
+    global _retrieval_client
+    url = os.getenv(SERVICE_URL_ENV)
+    if not url:
+        return None
+    if _retrieval_client is None or _retrieval_client.base_url != url.rstrip("/"):
+        _retrieval_client = RetrievalClient(url)
+    return _retrieval_client
+
+
+def main():
+    """CLI interface mirroring query_rag.py, without the local cold start."""
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m knowledge_base.retrieval_client <query> [domain] [top_k]")
+        print(f"\nRequires a running service and {SERVICE_URL_ENV} (see knowledge_base.retrieval_service)")
+        sys.exit(1)
+
+    client = get_retrieval_client()
+    if client is None:
+        print(f"✗ {SERVICE_URL_ENV} is not set")
+        sys.exit(1)
+
+    query = sys.argv[1]
+    domain = sys.argv[2] if len(sys.argv) > 2 else "nanofluidics"
+    top_k = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    details = client.get_context_details(query, domain, top_k)
+    print(details["context"])
+    print(f"\n[{details['num_results']} results, {details['bytes']:,} bytes, {details['elapsed_ms']:.0f} ms on service]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Retrieval Latency Metrics
+
+Per-stage timing for knowledge base queries, so a slow tool call can be
+attributed to embedding, the vector search, post-processing (diversification,
+neighbour expansion) or formatting.
+
+Samples are kept in a bounded window per (domain, stage) and summarized as
+p50/p95/p99 on demand.
+
+Usage:
+    from knowledge_base.retrieval_metrics import LatencyRecorder
+
+    recorder = LatencyRecorder()
+    with recorder.span("nanofluidics", "search"):
+        results = collection.query(...)
+
+    recorder.get_stats("nanofluidics")
+    # {'search': {'count': 1, 'p50_ms': 41.2, 'p95_ms': 41.2, ...}}
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Deque, Tuple
+import numpy as np
+
+
+# Configuration
+STAGES = ("embed", "search", "post_process", "format", "total")
+LATENCY_WINDOW = 2048  # Most recent samples kept per (domain, stage)
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyRecorder:
+    """Thread-safe per-domain, per-stage latency windows."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        """
+        Initialize recorder.
+
+        Args:
+            window: Samples kept per (domain, stage); older samples are dropped
+        """
+        self.window = window
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, domain: str, stage: str, seconds: float):
+        """Add one sample."""
+        key = (domain, stage)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    @contextmanager
+    def span(self, domain: str, stage: str):
+        """Time the enclosed block as one sample of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(domain, stage, time.perf_counter() - start)
+
+    @staticmethod
+    def _summarize(samples, count: int) -> Dict[str, Any]:
+        values = np.asarray(samples, dtype=np.float64) * 1000.0
+        summary = {
+            "count": count,
+            "window": len(values),
+            "mean_ms": round(float(values.mean()), 2),
+            "max_ms": round(float(values.max()), 2),
+        }
+        for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            summary[f"p{p}_ms"] = round(float(value), 2)
+        return summary
+
+    def get_stats(self, domain: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Latency percentiles.
+
+        Args:
+            domain: Restrict to one domain (None = all domains)
+
+        Returns:
+            {stage: summary} for one domain, or {domain: {stage: summary}}
+        """
+        with self._lock:
+            snapshot = {key: (list(samples), self._counts[key]) for key, samples in self._samples.items()}
+
+        by_domain: Dict[str, Dict[str, Any]] = {}
+        for (sample_domain, stage), (samples, count) in snapshot.items():
+            if domain is not None and sample_domain != domain:
+                continue
+            by_domain.setdefault(sample_domain, {})[stage] = self._summarize(samples, count)
+
+        # Stable stage order: known stages first
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        for sample_domain, stages in by_domain.items():
+            by_domain[sample_domain] = dict(
+                sorted(stages.items(), key=lambda item: (order.get(item[0], len(order)), item[0]))
+            )
+
+        if domain is not None:
+            return by_domain.get(domain, {})
+        return by_domain
+
+    def reset(self):
+        """Drop all samples."""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
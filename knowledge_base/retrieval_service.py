@@ -0,0 +1,247 @@
+"""
+Local Retrieval Service
+
+A long-lived localhost HTTP daemon that keeps one RAGQueryEngine warm
+(chromadb/langchain imported, SQLite store open, HNSW/truncated/adjacency
+indexes loaded, caches populated) and serves it to every symposium process
+and CLI on the box, instead of each paying the cold start and holding its
+own copy of the indexes.
+
+Endpoints (JSON in/out):
+    GET  /health        liveness, uptime, request count
+    GET  /stats         cache, latency and prefetch statistics (?domain=...)
+    POST /query_domain  {query, domain, top_k, filter_metadata, diversify, expand_neighbors}
+    POST /query_many    {requests: [<query_domain body>, ...]}
+    POST /get_context   {query, domain, top_k, token_budget, expand_neighbors, filter_metadata}
+    POST /prefetch      {queries, domain, top_k, token_budget}
+
+Usage:
+    python -m knowledge_base.retrieval_service --port 8765 --warm
+    export RAG_SERVICE_URL=http://127.0.0.1:8765   # run_rag_query now uses the service
+"""
+
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs
+
+from knowledge_base.query_rag import get_query_engine, DOMAINS
+from knowledge_base.context_packer import DEFAULT_TOKEN_BUDGET
+
+
+# Configuration
+DEFAULT_HOST = "127.0.0.1"  # Local only: the service has no authentication
+DEFAULT_PORT = 8765
+MAX_REQUEST_BYTES = 1_000_000
+MAX_BATCH_QUERIES = 64  # Requests per /query_many call
+
+
+def _json_default(value):
+    """Serialize numpy scalars/arrays found in results."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class RetrievalService:
+    """Request handling on top of the shared engine (transport-independent)."""
+
+    def __init__(self, engine=None):
+        self.engine = engine if engine is not None else get_query_engine()
+        self.started_at = time.time()
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _count(self, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "errors": self.errors,
+            "index_mode": self.engine.index_mode,
+        }
+
+    def stats(self, domain: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "cache": self.engine.get_cache_stats(),
+            "latency": self.engine.get_latency_stats(domain),
+            "prefetch": self.engine.get_prefetch_stats(domain),
+        }
+
+    def query_domain(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        results = self.engine.query_domain(
+            body["query"],
+            body["domain"],
+            int(body.get("top_k", 5)),
+            filter_metadata=body.get("filter_metadata"),
+            diversify=bool(body.get("diversify", True)),
+            expand_neighbors=int(body.get("expand_neighbors", 0)),
+        )
+        return {"results": results}
+
+    def query_many(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        requests = body.get("requests", [])
+        if len(requests) > MAX_BATCH_QUERIES:
+            raise ValueError(f"At most {MAX_BATCH_QUERIES} requests per batch")
+
+        # Fan out over the engine's bounded executor
+        responses = list(self.engine._executor.map(self.query_domain, requests))
+        return {"results": [response["results"] for response in responses]}
+
+    def get_context(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return self.engine.get_context_details(
+            body["query"],
+            body["domain"],
+            int(body.get("top_k", 5)),
+            token_budget=body.get("token_budget", DEFAULT_TOKEN_BUDGET),
+            expand_neighbors=int(body.get("expand_neighbors", 0)),
+            filter_metadata=body.get("filter_metadata"),
+        )
+
+    def prefetch(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        futures = self.engine.prefetch(
+            body.get("queries", []),
+            body["domain"],
+            int(body.get("top_k", 5)),
+            token_budget=body.get("token_budget", DEFAULT_TOKEN_BUDGET),
+        )
+        return {"submitted": len(futures)}
+
+    def warm(self):
+        """Open every collection and load its side indexes before serving."""
+        for domain, collection_name in DOMAINS.items():
+            if collection_name is None:
+                continue
+            try:
+                collection = self.engine.get_collection(collection_name)
+            except Exception:
+                print(f"  ⚠ {domain}: collection not found")
+                continue
+            self.engine._get_adjacency_index(collection)
+            if self.engine.index_mode == "truncated":
+                self.engine._get_truncated_index(collection)
+            print(f"  ✓ {domain}: {collection.count()} chunks")
+
+
+def _make_handler(service: RetrievalService):
+    routes = {
+        "/query_domain": service.query_domain,
+        "/query_many": service.query_many,
+        "/get_context": service.get_context,
+        "/prefetch": service.prefetch,
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive for clients that reuse connections
+
+        def _send(self, status: int, payload: Dict[str, Any]):
+            body = json.dumps(payload, default=_json_default).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                self._send(200, service.health())
+            elif url.path == "/stats":
+                domain = parse_qs(url.query).get("domain", [None])[0]
+                try:
+                    payload = service.stats(domain)
+                except (ValueError, KeyError) as e:
+                    service._count(error=True)
+                    self._send(400, {"error": f"{type(e).__name__}: {e}"})
+                    return
+                except Exception as e:
+                    service._count(error=True)
+                    self._send(500, {"error": f"{type(e).__name__}: {e}"})
+                    return
+                self._send(200, payload)
+            else:
+                self._send(404, {"error": f"Unknown endpoint {url.path}"})
+
+        def do_POST(self):
+            handler = routes.get(urlparse(self.path).path)
+            if handler is None:
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+                return
+
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_REQUEST_BYTES:
+                self._send(413, {"error": "Request too large"})
+                return
+
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                payload = handler(body)
+            except (ValueError, KeyError, TypeError) as e:
+                service._count(error=True)
+                self._send(400, {"error": f"{type(e).__name__}: {e}"})
+                return
+            except Exception as e:
+                service._count(error=True)
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+
+            service._count()
+            self._send(200, payload)
+
+        def log_message(self, format, *args):
+            pass  # Per-request access logs would drown the symposium output
+
+    return Handler
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, warm: bool = False):
+    """
+    Run the retrieval service until interrupted.
+
+    Args:
+        host: Interface to bind (keep it local)
+        port: TCP port
+        warm: Load collections and side indexes before accepting requests
+    """
+    service = RetrievalService()
+
+    if warm:
+        print("Warming indexes...")
+        service.warm()
+
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    server.daemon_threads = True
+    print(f"✓ Retrieval service listening on http://{host}:{port}")
+    print(f"  export RAG_SERVICE_URL=http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down retrieval service")
+    finally:
+        server.server_close()
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Long-lived local retrieval service")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--warm", action="store_true", help="Load collections and indexes at startup")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.warm)
+
+
+if __name__ == "__main__":
+    main()
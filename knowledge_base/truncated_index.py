@@ -0,0 +1,533 @@
+"""
+Truncated-Dimension Index for Two-Stage Retrieval
+
+text-embedding-3 models are trained so that a prefix of each embedding is itself
+a usable embedding once renormalized. This module builds a compact in-memory
+index from the first N dimensions of every stored chunk vector (optionally
+int8-quantized), searches it to collect a wide candidate set, and leaves the
+final ranking to the full-dimension vectors already stored in ChromaDB.
+
+Usage:
+    # Build (migrate) truncated indexes for every domain collection
+    # (int8 by default, matching RAGQueryEngine; --no-int8 keeps float32)
+    python -m knowledge_base.truncated_index build --dims 256
+
+    # Compare recall, latency and memory against the full ChromaDB index
+    python -m knowledge_base.truncated_index report --dims 256
+
+    # Query with the truncated index (RAGQueryEngine picks it up)
+    RAG_INDEX_MODE=truncated python -m knowledge_base.query_rag "EDL overlap" nanofluidics
+"""
+
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+
+# Configuration
+DEFAULT_TRUNCATED_DIMS = 256
+DEFAULT_TRUNCATED_INT8 = True  # Build and load the int8 variant unless told otherwise
+INDEX_SUBDIR = "truncated_index"
+EXPORT_BATCH_SIZE = 1000  # Rows fetched per collection.get() while building
+SEARCH_BLOCK_ROWS = 8192  # Rows scored per block (bounds int8 -> float32 temporaries)
+
+
+def truncate_and_normalize(vectors: np.ndarray, dims: int) -> np.ndarray:
+    """
+    Keep the first `dims` components of each vector and renormalize to unit length.
+
+    Args:
+        vectors: Array of shape (n, d) or (d,)
+        dims: Number of leading dimensions to keep
+
+    Returns:
+        float32 array of shape (n, dims) or (dims,)
+    """
+    prefix = np.asarray(vectors, dtype=np.float32)[..., :dims]
+    norms = np.linalg.norm(prefix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return prefix / norms
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization.
+
+    Args:
+        vectors: float32 array of shape (n, d)
+
+    Returns:
+        Tuple of (int8 codes, float32 per-row scales) so that codes * scale ≈ vectors
+    """
+    max_abs = np.abs(vectors).max(axis=1)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    codes = np.round(vectors / scales[:, None]).clip(-127, 127).astype(np.int8)
+    return codes, scales
+
+
+def export_collection_embeddings(collection, batch_size: int = EXPORT_BATCH_SIZE) -> Tuple[List[str], np.ndarray]:
+    """
+    Export all ids and full embeddings from a ChromaDB collection.
+
+    Args:
+        collection: ChromaDB collection
+        batch_size: Rows per get() call
+
+    Returns:
+        Tuple of (ids, float32 embedding matrix)
+    """
+    total = collection.count()
+    ids: List[str] = []
+    blocks: List[np.ndarray] = []
+
+    for offset in range(0, total, batch_size):
+        batch = collection.get(include=['embeddings'], limit=batch_size, offset=offset)
+        if not batch['ids']:
+            break
+        ids.extend(batch['ids'])
+        blocks.append(np.asarray(batch['embeddings'], dtype=np.float32))
+
+    if not blocks:
+        return [], np.zeros((0, 0), dtype=np.float32)
+
+    return ids, np.vstack(blocks)
+
+
+class TruncatedIndex:
+    """
+    Compact first-stage index over truncated (and optionally int8) embeddings.
+
+    Only the truncated prefix is held in memory; full vectors stay in ChromaDB
+    and are fetched for the candidate set at re-scoring time.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        ids: List[str],
+        vectors: np.ndarray,
+        dims: int,
+        scales: Optional[np.ndarray] = None,
+        source_count: Optional[int] = None,
+        source_id: Optional[str] = None
+    ):
+        """
+        Initialize truncated index.
+
+        Args:
+            collection_name: ChromaDB collection the index was built from
+            ids: Document IDs, row-aligned with vectors
+            vectors: (n, dims) float32 unit vectors, or int8 codes when scales is given
+            dims: Number of leading dimensions kept
+            scales: Per-row dequantization scales for int8 codes (None = float32)
+            source_count: Collection size at build time (used for staleness checks)
+            source_id: ChromaDB id of the collection at build time (changes when
+                the collection is deleted and re-ingested under the same name)
+        """
+        self.collection_name = collection_name
+        self.ids = list(ids)
+        self.vectors = vectors
+        self.dims = dims
+        self.scales = scales
+        self.source_count = source_count if source_count is not None else len(self.ids)
+        self.source_id = source_id
+
+    @property
+    def quantized(self) -> bool:
+        """Whether vectors are stored as int8 codes."""
+        return self.scales is not None
+
+    @property
+    def nbytes(self) -> int:
+        """In-memory size of the vector payload in bytes."""
+        size = self.vectors.nbytes
+        if self.scales is not None:
+            size += self.scales.nbytes
+        return size
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def is_stale(self, collection) -> bool:
+        """
+        Whether the index no longer matches the collection.
+
+        A re-ingest can leave the size unchanged, so the collection's name and
+        ChromaDB id are compared as well as its count. Indexes saved without an
+        id are treated as stale.
+        """
+        return (
+            self.collection_name != collection.name
+            or self.source_id is None
+            or self.source_id != str(collection.id)
+            or self.source_count != collection.count()
+        )
+
+    @classmethod
+    def build(
+        cls,
+        collection,
+        dims: int = DEFAULT_TRUNCATED_DIMS,
+        quantize: bool = DEFAULT_TRUNCATED_INT8
+    ) -> "TruncatedIndex":
+        """
+        Build a truncated index from a ChromaDB collection.
+
+        Args:
+            collection: ChromaDB collection with stored embeddings
+            dims: Number of leading dimensions to keep
+            quantize: Whether to store int8 codes instead of float32
+
+        Returns:
+            TruncatedIndex instance
+        """
+        ids, full = export_collection_embeddings(collection)
+        if len(ids) == 0:
+            return cls(collection.name, [], np.zeros((0, dims), dtype=np.float32), dims,
+                       source_count=0, source_id=str(collection.id))
+
+        prefix = truncate_and_normalize(full, dims)
+        scales = None
+        if quantize:
+            prefix, scales = quantize_int8(prefix)
+
+        return cls(collection.name, ids, prefix, dims, scales, source_count=len(ids), source_id=str(collection.id))
+
+    def search(self, query_embedding: List[float], n_candidates: int) -> Tuple[List[str], np.ndarray]:
+        """
+        Return the n best candidates by truncated cosine similarity.
+
+        Args:
+            query_embedding: Full-dimension query embedding
+            n_candidates: Number of candidates to return
+
+        Returns:
+            Tuple of (candidate ids, similarity scores), best first
+        """
+        if len(self.ids) == 0:
+            return [], np.zeros(0, dtype=np.float32)
+
+        query = truncate_and_normalize(np.asarray(query_embedding), self.dims)
+        scores = np.empty(len(self.ids), dtype=np.float32)
+
+        for start in range(0, len(self.ids), SEARCH_BLOCK_ROWS):
+            block = self.vectors[start:start + SEARCH_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+
+        if self.scales is not None:
+            scores *= self.scales
+
+        n = min(n_candidates, len(scores))
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top])]
+
+        return [self.ids[i] for i in top], scores[top]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def index_path(vector_db_dir: Path, collection_name: str, dims: int, quantize: bool) -> Path:
+        """Location of the on-disk index file for a collection."""
+        suffix = "_int8" if quantize else ""
+        return Path(vector_db_dir) / INDEX_SUBDIR / f"{collection_name}_d{dims}{suffix}.npz"
+
+    def save(self, vector_db_dir: Path) -> Path:
+        """
+        Save index next to the vector database.
+
+        Args:
+            vector_db_dir: Vector database directory
+
+        Returns:
+            Path of the written file
+        """
+        path = self.index_path(vector_db_dir, self.collection_name, self.dims, self.quantized)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays = {
+            "ids": np.asarray(self.ids, dtype=str),
+            "vectors": self.vectors,
+            "dims": np.asarray(self.dims),
+            "source_count": np.asarray(self.source_count),
+            "collection_name": np.asarray(self.collection_name),
+        }
+        if self.source_id is not None:
+            arrays["source_id"] = np.asarray(self.source_id)
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+
+        np.savez(path, **arrays)
+        return path
+
+    @classmethod
+    def load(
+        cls,
+        vector_db_dir: Path,
+        collection_name: str,
+        dims: int = DEFAULT_TRUNCATED_DIMS,
+        quantize: bool = DEFAULT_TRUNCATED_INT8
+    ) -> Optional["TruncatedIndex"]:
+        """
+        Load a previously built index.
+
+        Args:
+            vector_db_dir: Vector database directory
+            collection_name: Collection name
+            dims: Truncated dimension the index was built with
+            quantize: Whether the int8 variant should be loaded
+
+        Returns:
+            TruncatedIndex, or None if no index file exists
+        """
+        path = cls.index_path(vector_db_dir, collection_name, dims, quantize)
+        if not path.exists():
+            return None
+
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                collection_name=str(data["collection_name"]) if "collection_name" in data.files else collection_name,
+                ids=data["ids"].tolist(),
+                vectors=data["vectors"],
+                dims=int(data["dims"]),
+                scales=data["scales"] if "scales" in data.files else None,
+                source_count=int(data["source_count"]),
+                source_id=str(data["source_id"]) if "source_id" in data.files else None,
+            )
+
+
+def rerank_with_full_vectors(
+    query_embedding: List[float],
+    candidates: Dict[str, Any],
+    top_k: int
+) -> List[Tuple[int, float]]:
+    """
+    Re-score candidates with their full-dimension vectors.
+
+    Distances are squared L2, matching ChromaDB's default collection space so
+    results are interchangeable with a direct collection.query().
+
+    Args:
+        query_embedding: Full-dimension query embedding
+        candidates: Result of collection.get(ids=..., include=['embeddings', ...])
+        top_k: Number of results to keep
+
+    Returns:
+        List of (row index into candidates, distance) pairs, best first
+    """
+    if not candidates['ids']:
+        return []
+
+    query = np.asarray(query_embedding, dtype=np.float32)
+    full = np.asarray(candidates['embeddings'], dtype=np.float32)
+    distances = ((full - query) ** 2).sum(axis=1)
+
+    order = np.argsort(distances)[:top_k]
+    return [(int(i), float(distances[i])) for i in order]
+
+
+# ----------------------------------------------------------------------
+# Migration tool and recall-vs-latency report
+# ----------------------------------------------------------------------
+
+def build_all(vector_db_dir: Path, dims: int, quantize: bool):
+    """Build and save truncated indexes for every domain collection."""
+    from knowledge_base.query_rag import DOMAINS
+    from knowledge_base.collection_aliases import CollectionAliasRegistry
+    from knowledge_base.chroma_clients import get_chroma_client
+
+    client = get_chroma_client(vector_db_dir)
+    aliases = CollectionAliasRegistry(vector_db_dir)
+
+    for domain, collection_name in DOMAINS.items():
+        if collection_name is None:
+            continue
+        collection_name = aliases.resolve(collection_name)
+        try:
+            collection = client.get_collection(name=collection_name)
+        except Exception:
+            print(f"⚠ Collection '{collection_name}' not found, skipping")
+            continue
+
+        start = time.perf_counter()
+        index = TruncatedIndex.build(collection, dims=dims, quantize=quantize)
+        path = index.save(vector_db_dir)
+        elapsed = time.perf_counter() - start
+
+        full_bytes = len(index) * 1536 * 4
+        print(f"✓ {collection_name}: {len(index)} vectors → {path.name} "
+              f"({index.nbytes / 1e6:.1f} MB vs {full_bytes / 1e6:.1f} MB full, {elapsed:.1f}s)")
+
+
+def _percentile_ms(samples: List[float], q: float) -> float:
+    """Percentile of a list of second-valued samples, in milliseconds."""
+    if not samples:
+        return 0.0
+    return float(np.percentile(np.asarray(samples) * 1000.0, q))
+
+
+def recall_report(
+    vector_db_dir: Path,
+    dims: int,
+    quantize: bool,
+    num_queries: int = 100,
+    top_k: int = 5,
+    candidate_multiplier: int = 10,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Compare the truncated two-stage index against the current ChromaDB index.
+
+    Stored chunk vectors are used as queries so the report runs offline.
+    Ground truth is exact full-dimension search; each query's own chunk is
+    excluded from both result lists.
+
+    Args:
+        vector_db_dir: Vector database directory
+        dims: Truncated dimension
+        quantize: Whether to evaluate the int8 variant
+        num_queries: Sampled queries per collection
+        top_k: Results compared per query
+        candidate_multiplier: First-stage candidates = top_k * multiplier
+        seed: Sampling seed
+
+    Returns:
+        Dictionary of per-collection metrics
+    """
+    from knowledge_base.query_rag import DOMAINS
+    from knowledge_base.collection_aliases import CollectionAliasRegistry
+    from knowledge_base.chroma_clients import get_chroma_client
+
+    client = get_chroma_client(vector_db_dir)
+    aliases = CollectionAliasRegistry(vector_db_dir)
+    rng = np.random.default_rng(seed)
+    report = {}
+
+    for domain, collection_name in DOMAINS.items():
+        if collection_name is None:
+            continue
+        collection_name = aliases.resolve(collection_name)
+        try:
+            collection = client.get_collection(name=collection_name)
+        except Exception:
+            continue
+
+        ids, full = export_collection_embeddings(collection)
+        if len(ids) <= top_k:
+            continue
+
+        index = TruncatedIndex.load(vector_db_dir, collection_name, dims, quantize)
+        if index is None or index.is_stale(collection):
+            index = TruncatedIndex.build(collection, dims=dims, quantize=quantize)
+
+        sample = rng.choice(len(ids), size=min(num_queries, len(ids)), replace=False)
+        n_candidates = top_k * candidate_multiplier
+
+        chroma_hits, two_stage_hits = 0, 0
+        chroma_latency, two_stage_latency = [], []
+
+        for row in sample:
+            query = full[row]
+            own_id = ids[row]
+
+            # Exact ground truth (full dimensions, brute force)
+            exact = ((full - query) ** 2).sum(axis=1)
+            exact[row] = np.inf
+            truth = {ids[i] for i in np.argsort(exact)[:top_k]}
+
+            # Current index: ChromaDB HNSW over full vectors
+            start = time.perf_counter()
+            res = collection.query(query_embeddings=[query.tolist()], n_results=top_k + 1, include=['distances'])
+            chroma_latency.append(time.perf_counter() - start)
+            chroma_ids = [i for i in res['ids'][0] if i != own_id][:top_k]
+            chroma_hits += len(truth.intersection(chroma_ids))
+
+            # Two-stage: truncated search + full-vector rerank
+            start = time.perf_counter()
+            cand_ids, _ = index.search(query, n_candidates + 1)
+            cand = collection.get(ids=cand_ids, include=['embeddings'])
+            ranked = rerank_with_full_vectors(query, cand, top_k + 1)
+            two_stage_latency.append(time.perf_counter() - start)
+            two_stage_ids = [cand['ids'][i] for i, _ in ranked if cand['ids'][i] != own_id][:top_k]
+            two_stage_hits += len(truth.intersection(two_stage_ids))
+
+        denom = len(sample) * top_k
+        report[collection_name] = {
+            "num_vectors": len(ids),
+            "num_queries": len(sample),
+            "top_k": top_k,
+            "candidates": n_candidates,
+            "full_index_bytes": int(full.nbytes),
+            "truncated_index_bytes": int(index.nbytes),
+            "recall_chroma": chroma_hits / denom,
+            "recall_two_stage": two_stage_hits / denom,
+            "latency_chroma_ms": {
+                "p50": _percentile_ms(chroma_latency, 50),
+                "p95": _percentile_ms(chroma_latency, 95),
+            },
+            "latency_two_stage_ms": {
+                "p50": _percentile_ms(two_stage_latency, 50),
+                "p95": _percentile_ms(two_stage_latency, 95),
+            },
+        }
+
+    return report
+
+
+def main():
+    """CLI entry point for building indexes and reporting recall vs latency."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Truncated-dimension index tools")
+    parser.add_argument("command", choices=["build", "report"], help="Build indexes or run the comparison report")
+    parser.add_argument("--dims", type=int, default=DEFAULT_TRUNCATED_DIMS, help="Leading dimensions to keep")
+    parser.add_argument("--int8", dest="int8", action="store_true", default=DEFAULT_TRUNCATED_INT8,
+                        help="Quantize the truncated vectors to int8 (default)")
+    parser.add_argument("--no-int8", dest="int8", action="store_false", help="Keep the truncated vectors as float32")
+    parser.add_argument("--queries", type=int, default=100, help="Sampled queries per collection (report)")
+    parser.add_argument("--top-k", type=int, default=5, help="Results compared per query (report)")
+    parser.add_argument("--candidates", type=int, default=10, help="Candidate multiplier over top_k (report)")
+    parser.add_argument("--output", type=Path, default=None, help="Write report JSON to this file")
+    args = parser.parse_args()
+
+    vector_db_dir = Path(__file__).parent.parent / "data" / "vector_db"
+
+    if args.command == "build":
+        build_all(vector_db_dir, args.dims, args.int8)
+        return
+
+    report = recall_report(
+        vector_db_dir,
+        dims=args.dims,
+        quantize=args.int8,
+        num_queries=args.queries,
+        top_k=args.top_k,
+        candidate_multiplier=args.candidates,
+    )
+
+    print(f"\n{'='*80}")
+    print(f"TRUNCATED INDEX REPORT (dims={args.dims}, int8={args.int8})")
+    print(f"{'='*80}")
+    for name, stats in report.items():
+        print(f"\n{name}:")
+        print(f"  Vectors: {stats['num_vectors']}  Queries: {stats['num_queries']}")
+        print(f"  Memory: {stats['full_index_bytes'] / 1e6:.1f} MB full → "
+              f"{stats['truncated_index_bytes'] / 1e6:.1f} MB truncated")
+        print(f"  Recall@{stats['top_k']}: chroma={stats['recall_chroma']:.3f} "
+              f"two-stage={stats['recall_two_stage']:.3f}")
+        print(f"  Latency p50/p95 (ms): chroma={stats['latency_chroma_ms']['p50']:.1f}/"
+              f"{stats['latency_chroma_ms']['p95']:.1f} "
+              f"two-stage={stats['latency_two_stage_ms']['p50']:.1f}/"
+              f"{stats['latency_two_stage_ms']['p95']:.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,7 +47,12 @@ from agents.prompts import (
 )
 
 # Unified Agent (all enhancements integrated)
-from agents.enhancements import UnifiedAgent
+from agents.enhancements import UnifiedAgent, prepare_agents_for_round
+from agents.enhancements.memory_config import MemoryConfig
+
+# Round consolidation runs in the background while the next round starts;
+# recall and promotion wait for it
+SYMPOSIUM_MEMORY_CONFIG = MemoryConfig(write_behind=True)
 
 
 def create_unified_agents(symposium_id: str = None) -> Dict[str, UnifiedAgent]:
@@ -77,22 +82,26 @@ def create_unified_agents(symposium_id: str = None) -> Dict[str, UnifiedAgent]:
         "electrochemistry": UnifiedAgent(
             base_agent=ELECTROCHEMISTRY_EXPERT,
             domain="electrochemistry",
-            symposium_id=symposium_id
+            symposium_id=symposium_id,
+            memory_config=SYMPOSIUM_MEMORY_CONFIG
         ),
         "membrane_science": UnifiedAgent(
             base_agent=MEMBRANE_SCIENCE_EXPERT,
             domain="membrane_science",
-            symposium_id=symposium_id
+            symposium_id=symposium_id,
+            memory_config=SYMPOSIUM_MEMORY_CONFIG
         ),
         "biology": UnifiedAgent(
             base_agent=BIOLOGY_EXPERT,
             domain="biology",
-            symposium_id=symposium_id
+            symposium_id=symposium_id,
+            memory_config=SYMPOSIUM_MEMORY_CONFIG
         ),
         "nanofluidics": UnifiedAgent(
             base_agent=NANOFLUIDICS_EXPERT,
             domain="nanofluidics",
-            symposium_id=symposium_id
+            symposium_id=symposium_id,
+            memory_config=SYMPOSIUM_MEMORY_CONFIG
         ),
     }
 
@@ -186,14 +195,14 @@ def main(skip_confirmation=False):
     print("Each expert presents their field's approach to ion transport.")
     print("Critic evaluates rigor and identifies patterns across fields.\n")
 
-    # Agents auto-prepare (planning + memory retrieval)
-    for domain, agent in unified_agents.items():
-        enhanced_agenda = agent.prepare_for_round(
-            round_number=1,
-            agenda=ROUND_1_DETAILED_AGENDA,
-            questions=list(ROUND_1_QUESTIONS),
-            previous_summary=None
-        )
+    # Agents auto-prepare (planning + one batched memory recall for all agents)
+    enhanced_agendas = prepare_agents_for_round(
+        unified_agents,
+        round_number=1,
+        agenda=ROUND_1_DETAILED_AGENDA,
+        questions=list(ROUND_1_QUESTIONS),
+        previous_summary=None
+    )
 
     round1_summary = run_meeting(
         meeting_type="team",
@@ -226,13 +235,13 @@ def main(skip_confirmation=False):
     print("Building on Round 1 insights.\n")
 
     # Agents auto-prepare
-    for domain, agent in unified_agents.items():
-        enhanced_agenda = agent.prepare_for_round(
-            round_number=2,
-            agenda=ROUND_2_DETAILED_AGENDA,
-            questions=list(ROUND_2_QUESTIONS),
-            previous_summary=round1_summary
-        )
+    enhanced_agendas = prepare_agents_for_round(
+        unified_agents,
+        round_number=2,
+        agenda=ROUND_2_DETAILED_AGENDA,
+        questions=list(ROUND_2_QUESTIONS),
+        previous_summary=round1_summary
+    )
 
     round2_summary = run_meeting(
         meeting_type="team",
@@ -266,13 +275,13 @@ def main(skip_confirmation=False):
     print("Defining common core + field-specific extensions.\n")
 
     # Agents auto-prepare
-    for domain, agent in unified_agents.items():
-        enhanced_agenda = agent.prepare_for_round(
-            round_number=3,
-            agenda=ROUND_3_DETAILED_AGENDA,
-            questions=list(ROUND_3_QUESTIONS),
-            previous_summary=round2_summary
-        )
+    enhanced_agendas = prepare_agents_for_round(
+        unified_agents,
+        round_number=3,
+        agenda=ROUND_3_DETAILED_AGENDA,
+        questions=list(ROUND_3_QUESTIONS),
+        previous_summary=round2_summary
+    )
 
     round3_summary = run_meeting(
         meeting_type="team",
@@ -305,13 +314,13 @@ def main(skip_confirmation=False):
     print("Cross-field applications, borrowing techniques, future technologies.\n")
 
     # Agents auto-prepare
-    for domain, agent in unified_agents.items():
-        enhanced_agenda = agent.prepare_for_round(
-            round_number=4,
-            agenda=ROUND_4_DETAILED_AGENDA,
-            questions=list(ROUND_4_QUESTIONS),
-            previous_summary=round3_summary
-        )
+    enhanced_agendas = prepare_agents_for_round(
+        unified_agents,
+        round_number=4,
+        agenda=ROUND_4_DETAILED_AGENDA,
+        questions=list(ROUND_4_QUESTIONS),
+        previous_summary=round3_summary
+    )
 
     round4_summary = run_meeting(
         meeting_type="team",
@@ -345,7 +354,11 @@ def main(skip_confirmation=False):
 
     print("\n💾 Promoting memories to long-term storage...")
     for domain, agent in unified_agents.items():
-        agent.promote_to_long_term_memory()
+        try:
+            agent.promote_to_long_term_memory()
+        finally:
+            # Flush write-behind consolidation and stop its worker thread
+            agent.memory.close()
     print("✓ Memories saved for future symposiums\n")
 
     # ========================================================================
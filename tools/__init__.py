@@ -21,6 +21,10 @@ from tools.rag_tool import (
     RAGIntegration,
     get_rag_integration,
     run_rag_query,
+    arun_rag_query,
+    prefetch_rag_queries,
+    get_rag_prefetch_stats,
+    get_rag_latency_stats,
     RAG_TOOL_NAME,
 )
 from tools.web_search_tool import WebSearchTool
@@ -36,6 +40,10 @@ __all__ = [
     "RAGIntegration",
     "get_rag_integration",
     "run_rag_query",
+    "arun_rag_query",
+    "prefetch_rag_queries",
+    "get_rag_prefetch_stats",
+    "get_rag_latency_stats",
     "RAG_TOOL_NAME",
     "WebSearchTool",
     "EquationSolverTool",
@@ -7,12 +7,17 @@ for AI agents to query their domain-specific knowledge bases during discussions.
 This replaces PubMed search with curated, domain-specific paper knowledge.
 """
 
+import asyncio
+import copy
+import functools
 import json
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 
 # RAG tool constants
 RAG_TOOL_NAME = "query_knowledge_base"
+RAG_TOKEN_BUDGET = 1500  # Tokens of packed evidence per tool result
+CITATION_INSTRUCTION = "Cite as: Journal abbreviation (Year), Volume, Pages — taken from the Citation lines above."
 
 RAG_TOOL_DESCRIPTION = {
     "type": "function",
@@ -34,6 +39,23 @@ RAG_TOOL_DESCRIPTION = {
                     "description": "Number of relevant paper sections to retrieve (default: 5, max: 10)",
                     "default": 5,
                 },
+                "content_type": {
+                    "type": "string",
+                    "enum": ["text", "figure", "equation"],
+                    "description": "Only retrieve this kind of content (e.g. 'equation' for governing equations, 'figure' for plotted data). Omit to search everything.",
+                },
+                "year_min": {
+                    "type": "integer",
+                    "description": "Only retrieve papers published in or after this year.",
+                },
+                "year_max": {
+                    "type": "integer",
+                    "description": "Only retrieve papers published in or before this year.",
+                },
+                "paper": {
+                    "type": "string",
+                    "description": "Restrict the search to one paper, given by its DOI or exact title.",
+                },
             },
             "required": ["query"],
         },
@@ -41,47 +63,226 @@ RAG_TOOL_DESCRIPTION = {
 }
 
 
-def run_rag_query(query: str, domain: str, top_k: int = 5) -> str:
+def _format_rag_result(query: str, context: str) -> str:
+    """Wrap retrieved context with the query header and citation instruction."""
+    # Usage instruction kept to one line: tool results are re-sent every turn
+    return f"""Knowledge Base Results for: "{query}"
+
+{context}
+
+---
+{CITATION_INSTRUCTION}
+"""
+
+
+def filter_from_tool_args(args: dict) -> Optional[dict]:
+    """Translate the tool's optional filter arguments into a ChromaDB `where` clause."""
+    # Import here to avoid circular dependencies
+    from knowledge_base.metadata_filters import build_metadata_filter
+    from knowledge_base.paper_registry import get_paper_registry
+
+    paper = args.get("paper")
+    return build_metadata_filter(
+        content_type=args.get("content_type"),
+        year_min=args.get("year_min"),
+        year_max=args.get("year_max"),
+        paper=paper,
+        paper_ids=get_paper_registry().find(paper) if paper else None,
+    )
+
+
+def _report_retrieval(domain: str, details: dict):
+    """Print what a query actually returned (counts, size, latency)."""
+    if details['num_results'] == 0:
+        print(f'⚠ No matching sections in {domain} papers ({details["elapsed_ms"]:.0f} ms)\n')
+        return
+    print(
+        f'✓ Retrieved {details["num_results"]} sections from {details["num_sources"]} {domain} papers '
+        f'({details["bytes"]:,} bytes, {details["elapsed_ms"]:.0f} ms)\n'
+    )
+
+
+def _format_rag_error(e: Exception) -> str:
+    """Agent-facing message for a failed knowledge base query."""
+    error_msg = f"Error querying knowledge base: {str(e)}"
+    print(f"✗ {error_msg}\n")
+    return f"Unable to retrieve information from knowledge base. Error: {str(e)}\nPlease try rephrasing your query or proceed with your existing knowledge."
+
+
+def _service_client():
+    """Retrieval service client if RAG_SERVICE_URL is set, else None (query in-process)."""
+    from knowledge_base.retrieval_client import get_retrieval_client
+    return get_retrieval_client()
+
+
+def _service_unavailable(e: Exception):
+    print(f"⚠ Retrieval service unavailable, querying in-process: {e}")
+
+
+def run_rag_query(
+    query: str,
+    domain: str,
+    top_k: int = 5,
+    token_budget: Optional[int] = RAG_TOKEN_BUDGET,
+    filter_metadata: Optional[dict] = None
+) -> str:
     """
     Execute RAG query for an agent.
 
+    Served by the shared retrieval service when RAG_SERVICE_URL is set,
+    falling back to the in-process engine if the service is unreachable.
+
     Args:
         query: What the agent wants to know
         domain: Agent's domain (electrochemistry, membrane_science, biology, nanofluidics)
         top_k: Number of relevant chunks to retrieve
+        token_budget: Maximum tokens of packed evidence in the result
+        filter_metadata: Optional ChromaDB `where` clause (content type, year range, paper)
 
     Returns:
         Formatted string with retrieved context and citations
     """
     try:
         # Import here to avoid circular dependencies
-        from knowledge_base import get_context_for_agent
+        from knowledge_base.retrieval_client import RetrievalServiceError
 
         # Print query for transparency
         print(f'\n🔍 [{domain.upper()}] Querying knowledge base: "{query}"')
+        if filter_metadata:
+            print(f'   Filters: {json.dumps(filter_metadata)}')
+
+        # Query the knowledge base (timed per stage by the engine)
+        details = None
+        client = _service_client()
+        if client is not None:
+            try:
+                details = client.get_context_details(
+                    query, domain, top_k, token_budget=token_budget, filter_metadata=filter_metadata
+                )
+            except RetrievalServiceError as e:
+                _service_unavailable(e)
+
+        if details is None:
+            from knowledge_base import get_query_engine
+            details = get_query_engine().get_context_details(
+                query, domain, top_k, token_budget=token_budget, filter_metadata=filter_metadata
+            )
+        _report_retrieval(domain, details)
+
+        return _format_rag_result(query, details['context'])
 
-        # Query the knowledge base
-        context = get_context_for_agent(query, domain, top_k)
+    except Exception as e:
+        return _format_rag_error(e)
 
-        # Add usage instruction
-        formatted_result = f"""Knowledge Base Results for: "{query}"
 
-{context}
+async def arun_rag_query(
+    query: str,
+    domain: str,
+    top_k: int = 5,
+    token_budget: Optional[int] = RAG_TOKEN_BUDGET,
+    filter_metadata: Optional[dict] = None
+) -> str:
+    """
+    Async variant of run_rag_query for asyncio callers.
 
----
-Instructions for citation:
-When using information from above, cite as: Journal abbreviation (Year), Volume, Page numbers
-Extract this from the paper metadata or content when available.
-"""
+    Uses the async embeddings client and runs ChromaDB work in a bounded
+    executor, sharing caches with run_rag_query.
+    """
+    try:
+        # Import here to avoid circular dependencies
+        from knowledge_base.retrieval_client import RetrievalServiceError
 
-        print(f'✓ Retrieved {top_k} relevant sections from {domain} papers\n')
+        print(f'\n🔍 [{domain.upper()}] Querying knowledge base: "{query}"')
 
-        return formatted_result
+        if filter_metadata:
+            print(f'   Filters: {json.dumps(filter_metadata)}')
+
+        details = None
+        client = _service_client()
+        if client is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                details = await loop.run_in_executor(None, functools.partial(
+                    client.get_context_details,
+                    query, domain, top_k, token_budget=token_budget, filter_metadata=filter_metadata
+                ))
+            except RetrievalServiceError as e:
+                _service_unavailable(e)
+
+        if details is None:
+            from knowledge_base.query_rag import get_query_engine
+            details = await get_query_engine().aget_context_details(
+                query, domain, top_k, token_budget=token_budget, filter_metadata=filter_metadata
+            )
+        _report_retrieval(domain, details)
+
+        return _format_rag_result(query, details['context'])
 
     except Exception as e:
-        error_msg = f"Error querying knowledge base: {str(e)}"
-        print(f"✗ {error_msg}\n")
-        return f"Unable to retrieve information from knowledge base. Error: {str(e)}\nPlease try rephrasing your query or proceed with your existing knowledge."
+        return _format_rag_error(e)
+
+
+def prefetch_rag_queries(
+    queries: List[str],
+    domain: str,
+    top_k: int = 5,
+    token_budget: Optional[int] = RAG_TOKEN_BUDGET
+) -> int:
+    """
+    Warm the knowledge base caches for queries an agent is likely to make.
+
+    Uses the same request shape as run_rag_query (top_k, token budget), so
+    matching tool calls are served from the cache. Returns immediately.
+
+    Args:
+        queries: Anticipated queries
+        domain: Agent's domain
+        top_k: Number of chunks per query (tool call default)
+        token_budget: Token budget of the packed evidence
+
+    Returns:
+        Number of prefetches submitted (0 if prefetch is unavailable)
+    """
+    try:
+        client = _service_client()
+        if client is not None:
+            submitted = client.prefetch(queries, domain, top_k, token_budget=token_budget)
+        else:
+            # Import here to avoid circular dependencies
+            from knowledge_base import prefetch_context_for_agent
+            submitted = len(prefetch_context_for_agent(queries, domain, top_k, token_budget=token_budget))
+
+        if submitted:
+            print(f'⏩ [{domain.upper()}] Prefetching {submitted} knowledge base queries')
+        return submitted
+
+    except Exception as e:
+        print(f"⚠ Knowledge base prefetch unavailable: {e}")
+        return 0
+
+
+def get_rag_prefetch_stats(domain: Optional[str] = None) -> dict:
+    """Prefetch activity and hit rate for a domain (empty if unavailable)."""
+    try:
+        client = _service_client()
+        if client is not None:
+            return client.stats(domain)["prefetch"]
+        from knowledge_base import get_prefetch_stats
+        return get_prefetch_stats(domain)
+    except Exception:
+        return {}
+
+
+def get_rag_latency_stats(domain: Optional[str] = None) -> dict:
+    """Per-stage retrieval latency percentiles for a domain (empty if unavailable)."""
+    try:
+        client = _service_client()
+        if client is not None:
+            return client.stats(domain)["latency"]
+        from knowledge_base import get_latency_stats
+        return get_latency_stats(domain)
+    except Exception:
+        return {}
 
 
 def handle_rag_tool_calls(tool_calls, agent_domain: str):
@@ -108,8 +309,12 @@ def handle_rag_tool_calls(tool_calls, agent_domain: str):
             # Cap top_k at 10
             top_k = min(top_k, 10)
 
-            # Run RAG query
-            output = run_rag_query(query, agent_domain, top_k)
+            # Run RAG query (optional content type / year / paper filters)
+            try:
+                filter_metadata = filter_from_tool_args(args_dict)
+                output = run_rag_query(query, agent_domain, top_k, filter_metadata=filter_metadata)
+            except ValueError as e:
+                output = _format_rag_error(e)
             tool_outputs.append(output)
 
             # Create tool response message for API
@@ -141,7 +346,8 @@ def get_rag_tool_for_agent(agent_domain: str) -> dict:
         "nanofluidics": "synthetic nanopores, nanochannels, nanofluidic devices, and confined transport",
     }
 
-    tool_desc = RAG_TOOL_DESCRIPTION.copy()
+    # Deep copy: the description is customized per domain below
+    tool_desc = copy.deepcopy(RAG_TOOL_DESCRIPTION)
     domain_info = domain_descriptions.get(agent_domain, "ion transport")
 
     # Customize description